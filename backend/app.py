@@ -4,20 +4,26 @@ from prometheus_fastapi_instrumentator import Instrumentator
 from contextlib import asynccontextmanager
 from logging_config import logger
 
+from engine.model_registry import close_pools
+from engine.warmup import start_warmup
+
 from routes.analytics import AnalyticsController
-from routes.articles import ArticlesController
 from routes.auth import AuthController
-from routes.likes import LikesController
-from routes.recommend import RecommendController
-from routes.scraper import ScraperController
-from routes.health import HealthController
-from routes.search import SearchController
+from routes.content import ArticlesController, SearchController
+from routes.content.recommendations import RecommendController
+from routes.interactions import LikesController
+from routes.scraping import ScraperController
+from routes.system import HealthController
+from routes.utils.compression import CompressionMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 FastAPI application is starting up")
+    # The index and models load in the background; /health/ready reports when done.
+    start_warmup()
     yield
     logger.info("🛑 FastAPI application is shutting down")
+    close_pools()
 
 app = FastAPI(
     title="Engineering Blog Recommender API",
@@ -107,6 +113,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost: compresses finished responses and measures size and latency per route.
+app.add_middleware(CompressionMiddleware)
 
 controllers = [
     SearchController(),       # 0
@@ -0,0 +1,88 @@
+"""
+Recall@k vs latency for the IVF approximate index against exact search.
+
+Synthetic data is drawn from a mixture of Gaussian clusters on the unit
+sphere, which is much closer to real sentence embeddings than isotropic noise.
+
+Usage:
+    python -m benchmarks.bench_ann
+    python -m benchmarks.bench_ann --n 200000 --nprobe 1 4 16 64
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from engine.ann_index import IVFIndex
+from engine.vector_index import VectorIndex, normalize_rows, top_k_indices
+
+
+def clustered_matrix(n: int, dim: int, clusters: int, spread: float, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((clusters, dim), dtype=np.float32))
+    labels = rng.integers(0, clusters, size=n)
+    matrix = centers[labels] + spread * rng.standard_normal((n, dim), dtype=np.float32)
+    return normalize_rows(matrix)
+
+
+def run(n: int, dim: int, queries: int, top_k: int, nprobes: List[int], nlist: int) -> None:
+    matrix = clustered_matrix(n, dim, clusters=max(16, n // 500), spread=0.08)
+    query_vectors = clustered_matrix(queries, dim, clusters=max(16, n // 500), spread=0.08, seed=0)
+    noise = np.random.default_rng(2).standard_normal(query_vectors.shape, dtype=np.float32)
+    query_vectors = normalize_rows(query_vectors + 0.05 * noise)
+    ids = [str(i) for i in range(n)]
+
+    exact = VectorIndex(dim=dim)
+    exact.build_from_matrix(matrix, ids, normalized=True)
+    truth = []
+    exact_timings = []
+    for q in query_vectors:
+        start = time.perf_counter()
+        truth.append(set(top_k_indices(exact.matrix @ q, top_k).tolist()))
+        exact_timings.append(time.perf_counter() - start)
+
+    ivf = IVFIndex(dim=dim, nlist=nlist or None)
+    start = time.perf_counter()
+    ivf.build_from_matrix(matrix, ids, normalized=True)
+    build_s = time.perf_counter() - start
+
+    print(f"n={n} dim={dim} nlist={ivf.centroids.shape[0]} build={build_s:.2f}s top_k={top_k}")
+    print(f"{'mode':>10} {'recall@k':>9} {'p50_ms':>8} {'p99_ms':>8}")
+    print(
+        f"{'exact':>10} {1.0:>9.3f} {np.percentile(exact_timings, 50) * 1000:>8.2f} "
+        f"{np.percentile(exact_timings, 99) * 1000:>8.2f}"
+    )
+    for nprobe in nprobes:
+        hits = 0
+        timings = []
+        for q, expected in zip(query_vectors, truth):
+            start = time.perf_counter()
+            rows = ivf.candidate_rows(ivf.prepare_query(q), nprobe)
+            found = rows[top_k_indices(ivf.matrix[rows] @ q, top_k)]
+            timings.append(time.perf_counter() - start)
+            hits += len(expected.intersection(found.tolist()))
+        recall = hits / (len(truth) * top_k)
+        print(
+            f"{'nprobe=' + str(nprobe):>10} {recall:>9.3f} "
+            f"{np.percentile(timings, 50) * 1000:>8.2f} {np.percentile(timings, 99) * 1000:>8.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=0, help="0 picks sqrt(n)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.top_k, args.nprobe, args.nlist)
+
+
+if __name__ == "__main__":
+    main()
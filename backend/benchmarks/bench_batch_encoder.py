@@ -0,0 +1,121 @@
+"""
+Query encoding throughput: one ``model.encode`` per request vs the micro-batcher.
+
+Concurrent client threads each encode a stream of short queries, either by
+calling the model directly (today's behaviour) or through
+``engine.batch_encoder.BatchingEncoder``.
+
+Uses the real BGE model when sentence-transformers is installed; ``--synthetic``
+swaps in a stand-in with a fixed GIL-holding per-call overhead and per-token
+matrix work, for machines without the model.
+
+Usage:
+    python -m benchmarks.bench_batch_encoder --clients 16 --requests 50
+    python -m benchmarks.bench_batch_encoder --synthetic
+"""
+
+import argparse
+import threading
+import time
+from typing import Any, Callable, List, Tuple
+
+import numpy as np
+
+from engine.batch_encoder import BatchingEncoder, token_length_fn
+
+QUERIES = [
+    "machine learning deployment",
+    "microservices architecture patterns",
+    "database optimization techniques",
+    "scalable system design",
+    "how we migrated our payments ledger to a new storage engine",
+    "feature flags",
+    "observability for distributed tracing at scale",
+    "kafka",
+]
+
+
+class SyntheticEncoder:
+    """Transformer-shaped cost model: per-call overhead plus padded per-token work."""
+
+    def __init__(self, dim: int = 768, overhead_ms: float = 3.0) -> None:
+        self.weights = np.random.default_rng(0).standard_normal((dim, dim)).astype(np.float32)
+        self.overhead = overhead_ms / 1000.0
+
+    def encode(self, texts: Any, batch_size: int = 32, device: str = "cpu") -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        end = time.perf_counter() + self.overhead
+        while time.perf_counter() < end:  # tokenization and dispatch hold the GIL
+            pass
+        tokens = max(len(t.split()) for t in texts) + 2
+        hidden = np.ones((len(texts) * tokens, self.weights.shape[0]), dtype=np.float32)
+        for _ in range(4):
+            hidden = np.tanh(hidden @ self.weights / 32.0)
+        vectors = hidden.reshape(len(texts), tokens, -1).mean(axis=1)
+        return vectors[0] if single else vectors
+
+
+def load_model(synthetic: bool) -> Any:
+    if synthetic:
+        return SyntheticEncoder()
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer("BAAI/bge-base-en-v1.5")
+
+
+def drive(encode: Callable[[str], Any], clients: int, requests: int) -> Tuple[float, float, float]:
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def client(offset: int) -> None:
+        local = []
+        for i in range(requests):
+            start = time.perf_counter()
+            encode(QUERIES[(offset + i) % len(QUERIES)])
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=50, help="Queries per client")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--synthetic", action="store_true")
+    args = parser.parse_args()
+
+    model = load_model(args.synthetic)
+    batcher = BatchingEncoder(
+        lambda texts: model.encode(texts, batch_size=len(texts), device="cpu"),
+        max_batch_size=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        length_fn=token_length_fn(model),
+    )
+    batcher.encode("warmup")
+
+    print(f"{'clients':>7} {'mode':>8} {'qps':>8} {'p50_ms':>8} {'p99_ms':>8}")
+    for clients in args.clients:
+        for mode, encode in (
+            ("direct", lambda text: model.encode(text, device="cpu")),
+            ("batched", batcher.encode),
+        ):
+            qps, p50, p99 = drive(encode, clients, args.requests)
+            print(f"{clients:>7} {mode:>8} {qps:>8.1f} {p50 * 1000:>8.2f} {p99 * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
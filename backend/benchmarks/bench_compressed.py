@@ -0,0 +1,103 @@
+"""
+Memory, recall@k and latency of the compressed scoring tier against exact search.
+
+Each configuration scans an int8 and/or PCA-reduced copy of the corpus for
+``rerank_factor * top_k`` candidates and rescores them at full precision.
+
+Usage:
+    python -m benchmarks.bench_compressed
+    python -m benchmarks.bench_compressed --n 200000 --dims 0 128 256 --rerank 2 4 8
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from benchmarks.bench_ann import clustered_matrix
+from engine.compressed_index import CompressedIndex
+from engine.vector_index import VectorIndex, normalize_rows
+
+
+def embedding_like_matrix(n: int, dim: int, decay: float, seed: int = 0) -> np.ndarray:
+    """Clustered vectors whose variance falls off with a power law across a random basis.
+
+    Sentence embeddings concentrate most of their variance in a few hundred
+    directions; isotropic noise would make any projection look useless.
+    """
+    rng = np.random.default_rng(seed)
+    base = clustered_matrix(n, dim, clusters=max(16, n // 500), spread=0.0, seed=seed)
+    spectrum = (1.0 + np.arange(dim, dtype=np.float32)) ** -decay
+    noise = rng.standard_normal((n, dim), dtype=np.float32) * spectrum
+    rotation, _ = np.linalg.qr(rng.standard_normal((dim, dim)))
+    return normalize_rows(base + 0.5 * noise @ rotation.astype(np.float32))
+
+
+def run(
+    n: int, dim: int, queries: int, top_k: int, dims: List[int], reranks: List[int], decay: float
+) -> None:
+    matrix = embedding_like_matrix(n, dim, decay)
+    noise = np.random.default_rng(2).standard_normal((queries, dim), dtype=np.float32)
+    query_vectors = normalize_rows(matrix[:queries] + 0.05 * noise)
+    ids = [str(i) for i in range(n)]
+
+    exact = VectorIndex(dim=dim)
+    exact.build_from_matrix(matrix, ids, normalized=True)
+    timings = []
+    for q in query_vectors:
+        start = time.perf_counter()
+        exact.search(q, top_k=top_k)
+        timings.append(time.perf_counter() - start)
+    print(f"n={n} dim={dim} top_k={top_k} full matrix={matrix.nbytes / 1e6:.1f}MB")
+    print(
+        f"{'tier':>14} {'rerank':>6} {'MB':>7} {'ratio':>6} {'res_MB':>7} {'mmap_MB':>7} "
+        f"{'recall_raw':>10} {'recall':>7} {'p50_ms':>7}"
+    )
+    mb = matrix.nbytes / 1e6
+    print(
+        f"{'exact':>14} {'-':>6} {mb:>7.1f} {1.0:>6.1f} {mb:>7.1f} {mb:>7.1f} {1.0:>10.3f} "
+        f"{1.0:>7.3f} {np.percentile(timings, 50) * 1000:>7.2f}"
+    )
+
+    for reduced_dim in dims:
+        for rerank in reranks:
+            index = CompressedIndex(dim=dim, reduced_dim=reduced_dim, rerank_factor=rerank)
+            index.build_from_matrix(matrix, ids, normalized=True)
+            memory = index.memory_report()
+            recall = index.recall_report(query_vectors, top_k=top_k)
+            timings = []
+            for q in query_vectors:
+                start = time.perf_counter()
+                index.search(q, top_k=top_k)
+                timings.append(time.perf_counter() - start)
+            label = f"int8/pca{reduced_dim}" if reduced_dim else "int8"
+            # res_MB: resident with the rescoring matrix in the heap; mmap_MB: resident
+            # when it is served from a snapshot's memory map instead.
+            print(
+                f"{label:>14} {rerank:>6} {memory['compressed_bytes'] / 1e6:>7.1f} "
+                f"{memory['compression_ratio']:>6.1f} {memory['resident_bytes'] / 1e6:>7.1f} "
+                f"{memory['compressed_bytes'] / 1e6:>7.1f} {recall['recall_compressed']:>10.3f} "
+                f"{recall['recall_rescored']:>7.3f} {np.percentile(timings, 50) * 1000:>7.2f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dims", type=int, nargs="+", default=[0, 128, 256],
+                        help="PCA dimensions to try; 0 means int8 only")
+    parser.add_argument("--rerank", type=int, nargs="+", default=[2, 4])
+    parser.add_argument("--decay", type=float, default=0.5,
+                        help="Power-law exponent of the synthetic variance spectrum")
+    args = parser.parse_args()
+    run(args.n, args.dim, args.queries, args.top_k, args.dims, args.rerank, args.decay)
+
+
+if __name__ == "__main__":
+    main()
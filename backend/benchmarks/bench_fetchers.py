@@ -0,0 +1,111 @@
+"""
+Pages/second of the scraper fetchers against the listing-page fixtures.
+
+Serves ``tests/fixtures/scraper/*_page.html`` from a local HTTP server that
+adds ``--latency-ms`` to every response, standing in for a remote blog.
+Paginated URLs (``/<source>/page/<n>``) all return that source's fixture.
+Then it fetches ``--pages`` pages per source with:
+
+- ``http xN``: ``HttpFetcher`` at each ``--concurrency`` level
+- ``webdriver``: ``WebDriverFetcher`` in the driver pool's headless Chrome,
+  one page at a time. Skipped if Selenium or Chrome is missing.
+
+Usage:
+    python -m benchmarks.bench_fetchers
+    python -m benchmarks.bench_fetchers --pages 40 --latency-ms 150 --concurrency 1 4 8 16
+"""
+
+import argparse
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+from scraper.base.driver_pool import launch_chrome
+from scraper.base.fetchers import HttpFetcher, PageFetcher, WebDriverFetcher
+
+FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "scraper"
+SOURCES = ("stripe", "uber", "slack", "robinhood")
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    latency: float = 0.0
+
+    def do_GET(self) -> None:
+        time.sleep(self.latency)
+        source = self.path.strip("/").split("/")[0]
+        path = FIXTURES / f"{source}_page.html"
+        if not path.exists():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FixtureServer(ThreadingHTTPServer):
+    # The default backlog of 5 drops connects at higher concurrency, and each
+    # dropped SYN costs a 1s retransmit that would swamp the measurement.
+    request_queue_size = 128
+
+
+def serve(latency: float) -> ThreadingHTTPServer:
+    handler = type("Handler", (FixtureHandler,), {"latency": latency})
+    server = FixtureServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(fetcher: PageFetcher, urls: List[str]) -> float:
+    pages = fetcher.fetch_pages(urls)
+    assert all(page is not None for page in pages), "fixture server returned an error"
+    return fetcher.pages_per_second()
+
+
+def run(pages: int, latency_ms: float, concurrency: List[int]) -> None:
+    server = serve(latency_ms / 1000)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    driver = None
+    try:
+        driver = launch_chrome()
+    except Exception as e:
+        print(f"webdriver skipped: {e.__class__.__name__}: {e}".splitlines()[0])
+
+    columns = [f"http x{n}" for n in concurrency] + ["webdriver"]
+    print(f"{'source':>10} " + " ".join(f"{c:>12}" for c in columns) + "   (pages/s)")
+    try:
+        for source in SOURCES:
+            urls = [f"{base}/{source}/page/{n}" for n in range(1, pages + 1)]
+            row = [measure(HttpFetcher(concurrency=n, http2=False), urls) for n in concurrency]
+            if driver is not None:
+                row.append(measure(WebDriverFetcher(lambda: driver), urls))
+            cells = [f"{value:>12.1f}" for value in row]
+            if driver is None:
+                cells.append(f"{'-':>12}")
+            print(f"{source:>10} " + " ".join(cells))
+    finally:
+        if driver is not None:
+            driver.quit()
+        server.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    args = parser.parse_args()
+    run(args.pages, args.latency_ms, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
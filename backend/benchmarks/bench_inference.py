@@ -0,0 +1,72 @@
+"""
+Latency, throughput and fp32 parity of each embedding inference backend.
+
+For every backend in ``engine.inference.BACKENDS`` this loads the model, checks
+cosine agreement with fp32 torch on the parity sentence set, then measures
+single-query latency and batched throughput.
+
+Usage:
+    python -m benchmarks.bench_inference
+    python -m benchmarks.bench_inference --backends torch torch-int8 --batch-size 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from engine.inference import (
+    BACKENDS,
+    DEFAULT_MODEL_NAME,
+    PARITY_SENTENCES,
+    load_model,
+    parity_check,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batches", type=int, default=10)
+    args = parser.parse_args()
+
+    reference = load_model(args.model, "torch")
+    batch = (PARITY_SENTENCES * (args.batch_size // len(PARITY_SENTENCES) + 1))[: args.batch_size]
+
+    print(
+        f"{'backend':>11} {'load_s':>7} {'min_cos':>8} {'nn_agree':>8} "
+        f"{'p50_ms':>7} {'p99_ms':>7} {'batch_sent/s':>12}"
+    )
+    for backend in args.backends:
+        start = time.perf_counter()
+        model = reference if backend == "torch" else load_model(args.model, backend)
+        load_s = time.perf_counter() - start
+        parity = parity_check(model, reference)
+
+        model.encode(PARITY_SENTENCES[0])
+        timings = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            model.encode(PARITY_SENTENCES[i % len(PARITY_SENTENCES)])
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(args.batches):
+            model.encode(batch, batch_size=args.batch_size)
+        throughput = args.batches * len(batch) / (time.perf_counter() - start)
+
+        print(
+            f"{backend:>11} {load_s:>7.1f} {parity['min_cosine']:>8.4f} "
+            f"{parity['nearest_neighbour_agreement']:>8.2f} "
+            f"{np.percentile(timings, 50) * 1000:>7.2f} {np.percentile(timings, 99) * 1000:>7.2f} "
+            f"{throughput:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
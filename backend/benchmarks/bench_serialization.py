@@ -0,0 +1,114 @@
+"""
+Serialization time of an /articles response: per-row Pydantic vs trusted rows.
+
+``before`` is what the listing endpoints used to do: build an
+``ArticleResponse`` per row, then let FastAPI's ``response_model`` dump,
+re-validate and serialize the list. ``after`` is the trust-on-read path:
+response dicts straight from the article store, serialized with orjson.
+``after+check`` adds the single ``TypeAdapter`` pass run with
+``VALIDATE_ON_READ=true``. ``cached`` joins warm fragments from
+``engine.fragment_cache``, which is what repeat requests for unchanged
+articles cost.
+
+Usage:
+    python -m benchmarks.bench_serialization
+    python -m benchmarks.bench_serialization --sizes 100 1000 10000 --repeats 20
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import orjson
+from pydantic import TypeAdapter
+
+from engine.article_store import RESPONSE_FIELDS, ArticleColumns
+from engine.fragment_cache import FragmentCache, json_array
+from models.core.article import ArticleResponse
+
+ADAPTER = TypeAdapter(List[ArticleResponse])
+
+
+def synthetic_rows(n: int) -> List[Dict[str, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": f"id-{i}",
+            "title": f"Scaling service {i} to millions of requests",
+            "url": f"https://example.com/blog/{i}",
+            "published_date": (start - timedelta(hours=i)).isoformat(),
+            "source": "Netflix Tech Blog",
+            "tags": ["kafka", "streaming", f"tag-{i % 50}"],
+            "category": "Backend",
+            "summary": "How we rebuilt the pipeline. " * 8,
+            "content": "",
+        }
+        for i in range(n)
+    ]
+
+
+def before(columns: ArticleColumns, positions: np.ndarray) -> bytes:
+    # The old ``_to_responses``: one model per row inside a try/except.
+    articles = [ArticleResponse(**record) for record in columns.records(positions)]
+    # FastAPI's response_model handling: dump, validate again, serialize.
+    dumped = [article.model_dump() for article in articles]
+    return ADAPTER.dump_json(ADAPTER.validate_python(dumped))
+
+
+def after(columns: ArticleColumns, positions: np.ndarray) -> bytes:
+    return orjson.dumps({"data": columns.responses(positions)})
+
+
+def after_checked(columns: ArticleColumns, positions: np.ndarray) -> bytes:
+    rows = columns.responses(positions)
+    ADAPTER.validate_python(rows)
+    return orjson.dumps({"data": rows})
+
+
+def cached(cache: FragmentCache, columns: ArticleColumns, positions: np.ndarray) -> bytes:
+    return b'{"data":' + json_array(cache.fragments(columns, positions, RESPONSE_FIELDS)) + b"}"
+
+
+def time_ms(fn: Callable[[], Any], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def run(sizes: List[int], repeats: int) -> None:
+    print(
+        f"{'rows':>8} {'before_ms':>10} {'after_ms':>9} {'after+check_ms':>15} "
+        f"{'cached_ms':>10} {'cache_MB':>9}"
+    )
+    for n in sizes:
+        columns = ArticleColumns(synthetic_rows(n), dim=4)
+        positions = columns.select()
+        cache = FragmentCache()
+        cached(cache, columns, positions)
+        before_ms = time_ms(lambda: before(columns, positions), repeats)
+        after_ms = time_ms(lambda: after(columns, positions), repeats)
+        checked_ms = time_ms(lambda: after_checked(columns, positions), repeats)
+        cached_ms = time_ms(lambda: cached(cache, columns, positions), repeats)
+        print(
+            f"{n:>8} {before_ms:>10.2f} {after_ms:>9.2f} {checked_ms:>15.2f} "
+            f"{cached_ms:>10.2f} {cache.stats()['bytes'] / 1e6:>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100, 1_000, 10_000])
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+    run(args.sizes, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
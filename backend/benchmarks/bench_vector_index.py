@@ -0,0 +1,97 @@
+"""
+Benchmark VectorIndex top-k search on synthetic embeddings.
+
+Compares the single matrix-vector product + argpartition path against the
+previous per-article Python loop (only for sizes where the loop is bearable).
+
+Usage:
+    python -m benchmarks.bench_vector_index
+    python -m benchmarks.bench_vector_index --sizes 10000 100000 --queries 50
+"""
+
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from engine.vector_index import VectorIndex, normalize_rows
+
+
+def synthetic_matrix(n: int, dim: int, seed: int = 0, chunk: int = 100_000) -> np.ndarray:
+    """Generate ``n`` random unit vectors without a float64 intermediate."""
+    rng = np.random.default_rng(seed)
+    matrix = np.empty((n, dim), dtype=np.float32)
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        matrix[start:stop] = rng.standard_normal((stop - start, dim), dtype=np.float32)
+    return normalize_rows(matrix)
+
+
+def loop_search(rows: List[List[float]], query: np.ndarray, top_k: int) -> List[int]:
+    """The old approach: score every article one at a time, then sort everything."""
+    scores = []
+    for i, emb in enumerate(rows):
+        vec = np.asarray(emb, dtype=np.float32)
+        scores.append((float(vec @ query / (np.linalg.norm(vec) * np.linalg.norm(query))), i))
+    scores.sort(reverse=True)
+    return [i for _, i in scores[:top_k]]
+
+
+def percentile_ms(samples: List[float], pct: float) -> float:
+    return float(np.percentile(samples, pct) * 1000)
+
+
+def run(sizes: List[int], dim: int, queries: int, top_k: int, loop_max: int) -> None:
+    print(f"{'n':>10} {'build_s':>9} {'mem_MB':>8} {'p50_ms':>8} {'p99_ms':>8} {'loop_p50_ms':>12}")
+    for n in sizes:
+        matrix = synthetic_matrix(n, dim)
+        ids = [str(i) for i in range(n)]
+
+        index = VectorIndex(dim=dim)
+        start = time.perf_counter()
+        index.build_from_matrix(matrix, ids, normalized=True)
+        build_s = time.perf_counter() - start
+
+        query_vectors = synthetic_matrix(queries, dim, seed=1)
+        timings = []
+        for q in query_vectors:
+            start = time.perf_counter()
+            index.search(q, top_k=top_k)
+            timings.append(time.perf_counter() - start)
+
+        loop_p50 = "-"
+        if n <= loop_max:
+            rows = matrix.tolist()
+            loop_timings = []
+            for q in query_vectors[: max(1, queries // 10)]:
+                start = time.perf_counter()
+                loop_search(rows, q, top_k)
+                loop_timings.append(time.perf_counter() - start)
+            loop_p50 = f"{percentile_ms(loop_timings, 50):.2f}"
+
+        print(
+            f"{n:>10} {build_s:>9.3f} {index.matrix.nbytes / 1e6:>8.1f} "
+            f"{percentile_ms(timings, 50):>8.2f} {percentile_ms(timings, 99):>8.2f} {loop_p50:>12}"
+        )
+        del matrix, index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument(
+        "--loop-max", type=int, default=10_000,
+        help="Largest size to run the Python loop baseline on",
+    )
+    args = parser.parse_args()
+    run(args.sizes, args.dim, args.queries, args.top_k, args.loop_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Versioned SQL migrations for the Postgres database behind Supabase.
+
+Migrations are ``db/migrations/NNNN_name.sql`` files. They are applied in
+version order, each in its own transaction, and recorded in
+``schema_migrations`` with a sha256 of the file, so a migration that was edited
+after it ran is reported instead of silently skipped. A session advisory lock
+keeps two deploys from migrating at the same time.
+
+Run from ``backend/`` with ``DATABASE_URL`` pointing at the database (the
+Supabase connection string, or a local Postgres)::
+
+    python -m db.migrate
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sys
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+ADVISORY_LOCK_ID = 7_402_116_001
+
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+_CREATE_LEDGER = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version     integer PRIMARY KEY,
+    name        text NOT NULL,
+    checksum    text NOT NULL,
+    applied_at  timestamptz NOT NULL DEFAULT now()
+)
+"""
+
+
+class MigrationError(Exception):
+    """Raised for malformed, duplicate or modified migrations."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """The migrations in ``directory``, in version order."""
+    migrations: List[Migration] = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".sql"):
+            continue
+        match = _FILENAME.match(filename)
+        if match is None:
+            raise MigrationError(f"Migration file name must look like 0001_name.sql: {filename}")
+        with open(os.path.join(directory, filename), encoding="utf-8") as f:
+            migrations.append(Migration(int(match.group(1)), match.group(2), f.read()))
+    versions = [migration.version for migration in migrations]
+    duplicates = sorted({v for v in versions if versions.count(v) > 1})
+    if duplicates:
+        raise MigrationError(f"Duplicate migration versions: {duplicates}")
+    return migrations
+
+
+def pending(migrations: List[Migration], applied: Dict[int, str]) -> List[Migration]:
+    """Migrations not yet in ``applied`` (version -> checksum); edited ones raise."""
+    for migration in migrations:
+        checksum = applied.get(migration.version)
+        if checksum is not None and checksum != migration.checksum:
+            raise MigrationError(
+                f"Migration {migration.version:04d}_{migration.name} changed after it was applied"
+            )
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+async def migrate(conn: Any, directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Apply pending migrations on an asyncpg connection; returns the ones applied."""
+    await conn.execute("SELECT pg_advisory_lock($1)", ADVISORY_LOCK_ID)
+    try:
+        await conn.execute(_CREATE_LEDGER)
+        rows = await conn.fetch("SELECT version, checksum FROM schema_migrations")
+        todo = pending(discover(directory), {row["version"]: row["checksum"] for row in rows})
+        for migration in todo:
+            async with conn.transaction():
+                await conn.execute(migration.sql)
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, name, checksum) VALUES ($1, $2, $3)",
+                    migration.version,
+                    migration.name,
+                    migration.checksum,
+                )
+            logger.info(f"Applied migration {migration.version:04d}_{migration.name}")
+        if not todo:
+            logger.info("Database schema is up to date")
+        return todo
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", ADVISORY_LOCK_ID)
+
+
+async def main(dsn: str) -> None:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        await migrate(conn)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        sys.exit("DATABASE_URL is not set")
+    asyncio.run(main(database_url))
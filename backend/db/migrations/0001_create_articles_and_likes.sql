@@ -0,0 +1,27 @@
+-- Baseline schema for the tables the API reads and writes.
+--
+-- Existing Supabase projects already have these tables; IF NOT EXISTS makes
+-- this migration a no-op there and lets a fresh database (local Postgres, CI)
+-- start from the same shape.
+
+CREATE TABLE IF NOT EXISTS articles (
+    id              uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    title           text NOT NULL,
+    url             text NOT NULL,
+    published_date  timestamptz,
+    source          text,
+    tags            text[] NOT NULL DEFAULT '{}',
+    category        text,
+    summary         text,
+    content         text,
+    embedding       double precision[],
+    inserted_at     timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS likes (
+    id           bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    user_id      text NOT NULL,
+    article_url  text NOT NULL,
+    liked        boolean NOT NULL DEFAULT false,
+    created_at   timestamptz NOT NULL DEFAULT now()
+);
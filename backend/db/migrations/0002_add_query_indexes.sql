@@ -0,0 +1,37 @@
+-- Indexes for the queries the API issues against articles and likes.
+--
+-- Listing indexes end in id so they match the (published_date, id) keyset
+-- order used by the article listings. On a large live table, create these
+-- with CREATE INDEX CONCURRENTLY by hand first; the IF NOT EXISTS guards then
+-- make this migration a no-op.
+
+-- trigger_scrape looks up already-saved articles by url.
+CREATE INDEX IF NOT EXISTS articles_url_idx ON articles (url);
+
+-- Listings ordered by publication date, overall and per source / category.
+CREATE INDEX IF NOT EXISTS articles_published_date_idx
+    ON articles (published_date, id);
+CREATE INDEX IF NOT EXISTS articles_source_published_date_idx
+    ON articles (source, published_date, id);
+CREATE INDEX IF NOT EXISTS articles_category_published_date_idx
+    ON articles (category, published_date, id);
+
+-- Tag containment / overlap filters (tags @> ARRAY[...], tags && ARRAY[...]).
+-- The default GIN operator class also covers tags stored as jsonb.
+CREATE INDEX IF NOT EXISTS articles_tags_gin_idx ON articles USING gin (tags);
+
+-- The article store's delta sync pages through rows newer than a watermark.
+CREATE INDEX IF NOT EXISTS articles_inserted_at_idx ON articles (inserted_at);
+
+-- One like row per (user, article): keep the newest duplicate, then enforce it
+-- so saving likes can upsert instead of appending. user_id leads the key, so
+-- this index also serves "likes of one user" for recommendations; a separate
+-- likes (user_id) index would only add write cost.
+DELETE FROM likes older
+    USING likes newer
+    WHERE older.user_id = newer.user_id
+      AND older.article_url = newer.article_url
+      AND older.id < newer.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS likes_user_id_article_url_key
+    ON likes (user_id, article_url);
@@ -0,0 +1,19 @@
+-- Row-level change timestamp for articles.
+--
+-- Cached per-article JSON fragments are keyed by (id, updated_at), so an edit
+-- made by any process changes the key and the stale fragment is never served.
+
+ALTER TABLE articles
+    ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS articles_set_updated_at ON articles;
+CREATE TRIGGER articles_set_updated_at
+    BEFORE UPDATE ON articles
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
@@ -0,0 +1,32 @@
+-- Monotonic per-table change counters.
+--
+-- Every inserted, updated or deleted row bumps its table's counter. The API
+-- derives ETags from these counters, and the article store compares them
+-- against what it has synced: an unchanged counter skips the delta query,
+-- and a counter that moved by more than the rows a delta returned (an edit
+-- or delete) triggers a full reload.
+
+CREATE TABLE IF NOT EXISTS corpus_versions (
+    name     text PRIMARY KEY,
+    version  bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO corpus_versions (name) VALUES ('articles'), ('likes')
+    ON CONFLICT (name) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_corpus_version() RETURNS trigger AS $$
+BEGIN
+    UPDATE corpus_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS articles_bump_corpus_version ON articles;
+CREATE TRIGGER articles_bump_corpus_version
+    AFTER INSERT OR UPDATE OR DELETE ON articles
+    FOR EACH ROW EXECUTE FUNCTION bump_corpus_version();
+
+DROP TRIGGER IF EXISTS likes_bump_corpus_version ON likes;
+CREATE TRIGGER likes_bump_corpus_version
+    AFTER INSERT OR UPDATE OR DELETE ON likes
+    FOR EACH ROW EXECUTE FUNCTION bump_corpus_version();
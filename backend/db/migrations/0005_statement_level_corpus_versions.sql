@@ -0,0 +1,56 @@
+-- Bump corpus_versions once per statement instead of once per row.
+--
+-- The row-level triggers from 0004 updated the shared counter row once for
+-- every row written, so a bulk insert took that row's lock N times and every
+-- concurrent writer to the table queued behind it. These triggers run once per
+-- statement and add the number of rows it touched, read from the transition
+-- table. The counter still moves by one per row written, which the article
+-- store relies on to tell inserts from edits and deletes.
+--
+-- Transition tables need one trigger per event.
+
+CREATE OR REPLACE FUNCTION bump_corpus_version_by_rows() RETURNS trigger AS $$
+DECLARE
+    touched bigint;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT count(*) INTO touched FROM old_rows;
+    ELSE
+        SELECT count(*) INTO touched FROM new_rows;
+    END IF;
+    IF touched > 0 THEN
+        UPDATE corpus_versions SET version = version + touched WHERE name = TG_TABLE_NAME;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS articles_bump_corpus_version ON articles;
+DROP TRIGGER IF EXISTS articles_bump_corpus_version_insert ON articles;
+CREATE TRIGGER articles_bump_corpus_version_insert
+    AFTER INSERT ON articles REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+DROP TRIGGER IF EXISTS articles_bump_corpus_version_update ON articles;
+CREATE TRIGGER articles_bump_corpus_version_update
+    AFTER UPDATE ON articles REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+DROP TRIGGER IF EXISTS articles_bump_corpus_version_delete ON articles;
+CREATE TRIGGER articles_bump_corpus_version_delete
+    AFTER DELETE ON articles REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+
+DROP TRIGGER IF EXISTS likes_bump_corpus_version ON likes;
+DROP TRIGGER IF EXISTS likes_bump_corpus_version_insert ON likes;
+CREATE TRIGGER likes_bump_corpus_version_insert
+    AFTER INSERT ON likes REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+DROP TRIGGER IF EXISTS likes_bump_corpus_version_update ON likes;
+CREATE TRIGGER likes_bump_corpus_version_update
+    AFTER UPDATE ON likes REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+DROP TRIGGER IF EXISTS likes_bump_corpus_version_delete ON likes;
+CREATE TRIGGER likes_bump_corpus_version_delete
+    AFTER DELETE ON likes REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version_by_rows();
+
+DROP FUNCTION IF EXISTS bump_corpus_version();
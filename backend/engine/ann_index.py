@@ -0,0 +1,256 @@
+"""
+Approximate nearest-neighbour search over article embeddings.
+
+``IVFIndex`` partitions the normalized embedding matrix with a spherical
+k-means coarse quantizer. A query only scores the vectors in the ``nprobe``
+lists whose centroids are closest to it, trading a little recall for a scan
+that no longer grows linearly with the corpus.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.atomic_file import replace_atomically
+from engine.vector_index import DEFAULT_DIM, VectorIndex, normalize_rows, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NPROBE = 8
+TRAIN_SAMPLES_PER_LIST = 256
+ASSIGN_CHUNK = 65_536
+
+
+def _base_path(path: str) -> str:
+    return path[:-4] if path.endswith(".npz") else path
+
+
+def default_nlist(n: int) -> int:
+    """Rule-of-thumb list count: about sqrt(n), at least 1."""
+    return max(1, int(np.sqrt(n)))
+
+
+def assign_to_centroids(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Return the nearest-centroid id for every row, computed in chunks."""
+    assignments = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], ASSIGN_CHUNK):
+        block = matrix[start:start + ASSIGN_CHUNK]
+        assignments[start:start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(matrix: np.ndarray, nlist: int, n_iter: int = 15, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on (a sample of) the normalized matrix."""
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    nlist = min(nlist, n)
+    sample_size = min(n, nlist * TRAIN_SAMPLES_PER_LIST)
+    sample = matrix[rng.choice(n, size=sample_size, replace=False)] if sample_size < n else matrix
+    centroids = sample[rng.choice(sample.shape[0], size=nlist, replace=False)].copy()
+
+    for _ in range(n_iter):
+        labels = assign_to_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Re-seed empty lists so every list stays useful.
+            sums[empty] = sample[rng.choice(sample.shape[0], size=int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex(VectorIndex):
+    """Inverted-file ANN index with a tunable ``nprobe`` recall/latency knob."""
+
+    def __init__(
+        self,
+        dim: int = DEFAULT_DIM,
+        nlist: Optional[int] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        retrain_growth: float = 2.0,
+    ) -> None:
+        super().__init__(dim=dim)
+        self.nlist: Optional[int] = nlist
+        self.nprobe: int = nprobe
+        self.retrain_growth: float = retrain_growth
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[np.ndarray] = []
+        self._trained_size: int = 0
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    def reuse_quantizer(self, other: "IVFIndex") -> None:
+        """Adopt another index's trained centroids so a rebuild skips k-means."""
+        if other.is_trained and other.dim == self.dim:
+            self.centroids = other.centroids
+            self._trained_size = other._trained_size
+
+    def needs_training(self, n: int) -> bool:
+        """Whether ``n`` vectors have outgrown the quantizer (``retrain_growth`` times its
+        training size), or it was never trained."""
+        if not self.is_trained:
+            return True
+        return n > self._trained_size * self.retrain_growth
+
+    def _rebuild_lists(self, assignments: np.ndarray) -> None:
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(self.centroids.shape[0] + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(self.centroids.shape[0])]
+
+    def train(self, matrix: Optional[np.ndarray] = None) -> None:
+        """(Re)train the coarse quantizer on ``matrix`` or the current contents."""
+        matrix = self.matrix if matrix is None else matrix
+        if matrix.shape[0] == 0:
+            return
+        nlist = self.nlist or default_nlist(matrix.shape[0])
+        self.centroids = train_centroids(matrix, nlist)
+        self._trained_size = matrix.shape[0]
+        logger.info(
+            f"IVFIndex trained {self.centroids.shape[0]} lists on {matrix.shape[0]} vectors"
+        )
+
+    def _index_current(self) -> None:
+        matrix = self.matrix
+        if matrix.shape[0] == 0:
+            self._lists = []
+            return
+        if self.needs_training(matrix.shape[0]):
+            self.train(matrix)
+        self._rebuild_lists(assign_to_centroids(matrix, self.centroids))
+
+    def build(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        embedding_key: str = "embedding",
+        id_key: str = "url",
+    ) -> int:
+        """Replace the contents, reusing trained centroids unless the corpus outgrew them."""
+        count = super().build(rows, embedding_key=embedding_key, id_key=id_key)
+        self._index_current()
+        return count
+
+    def build_from_matrix(
+        self,
+        matrix: np.ndarray,
+        ids: Sequence[str],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+        normalized: bool = False,
+    ) -> int:
+        count = super().build_from_matrix(matrix, ids, metadata=metadata, normalized=normalized)
+        self._index_current()
+        return count
+
+    def add(
+        self,
+        vectors: np.ndarray,
+        ids: Sequence[str],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> int:
+        """Append vectors incrementally; only their list assignment is computed."""
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim).copy())
+        matrix, old_ids, old_meta = self._state
+        new_meta = list(metadata) if metadata is not None else [{} for _ in ids]
+        combined = np.concatenate([matrix, vectors]) if matrix.shape[0] else vectors
+        self._state = (combined, old_ids + list(ids), old_meta + new_meta)
+
+        if self.needs_training(combined.shape[0]):
+            self._index_current()
+        else:
+            start = matrix.shape[0]
+            labels = assign_to_centroids(vectors, self.centroids)
+            for list_id in np.unique(labels):
+                new_rows = start + np.flatnonzero(labels == list_id)
+                self._lists[list_id] = np.concatenate([self._lists[list_id], new_rows])
+        return len(ids)
+
+    def candidate_rows(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Row ids stored in the ``nprobe`` lists closest to a normalized query."""
+        nprobe = min(nprobe or self.nprobe, len(self._lists))
+        probes = top_k_indices(self.centroids @ query, nprobe)
+        return np.concatenate([self._lists[i] for i in probes])
+
+    def search(
+        self,
+        query_embedding: Any,
+        top_k: int = 10,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Approximate top-k; falls back to the exact scan while untrained."""
+        matrix, _, metadata = self._state
+        if matrix.shape[0] == 0:
+            return []
+        if not self.is_trained or not self._lists:
+            return super().search(query_embedding, top_k=top_k)
+
+        query = self.prepare_query(query_embedding)
+        rows = self.candidate_rows(query, nprobe)
+        # Rows appended by a concurrent add() may not be in this snapshot yet.
+        rows = rows[rows < matrix.shape[0]]
+        scores = matrix[rows] @ query
+        return [(float(scores[i]), metadata[rows[i]]) for i in top_k_indices(scores, top_k)]
+
+    def save(self, path: str) -> None:
+        """Persist vectors, ids and quantizer to ``path`` (.npz) plus a metadata sidecar.
+
+        Each file is written to a temp file and renamed into place, so a reader
+        never sees a partial file. The sidecar goes first; ``load`` rejects a
+        pair whose lengths disagree.
+        """
+        path = _base_path(path)
+        matrix, ids, metadata = self._state
+        n = matrix.shape[0]
+        assignments = np.empty(n, dtype=np.int32)
+        for list_id, rows in enumerate(self._lists):
+            # Skip rows a concurrent add() appended after the snapshot above.
+            assignments[rows[rows < n]] = list_id
+        replace_atomically(
+            f"{path}.meta.json",
+            lambda f: f.write(json.dumps(metadata, default=str).encode()),
+        )
+        replace_atomically(
+            f"{path}.npz",
+            lambda f: np.savez(
+                f,
+                matrix=matrix,
+                ids=np.asarray(ids, dtype=str),
+                centroids=(
+                    self.centroids if self.is_trained else np.empty((0, self.dim), np.float32)
+                ),
+                assignments=assignments,
+                params=np.asarray(
+                    [self.nlist or 0, self.nprobe, self._trained_size], dtype=np.int64
+                ),
+            ),
+        )
+        logger.info(f"IVFIndex saved {len(ids)} vectors to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        """Load an index written by :meth:`save`."""
+        path = _base_path(path)
+        with np.load(f"{path}.npz") as data:
+            matrix = data["matrix"]
+            nlist, nprobe, trained_size = (int(x) for x in data["params"])
+            index = cls(dim=matrix.shape[1], nlist=nlist or None, nprobe=nprobe)
+            ids = data["ids"].tolist()
+            centroids = data["centroids"]
+            assignments = data["assignments"]
+
+        meta_path = f"{path}.meta.json"
+        metadata = None
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                metadata = json.load(f)
+        VectorIndex.build_from_matrix(index, matrix, ids, metadata=metadata, normalized=True)
+        if centroids.shape[0]:
+            index.centroids = centroids
+            index._trained_size = trained_size
+            index._rebuild_lists(assignments)
+        return index
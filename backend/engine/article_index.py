@@ -0,0 +1,314 @@
+"""
+Shared article embedding index used by search and recommendations.
+
+The index is built from the in-process article store (``engine.article_store``)
+and rebuilt whenever the store picks up new articles or a scrape invalidates
+it. Refreshes build a new index and swap it in, so in-flight queries keep their
+snapshot.
+
+``ARTICLE_INDEX_MODE`` selects ``exact`` (default), ``ivf`` approximate search,
+``compressed`` int8/PCA candidate scoring with exact rescoring, or ``sharded``
+scatter-gather search; ``IVF_NLIST``/``IVF_NPROBE`` tune IVF and
+``ARTICLE_INDEX_PATH`` persists it. An IVF index takes rows inserted since the
+last build with ``IVFIndex.add`` and is only rebuilt after a full store reload
+or once the corpus outgrows its quantizer by ``IVF_RETRAIN_GROWTH``. One
+process (whichever holds ``<ARTICLE_INDEX_PATH>.lock``) saves it, on a
+background thread. Sharded mode starts ``ARTICLE_SHARDS`` local
+shard processes, or connects to the servers in ``ARTICLE_SHARD_ADDRESSES``.
+
+When ``ARTICLE_SNAPSHOT_DIR`` is set, workers serve the published mmap snapshot
+(see ``engine.snapshot``) instead of each loading the corpus from Supabase, and
+the shared article store skips embeddings. Publishing, or building an index
+before the first snapshot exists, loads them into a separate store.
+"""
+
+import fcntl
+import logging
+import os
+import threading
+import time
+from typing import IO, List, Optional, Tuple
+
+import numpy as np
+
+from engine.ann_index import DEFAULT_NPROBE, IVFIndex
+from engine.article_store import ArticleColumns, ArticleStore, get_article_store
+from engine.compressed_index import DEFAULT_REDUCED_DIM, DEFAULT_RERANK_FACTOR, CompressedIndex
+from engine.sharding import DEFAULT_SHARD_LOAD_TIMEOUT, DEFAULT_SHARD_TIMEOUT, ShardedIndex
+from engine.snapshot import SnapshotWatcher, write_snapshot
+from engine.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_INDEX_MODE: str = os.getenv("ARTICLE_INDEX_MODE", "exact").lower()
+ARTICLE_INDEX_PATH: str = os.getenv("ARTICLE_INDEX_PATH", "")
+IVF_NLIST: int = int(os.getenv("IVF_NLIST", "0"))
+IVF_NPROBE: int = int(os.getenv("IVF_NPROBE", str(DEFAULT_NPROBE)))
+IVF_RETRAIN_GROWTH: float = float(os.getenv("IVF_RETRAIN_GROWTH", "2.0"))
+ARTICLE_SNAPSHOT_DIR: str = os.getenv("ARTICLE_SNAPSHOT_DIR", "")
+COMPRESSED_DIM: int = int(os.getenv("COMPRESSED_DIM", str(DEFAULT_REDUCED_DIM)))
+COMPRESSED_INT8: bool = os.getenv("COMPRESSED_INT8", "true").lower() == "true"
+COMPRESSED_RERANK_FACTOR: int = int(
+    os.getenv("COMPRESSED_RERANK_FACTOR", str(DEFAULT_RERANK_FACTOR))
+)
+ARTICLE_PROJECTION_PATH: str = os.getenv("ARTICLE_PROJECTION_PATH", "")
+ARTICLE_SHARDS: int = int(os.getenv("ARTICLE_SHARDS", "2"))
+ARTICLE_SHARD_ADDRESSES: str = os.getenv("ARTICLE_SHARD_ADDRESSES", "")
+ARTICLE_SHARD_MAX_ROWS: int = int(os.getenv("ARTICLE_SHARD_MAX_ROWS", "0"))
+ARTICLE_SHARD_TIMEOUT: float = float(
+    os.getenv("ARTICLE_SHARD_TIMEOUT", str(DEFAULT_SHARD_TIMEOUT))
+)
+ARTICLE_SHARD_LOAD_TIMEOUT: float = float(
+    os.getenv("ARTICLE_SHARD_LOAD_TIMEOUT", str(DEFAULT_SHARD_LOAD_TIMEOUT))
+)
+SHARD_AUTHKEY: str = os.getenv("SHARD_AUTHKEY", "")
+
+_index: VectorIndex = VectorIndex()
+_built_version: int = 0
+# The store full load the index was built from; None for a persisted index.
+_built_loaded_version: Optional[int] = None
+_stale: bool = True
+_lock = threading.Lock()
+_embedding_store: Optional[ArticleStore] = None
+_save_requested = threading.Event()
+_saver: Optional[threading.Thread] = None
+# Held open (and flock-ed) by the one process that saves the IVF index.
+_save_lock_file: Optional[IO[str]] = None
+
+
+def _parse_shard_addresses(value: str) -> List[Tuple[str, int]]:
+    addresses = []
+    for item in value.split(","):
+        if item.strip():
+            host, _, port = item.strip().rpartition(":")
+            addresses.append((host, int(port)))
+    return addresses
+
+
+def _new_index(previous: VectorIndex) -> VectorIndex:
+    if ARTICLE_INDEX_MODE == "sharded":
+        # Shard processes are long-lived; the coordinator is rebuilt in place.
+        if isinstance(previous, ShardedIndex):
+            return previous
+        return ShardedIndex(
+            num_shards=ARTICLE_SHARDS,
+            addresses=_parse_shard_addresses(ARTICLE_SHARD_ADDRESSES),
+            authkey=SHARD_AUTHKEY.encode() or None,
+            max_shard_rows=ARTICLE_SHARD_MAX_ROWS,
+            timeout=ARTICLE_SHARD_TIMEOUT,
+            load_timeout=ARTICLE_SHARD_LOAD_TIMEOUT,
+        )
+    if ARTICLE_INDEX_MODE == "compressed":
+        compressed = CompressedIndex(
+            reduced_dim=COMPRESSED_DIM,
+            quantize=COMPRESSED_INT8,
+            rerank_factor=COMPRESSED_RERANK_FACTOR,
+            projection_path=ARTICLE_PROJECTION_PATH,
+        )
+        if isinstance(previous, CompressedIndex):
+            compressed.reuse_projection(previous)
+        elif ARTICLE_PROJECTION_PATH:
+            compressed.load_projection(ARTICLE_PROJECTION_PATH)
+        return compressed
+    if ARTICLE_INDEX_MODE != "ivf":
+        return VectorIndex()
+    index = IVFIndex(nlist=IVF_NLIST or None, nprobe=IVF_NPROBE, retrain_growth=IVF_RETRAIN_GROWTH)
+    if isinstance(previous, IVFIndex):
+        index.reuse_quantizer(previous)
+    return index
+
+
+def _snapshot_index(previous: Optional[VectorIndex]) -> Optional[VectorIndex]:
+    """The index a published snapshot is loaded into; None for a plain VectorIndex.
+
+    In compressed mode the compact tier is built per worker, while rescoring
+    reads the snapshot's shared mmap instead of a private float32 copy.
+    """
+    if ARTICLE_INDEX_MODE == "compressed":
+        return _new_index(previous)
+    return None
+
+
+_watcher: Optional[SnapshotWatcher] = (
+    SnapshotWatcher(ARTICLE_SNAPSHOT_DIR, new_index=_snapshot_index)
+    if ARTICLE_SNAPSHOT_DIR
+    else None
+)
+
+
+def load_persisted_index() -> bool:
+    """Load a previously saved IVF index from ``ARTICLE_INDEX_PATH`` if one exists.
+
+    Its trained lists are reused when the index is first built from the
+    article store, so the rebuild skips k-means.
+    """
+    global _index, _built_loaded_version, _stale
+    if ARTICLE_INDEX_MODE != "ivf" or not ARTICLE_INDEX_PATH:
+        return False
+    if not os.path.exists(f"{ARTICLE_INDEX_PATH}.npz"):
+        return False
+    try:
+        index = IVFIndex.load(ARTICLE_INDEX_PATH)
+    except Exception as e:
+        logger.warning(f"Could not load persisted article index: {e}")
+        return False
+    index.nprobe = IVF_NPROBE
+    index.retrain_growth = IVF_RETRAIN_GROWTH
+    _index = index
+    _built_loaded_version = None
+    _stale = False
+    logger.info(f"Loaded persisted article index with {len(index)} vectors")
+    return True
+
+
+def _index_store() -> ArticleStore:
+    """The article store the index is built from: the shared one, unless it skips embeddings."""
+    global _embedding_store
+    store = get_article_store()
+    if store.with_embeddings:
+        return store
+    with _lock:
+        if _embedding_store is None:
+            _embedding_store = ArticleStore(dim=store.dim)
+        return _embedding_store
+
+
+def _is_index_saver() -> bool:
+    """Whether this process saves the IVF index: the one holding ``<path>.lock``."""
+    global _save_lock_file
+    if _save_lock_file is None:
+        lock_file = open(f"{ARTICLE_INDEX_PATH}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        _save_lock_file = lock_file
+    return True
+
+
+def _save_loop() -> None:
+    while True:
+        _save_requested.wait()
+        _save_requested.clear()
+        index = _index
+        if isinstance(index, IVFIndex):
+            try:
+                index.save(ARTICLE_INDEX_PATH)
+            except Exception as e:
+                logger.error(f"Failed to save the article index: {e}")
+
+
+def _request_save() -> None:
+    """Save the current index on the background saver, if this process is the saver.
+
+    Requests made while a save is running are coalesced into one more save.
+    """
+    global _saver
+    if not ARTICLE_INDEX_PATH or not _is_index_saver():
+        return
+    _save_requested.set()
+    if _saver is None:
+        _saver = threading.Thread(target=_save_loop, name="article-index-saver", daemon=True)
+        _saver.start()
+
+
+def _appended_positions(index: VectorIndex, columns: ArticleColumns) -> Optional[np.ndarray]:
+    """Positions of the rows an IVF index lacks, when adding them brings it up to date.
+
+    None means rebuild: the index isn't a trained IVF index, the store reloaded
+    (a full load can carry edits and deletes), rows went missing, or the added
+    rows would take the corpus past the quantizer's retrain threshold.
+    """
+    if not isinstance(index, IVFIndex) or not index.is_trained:
+        return None
+    if _built_loaded_version is not None and columns.loaded_version != _built_loaded_version:
+        return None
+    known = set(index.ids)
+    positions = columns.embedding_positions
+    appended = np.asarray([p for p in positions if columns.urls[p] not in known], dtype=np.int64)
+    if len(known) + len(appended) != len(positions):
+        return None
+    if index.needs_training(len(positions)):
+        return None
+    return appended
+
+
+def _shards_lost() -> bool:
+    """A shard server restarted, or dropped our rows, since the last build."""
+    return isinstance(_index, ShardedIndex) and _index.lost
+
+
+def get_article_index(force_refresh: bool = False) -> VectorIndex:
+    """Return the shared index, rebuilding it when the article store has changed."""
+    global _index, _built_version, _built_loaded_version, _stale
+    if _watcher is not None and not force_refresh:
+        snapshot_index = _watcher.get()
+        if snapshot_index is not None:
+            return snapshot_index
+    store = _index_store()
+    columns = store.load() if force_refresh else store.snapshot()
+    current = not _stale and not _shards_lost() and columns.version == _built_version
+    if not force_refresh and current:
+        return _index
+
+    with _lock:
+        # Another thread may have refreshed while we waited for the lock.
+        columns = store.snapshot()
+        if force_refresh or _stale or _shards_lost() or columns.version != _built_version:
+            start = time.perf_counter()
+            appended = None if force_refresh else _appended_positions(_index, columns)
+            if appended is not None:
+                # Rows of the embedding matrix, which only holds rows with one.
+                rows = np.searchsorted(columns.embedding_positions, appended)
+                if len(rows):
+                    _index.add(
+                        columns.embeddings[rows],
+                        [columns.urls[p] for p in appended],
+                        columns.records(appended),
+                    )
+                action = f"added {len(appended)} articles to"
+            else:
+                index = _new_index(_index)
+                matrix, urls, metadata = columns.index_inputs()
+                if isinstance(index, ShardedIndex):
+                    # Workers synced to the same corpus version share shard rows.
+                    index.build_from_matrix(
+                        matrix, urls, metadata, normalized=True, version=columns.token
+                    )
+                else:
+                    index.build_from_matrix(matrix, urls, metadata, normalized=True)
+                _index = index
+                action = "rebuilt"
+            _built_version = columns.version
+            _built_loaded_version = columns.loaded_version
+            _stale = False
+            if isinstance(_index, IVFIndex) and (appended is None or len(appended)):
+                _request_save()
+            logger.info(f"Article index {action} in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return _index
+
+
+def publish_snapshot(directory: str = ARTICLE_SNAPSHOT_DIR, model_id: str = "") -> int:
+    """Publish the article store's embeddings, synced first, as a new snapshot version."""
+    with _index_store().synced() as columns:
+        matrix, urls, metadata = columns.index_inputs()
+        return write_snapshot(directory, matrix, urls, metadata, model_id=model_id)
+
+
+def invalidate_article_index() -> None:
+    """Tell the article store to sync and mark the shared index stale.
+
+    In snapshot mode a new snapshot is published as well, which every worker
+    picks up on its next pointer check.
+    """
+    global _stale
+    get_article_store().notify_changed()
+    if _embedding_store is not None:
+        _embedding_store.notify_changed()
+    _stale = True
+    if ARTICLE_SNAPSHOT_DIR:
+        try:
+            publish_snapshot(ARTICLE_SNAPSHOT_DIR)
+        except Exception as e:
+            logger.error(f"Failed to publish article snapshot: {e}")
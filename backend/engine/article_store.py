@@ -0,0 +1,736 @@
+"""
+In-process columnar copy of the ``articles`` table.
+
+Read endpoints used to ``select("*")`` the whole table per request and
+re-validate every row. ``ArticleStore`` loads the table once, selecting only
+``STORE_COLUMNS``, validates each row once on the way in, and keeps it as
+parallel columns:
+
+- ids, urls, titles, summaries, contents and raw ``published_date`` strings
+- ``published_ts``: float64 epoch seconds (NaN when missing), for sorting
+- source and category codes into small dictionaries
+- per-row int32 tag id arrays into a tag dictionary, plus an inverted tag
+  index (``engine.tag_index``) built once per snapshot
+- one L2-normalized float32 embedding matrix holding only the rows that have
+  an embedding, contiguous and in row order, so the search index is built from
+  it without a copy; ``has_embedding`` masks which rows those are
+- a per-row revision: ``updated_at`` when the table has it, otherwise the
+  store version the row was loaded in; keys ``engine.fragment_cache``
+
+Validation is one ``TypeAdapter`` pass per load, and rows that fail are
+dropped there. Read paths trust the snapshot: ``ArticleColumns.responses``
+builds plain response dicts that routes serialize without validating them
+again.
+
+Queries run against an immutable ``ArticleColumns`` snapshot; syncs build a
+new snapshot and swap it in. After the initial load only rows inserted since
+the ``inserted_at`` watermark are fetched, every ``ARTICLE_STORE_POLL_SECONDS``
+or straight after ``notify_changed()`` (called when a scrape saves articles).
+A full reload every ``ARTICLE_STORE_FULL_RELOAD_SECONDS`` picks up edits and
+deletes, which the watermark cannot see.
+
+With migration ``0004`` applied, each sync first reads the shared ``articles``
+counter (``engine.corpus_version``). An unchanged counter means there is
+nothing to fetch. If the counter moved by more than the number of new rows
+the delta returned, something was edited or deleted and the store reloads
+straight away. Snapshots carry the counter they are synced to, which the API
+uses for ETags.
+
+Rows are kept in a total order on ``(published_date, id)``, newest first, so
+listings page with keyset cursors: a cursor encodes the key of the last row a
+client saw and ``ArticleColumns.page`` binary-searches for it. Page cost
+depends on ``limit``, not on how deep the client has paged.
+
+When ``ARTICLE_SNAPSHOT_DIR`` is set the search index is served from the
+published mmap snapshot, so the shared store does not load embeddings at all.
+"""
+
+import base64
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter as TallyCounter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+from pydantic import ValidationError
+
+from engine.corpus_version import BOOT_ID
+from engine.tag_index import TagIndex
+from engine.vector_index import DEFAULT_DIM, normalize_rows
+
+logger = logging.getLogger(__name__)
+
+ARTICLE_STORE_POLL_SECONDS: float = float(os.getenv("ARTICLE_STORE_POLL_SECONDS", "30"))
+ARTICLE_STORE_FULL_RELOAD_SECONDS: float = float(
+    os.getenv("ARTICLE_STORE_FULL_RELOAD_SECONDS", "3600")
+)
+ARTICLE_STORE_PAGE_SIZE: int = int(os.getenv("ARTICLE_STORE_PAGE_SIZE", "1000"))
+WATERMARK_COLUMN = "inserted_at"
+# Set: workers search the published snapshot (``engine.snapshot``), not the store.
+ARTICLE_SNAPSHOT_DIR: str = os.getenv("ARTICLE_SNAPSHOT_DIR", "")
+
+STORE_ROWS = Gauge("article_store_rows", "Articles held by the in-process article store")
+STORE_BYTES = Gauge("article_store_bytes", "Approximate memory held by the article store")
+STORE_STALENESS = Gauge(
+    "article_store_staleness_seconds", "Seconds since the article store last synced"
+)
+STORE_SYNCS = Counter("article_store_syncs_total", "Article store syncs", ["kind"])
+STORE_SYNCED_ROWS = Counter("article_store_synced_rows_total", "Rows fetched by syncs", ["kind"])
+
+# The ``ArticleResponse`` fields, in response order.
+RESPONSE_FIELDS = ("title", "url", "published_date", "source", "tags", "category", "summary")
+# The columns a load selects: what the snapshot keeps plus the sync bookkeeping.
+# Anything else added to ``articles`` stays in the database.
+STORE_COLUMNS = (
+    "id",
+    *RESPONSE_FIELDS,
+    "content",
+    "embedding",
+    WATERMARK_COLUMN,
+    "updated_at",
+)
+
+# fetch(watermark, offset, limit) -> rows; watermark None means the whole table.
+FetchPage = Callable[[Optional[str], int, int], List[Dict[str, Any]]]
+# The shared ``articles`` change counter, or None when it is unavailable.
+FetchVersion = Callable[[], Optional[int]]
+
+
+def _timestamp(value: Any) -> float:
+    if value is None or value == "":
+        return math.nan
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return math.nan
+
+
+def _valid_embedding(embedding: Any, dim: int) -> bool:
+    if embedding is None or len(embedding) != dim:
+        return False
+    vector = np.asarray(embedding, dtype=np.float32)
+    return bool(np.all(np.isfinite(vector)) and np.any(vector))
+
+
+def encode_cursor(published_ts: float, article_id: str) -> str:
+    """Opaque cursor for the row with this ``(published_ts, id)`` key."""
+    key = [None if math.isnan(published_ts) else published_ts, article_id]
+    blob = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(blob).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """The ``(published_ts, id)`` key of a cursor; raises ``ValueError`` if it is malformed."""
+    try:
+        blob = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_ts, article_id = json.loads(blob)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(article_id, str) or not (
+        published_ts is None or isinstance(published_ts, (int, float))
+    ):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return (math.nan if published_ts is None else float(published_ts)), article_id
+
+
+@lru_cache(maxsize=1)
+def _rows_adapter() -> Any:
+    from pydantic import TypeAdapter
+
+    from models.core.article import ArticleResponse
+
+    return TypeAdapter(List[ArticleResponse])
+
+
+def validate_rows(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """The rows that validate as ``ArticleResponse``, checked in one batch pass."""
+    rows = list(rows)
+    try:
+        _rows_adapter().validate_python(rows)
+        return rows
+    except ValidationError as ve:
+        failures: Dict[int, List[str]] = {}
+        for error in ve.errors():
+            loc = error["loc"]
+            field = ".".join(str(part) for part in loc[1:])
+            failures.setdefault(loc[0], []).append(f"{field}: {error['msg']}")
+    for i, messages in failures.items():
+        logger.error(f"Validation error for article: {rows[i].get('url')} | {'; '.join(messages)}")
+    logger.warning(f"{len(failures)} articles failed validation and were not loaded")
+    return [row for i, row in enumerate(rows) if i not in failures]
+
+
+def shared_articles_version() -> Optional[int]:
+    """Fresh read of the shared ``articles`` counter from ``corpus_versions``."""
+    from engine.corpus_version import corpus_versions
+
+    versions = corpus_versions.refresh()
+    return versions.get("articles") if versions else None
+
+
+_store_columns: Tuple[str, ...] = STORE_COLUMNS
+
+
+def supabase_fetch_page(
+    watermark: Optional[str], offset: int, limit: int, with_embeddings: bool = True
+) -> List[Dict[str, Any]]:
+    """Fetch one page of articles, only those inserted after ``watermark`` if given."""
+    from db.supabase_client import supabase
+
+    global _store_columns
+
+    def fetch(columns: Sequence[str]) -> List[Dict[str, Any]]:
+        select = ", ".join(c for c in columns if with_embeddings or c != "embedding")
+        query = supabase.table("articles").select(select)
+        if watermark is not None:
+            query = query.gt(WATERMARK_COLUMN, watermark)
+        result = query.order(WATERMARK_COLUMN).range(offset, offset + limit - 1).execute()
+        return result.data or []
+
+    try:
+        return fetch(_store_columns)
+    except Exception as e:
+        if "updated_at" not in str(e) or "updated_at" not in _store_columns:
+            raise
+        # Migration 0003 isn't applied; revisions fall back to store versions.
+        logger.warning("articles.updated_at does not exist yet, loading without it")
+        _store_columns = tuple(column for column in STORE_COLUMNS if column != "updated_at")
+        return fetch(_store_columns)
+
+
+class ArticleColumns:
+    """Immutable columnar snapshot of the articles, ordered by (published_date, id) descending."""
+
+    def __init__(
+        self,
+        rows: Sequence[Dict[str, Any]] = (),
+        dim: int = DEFAULT_DIM,
+        version: int = 0,
+        tag_counts: Optional[TallyCounter] = None,
+        corpus_version: Optional[int] = None,
+        with_embeddings: bool = True,
+        loaded_version: Optional[int] = None,
+    ) -> None:
+        self.dim: int = dim
+        self.with_embeddings: bool = with_embeddings
+        self.version: int = version
+        # The full load this snapshot descends from; delta merges keep it.
+        self.loaded_version: int = version if loaded_version is None else loaded_version
+        self.corpus_version: Optional[int] = corpus_version
+        self._tag_counts: Optional[TallyCounter] = tag_counts
+        self._tag_index: Optional[TagIndex] = None
+        self.sources: List[str] = []
+        self.categories: List[str] = []
+        self.tags: List[str] = []
+        self._source_codes: Dict[str, int] = {}
+        self._category_codes: Dict[str, int] = {}
+        self._tag_codes: Dict[str, int] = {}
+
+        ids: List[str] = []
+        urls: List[str] = []
+        titles: List[str] = []
+        summaries: List[Optional[str]] = []
+        contents: List[Optional[str]] = []
+        published: List[Optional[str]] = []
+        revisions: List[str] = []
+        timestamps: List[float] = []
+        source_codes: List[int] = []
+        category_codes: List[int] = []
+        tag_ids: List[np.ndarray] = []
+        vectors: List[Any] = []
+        for row in rows:
+            ids.append(str(row.get("id") or row["url"]))
+            urls.append(row["url"])
+            titles.append(row["title"])
+            summaries.append(row.get("summary"))
+            contents.append(row.get("content"))
+            published.append(self._published_string(row.get("published_date")))
+            revisions.append(str(row.get("updated_at") or f"v{version}"))
+            timestamps.append(_timestamp(row.get("published_date")))
+            source_codes.append(
+                self._code(row.get("source") or "", self.sources, self._source_codes)
+            )
+            category_codes.append(
+                self._code(row.get("category") or "", self.categories, self._category_codes)
+            )
+            tag_ids.append(
+                np.fromiter(
+                    (self._code(tag, self.tags, self._tag_codes) for tag in row.get("tags") or []),
+                    dtype=np.int32,
+                )
+            )
+            vectors.append(row.get("embedding") if with_embeddings else None)
+
+        self.published_ts: np.ndarray = np.asarray(timestamps, dtype=np.float64)
+        # Newest first, ties broken by id so cursors are unambiguous; undated
+        # articles sort last, as they did when sorting date strings.
+        sort_ts = np.nan_to_num(self.published_ts, nan=-np.inf)
+        order = np.lexsort((np.asarray(ids, dtype=str), sort_ts))[::-1] if ids else []
+        self.published_ts = self.published_ts[order]
+        self.ids: List[str] = [ids[i] for i in order]
+        self.urls: List[str] = [urls[i] for i in order]
+        self.titles: List[str] = [titles[i] for i in order]
+        self.summaries: List[Optional[str]] = [summaries[i] for i in order]
+        self.contents: List[Optional[str]] = [contents[i] for i in order]
+        self.published: List[Optional[str]] = [published[i] for i in order]
+        self.revisions: List[str] = [revisions[i] for i in order]
+        self.source_codes: np.ndarray = np.asarray(source_codes, dtype=np.int32)[order]
+        self.category_codes: np.ndarray = np.asarray(category_codes, dtype=np.int32)[order]
+        self.tag_ids: List[np.ndarray] = [tag_ids[i] for i in order]
+
+        self.has_embedding: np.ndarray = np.fromiter(
+            (_valid_embedding(vectors[i], dim) for i in order), dtype=bool, count=len(order)
+        )
+        # Positions of the rows that have an embedding; row k of ``embeddings``
+        # belongs to position ``embedding_positions[k]``.
+        self.embedding_positions: np.ndarray = np.flatnonzero(self.has_embedding)
+        self._embedding_rows: np.ndarray = np.full(len(order), -1, dtype=np.int64)
+        self._embedding_rows[self.embedding_positions] = np.arange(len(self.embedding_positions))
+        self.embeddings: np.ndarray = np.empty(
+            (len(self.embedding_positions), dim), dtype=np.float32
+        )
+        for row, position in enumerate(self.embedding_positions):
+            self.embeddings[row] = vectors[order[position]]
+        normalize_rows(self.embeddings)
+        self._sort_ts: np.ndarray = np.nan_to_num(self.published_ts, nan=-np.inf)
+        self._positions: Dict[str, int] = {article_id: i for i, article_id in enumerate(self.ids)}
+        self._url_positions: Dict[str, int] = {url: i for i, url in enumerate(self.urls)}
+
+    @staticmethod
+    def _code(value: str, values: List[str], codes: Dict[str, int]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(values)
+            values.append(value)
+        return code
+
+    @staticmethod
+    def _published_string(value: Any) -> Optional[str]:
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value or None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def record(self, i: int, with_embedding: bool = False) -> Dict[str, Any]:
+        """Row ``i`` as the dict shape Supabase returns."""
+        row = {
+            "id": self.ids[i],
+            "title": self.titles[i],
+            "url": self.urls[i],
+            "published_date": self.published[i],
+            "source": self.sources[self.source_codes[i]],
+            "tags": [self.tags[t] for t in self.tag_ids[i]],
+            "category": self.categories[self.category_codes[i]],
+            "summary": self.summaries[i],
+            "content": self.contents[i],
+        }
+        if with_embedding:
+            embedding = self.embedding(i)
+            row["embedding"] = embedding.tolist() if embedding is not None else None
+        return row
+
+    def embedding(self, i: int) -> Optional[np.ndarray]:
+        """Row ``i``'s normalized embedding (a view), or None when it has none."""
+        row = self._embedding_rows[i]
+        return self.embeddings[row] if row >= 0 else None
+
+    def records(
+        self, positions: Iterable[int], with_embedding: bool = False
+    ) -> List[Dict[str, Any]]:
+        return [self.record(int(i), with_embedding) for i in positions]
+
+    def response(self, i: int) -> Dict[str, Any]:
+        """Row ``i`` with exactly the ``ArticleResponse`` fields, ready to serialize."""
+        return {
+            "title": self.titles[i],
+            "url": self.urls[i],
+            "published_date": self.published[i],
+            "source": self.sources[self.source_codes[i]],
+            "tags": [self.tags[t] for t in self.tag_ids[i]],
+            "category": self.categories[self.category_codes[i]],
+            "summary": self.summaries[i],
+        }
+
+    def responses(self, positions: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.response(int(i)) for i in positions]
+
+    def find(self, article_id: str) -> Optional[int]:
+        return self._positions.get(str(article_id))
+
+    def find_url(self, url: str) -> Optional[int]:
+        return self._url_positions.get(url)
+
+    def select(
+        self,
+        source: Optional[str] = None,
+        category: Optional[str] = None,
+        order: str = "latest",
+    ) -> np.ndarray:
+        """Positions of the matching rows, newest first unless ``order`` is ``oldest``."""
+        mask = np.ones(len(self), dtype=bool)
+        if source is not None:
+            code = self._source_codes.get(source)
+            mask &= self.source_codes == (-1 if code is None else code)
+        if category is not None:
+            code = self._category_codes.get(category)
+            mask &= self.category_codes == (-1 if code is None else code)
+        positions = np.flatnonzero(mask)
+        return positions if order != "oldest" else positions[::-1]
+
+    def cursor(self, i: int) -> str:
+        """Cursor pointing at row ``i``."""
+        return encode_cursor(float(self.published_ts[i]), self.ids[i])
+
+    def _rank(self, key: Tuple[float, str], inclusive: bool) -> int:
+        """Number of rows newer than ``key`` (or newer-or-equal when ``inclusive``)."""
+        ts, article_id = key
+        ts = -np.inf if math.isnan(ts) else ts
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = (self._sort_ts[mid], self.ids[mid])
+            if row > (ts, article_id) or (inclusive and row == (ts, article_id)):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def page(
+        self,
+        positions: np.ndarray,
+        limit: int,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        order: str = "latest",
+    ) -> Tuple[np.ndarray, Optional[str], Optional[str]]:
+        """One page of ``positions`` (ascending, as ``select`` returns for ``latest``).
+
+        ``after`` continues past the row a cursor points at and ``before`` goes
+        back towards the start, both in ``order``. Returns the page's positions
+        in listing order plus the ``next`` and ``prev`` cursors, ``None`` at
+        either end. Raises ``ValueError`` for a malformed cursor.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        n = len(positions)
+        cursor = after if after is not None else before
+        if cursor is None:
+            start, stop = (0, limit) if order != "oldest" else (n - limit, n)
+        else:
+            key = decode_cursor(cursor)
+            newer = int(np.searchsorted(positions, self._rank(key, inclusive=False)))
+            not_older = int(np.searchsorted(positions, self._rank(key, inclusive=True)))
+            # In latest order "after" means older rows; in oldest order, newer ones.
+            if (after is not None) == (order != "oldest"):
+                start, stop = not_older, not_older + limit
+            else:
+                start, stop = newer - limit, newer
+        start, stop = max(0, start), min(n, max(0, stop))
+        chunk = positions[start:stop]
+        has_more_after = stop < n if order != "oldest" else start > 0
+        has_more_before = start > 0 if order != "oldest" else stop < n
+        if len(chunk) == 0:
+            return chunk, None, None
+        if order == "oldest":
+            chunk = chunk[::-1]
+        next_cursor = self.cursor(int(chunk[-1])) if has_more_after else None
+        prev_cursor = self.cursor(int(chunk[0])) if has_more_before else None
+        return chunk, next_cursor, prev_cursor
+
+    def source_counts(self) -> List[Tuple[str, int]]:
+        counts = np.bincount(self.source_codes, minlength=len(self.sources))
+        return sorted(
+            ((source or "Unknown", int(c)) for source, c in zip(self.sources, counts) if c),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def category_counts(self) -> List[Tuple[str, int]]:
+        counts = np.bincount(self.category_codes, minlength=len(self.categories))
+        return sorted(
+            ((category or "Unknown", int(c)) for category, c in zip(self.categories, counts) if c),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    @property
+    def tag_index(self) -> TagIndex:
+        """The inverted tag index, built on first use."""
+        if self._tag_index is None:
+            self._tag_index = TagIndex(self.tags, self.tag_ids, counts=self._tag_counts)
+        return self._tag_index
+
+    def by_tags(
+        self, queries: Sequence[str], match: str = "any", order: str = "latest"
+    ) -> np.ndarray:
+        """Positions of rows with a tag containing any (or all) of ``queries``."""
+        positions = self.tag_index.lookup(queries, match=match)
+        return positions if order != "oldest" else positions[::-1]
+
+    def tag_counts(self) -> List[Tuple[str, int]]:
+        """Articles per normalized tag, most used first."""
+        return self.tag_index.sorted_counts()
+
+    @property
+    def token(self) -> str:
+        """Identifies this snapshot's content across workers: the shared counter it is
+        synced to, or a per-process version when the counter is unavailable."""
+        if self.corpus_version is not None:
+            return str(self.corpus_version)
+        return f"{BOOT_ID}.{self.version}"
+
+    def merged(
+        self, rows: Sequence[Dict[str, Any]], version: int, corpus_version: Optional[int] = None
+    ) -> "ArticleColumns":
+        """A new snapshot with ``rows`` added, replacing existing rows with the same id."""
+        incoming = {str(row.get("id") or row["url"]) for row in rows}
+        kept = []
+        replaced_tags = []
+        for i, article_id in enumerate(self.ids):
+            if article_id in incoming:
+                replaced_tags.append([self.tags[t] for t in self.tag_ids[i]])
+                continue
+            row = self.record(i)
+            # Reuse the stored (normalized) vector instead of round-tripping a list.
+            row["embedding"] = self.embedding(i)
+            row["updated_at"] = self.revisions[i]
+            kept.append(row)
+        tag_counts = self.tag_index.counts_after(
+            replaced_tags, (row.get("tags") or [] for row in rows)
+        )
+        return ArticleColumns(
+            kept + list(rows),
+            dim=self.dim,
+            version=version,
+            tag_counts=tag_counts,
+            corpus_version=corpus_version,
+            with_embeddings=self.with_embeddings,
+            loaded_version=self.loaded_version,
+        )
+
+    def index_inputs(self) -> Tuple[np.ndarray, List[str], List[Dict[str, Any]]]:
+        """(normalized matrix, urls, metadata) of the rows that have an embedding.
+
+        The matrix is the snapshot's own, not a copy; callers must not modify it.
+        """
+        positions = self.embedding_positions
+        return self.embeddings, [self.urls[i] for i in positions], self.records(positions)
+
+    def nbytes(self) -> int:
+        """Approximate memory: arrays plus the UTF-8 size of the text columns."""
+        arrays = (
+            self.embeddings.nbytes
+            + self.published_ts.nbytes
+            + self.source_codes.nbytes
+            + self.category_codes.nbytes
+            + sum(ids.nbytes for ids in self.tag_ids)
+        )
+        text = sum(
+            len(value or "")
+            for column in (self.ids, self.urls, self.titles, self.summaries, self.contents)
+            for value in column
+        )
+        return int(arrays + text)
+
+
+class ArticleStore:
+    """Keeps an ``ArticleColumns`` snapshot of the table fresh via watermark syncs."""
+
+    def __init__(
+        self,
+        fetch_page: Optional[FetchPage] = None,
+        poll_seconds: float = ARTICLE_STORE_POLL_SECONDS,
+        full_reload_seconds: float = ARTICLE_STORE_FULL_RELOAD_SECONDS,
+        page_size: int = ARTICLE_STORE_PAGE_SIZE,
+        dim: int = DEFAULT_DIM,
+        fetch_version: FetchVersion = shared_articles_version,
+        with_embeddings: bool = True,
+    ) -> None:
+        self.with_embeddings: bool = with_embeddings
+        self.fetch_page = fetch_page or partial(
+            supabase_fetch_page, with_embeddings=with_embeddings
+        )
+        self.fetch_version = fetch_version
+        self.poll_seconds: float = poll_seconds
+        self.full_reload_seconds: float = full_reload_seconds
+        self.page_size: int = page_size
+        self.dim: int = dim
+        self._columns: Optional[ArticleColumns] = None
+        self._watermark: Optional[str] = None
+        self._synced_at: float = 0.0
+        self._full_at: float = 0.0
+        self._changed = False
+        self._lock = threading.Lock()
+        STORE_STALENESS.set_function(self.staleness_seconds)
+
+    def _fetch_all(self, watermark: Optional[str]) -> List[Dict[str, Any]]:
+        rows: List[Dict[str, Any]] = []
+        offset = 0
+        while True:
+            page = self.fetch_page(watermark, offset, self.page_size)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            offset += self.page_size
+
+    def _read_version(self) -> Optional[int]:
+        try:
+            return self.fetch_version()
+        except Exception as e:
+            logger.warning(f"Could not read the articles corpus version: {e}")
+            return None
+
+    def _advance_watermark(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            value = row.get(WATERMARK_COLUMN)
+            if value is not None and (self._watermark is None or str(value) > self._watermark):
+                self._watermark = str(value)
+
+    def _publish(self, columns: ArticleColumns) -> None:
+        self._columns = columns
+        STORE_ROWS.set(len(self._columns))
+        STORE_BYTES.set(self._columns.nbytes())
+
+    def load(self) -> ArticleColumns:
+        """Reload the whole table."""
+        start = time.perf_counter()
+        # Read the counter first: the rows fetched after it include every write it counts.
+        corpus_version = self._read_version()
+        rows = validate_rows(self._fetch_all(None))
+        version = self._columns.version + 1 if self._columns is not None else 1
+        self._watermark = None
+        self._advance_watermark(rows)
+        self._publish(
+            ArticleColumns(
+                rows,
+                dim=self.dim,
+                version=version,
+                corpus_version=corpus_version,
+                with_embeddings=self.with_embeddings,
+            )
+        )
+        self._synced_at = self._full_at = time.monotonic()
+        STORE_SYNCS.labels(kind="full").inc()
+        STORE_SYNCED_ROWS.labels(kind="full").inc(len(rows))
+        logger.info(
+            f"Article store loaded {len(rows)} articles in {time.perf_counter() - start:.2f}s"
+        )
+        return self._columns
+
+    def sync(self) -> ArticleColumns:
+        """Fetch rows inserted after the watermark; falls back to a full load without one.
+
+        With the shared counter available, an unchanged counter skips the fetch
+        and changes a delta cannot account for (edits, deletes) force a full load.
+        """
+        if self._columns is None or self._watermark is None:
+            return self.load()
+        corpus_version = self._read_version()
+        previous = self._columns.corpus_version
+        if corpus_version is not None and corpus_version == previous:
+            self._synced_at = time.monotonic()
+            STORE_SYNCS.labels(kind="unchanged").inc()
+            return self._columns
+        if corpus_version is not None and previous is None:
+            return self.load()
+        fetched = self._fetch_all(self._watermark)
+        self._synced_at = time.monotonic()
+        STORE_SYNCS.labels(kind="delta").inc()
+        STORE_SYNCED_ROWS.labels(kind="delta").inc(len(fetched))
+        if corpus_version is not None and len(fetched) < corpus_version - previous:
+            logger.info("Articles were edited or deleted; reloading the article store")
+            return self.load()
+        rows = validate_rows(fetched)
+        if rows or corpus_version != previous:
+            self._advance_watermark(rows)
+            self._publish(
+                self._columns.merged(
+                    rows, version=self._columns.version + 1, corpus_version=corpus_version
+                )
+            )
+            logger.info(f"Article store synced {len(rows)} new articles")
+        return self._columns
+
+    def notify_changed(self) -> None:
+        """Ask for a delta sync on the next read, e.g. after a scrape saved articles."""
+        self._changed = True
+
+    def staleness_seconds(self) -> float:
+        return time.monotonic() - self._synced_at if self._synced_at else 0.0
+
+    def snapshot(self) -> ArticleColumns:
+        """The current columns, syncing first when a poll is due or a change was signalled."""
+        columns = self._columns
+        now = time.monotonic()
+        due = self._changed or now - self._synced_at >= self.poll_seconds
+        if columns is not None and not due:
+            return columns
+        # Only one thread syncs; the others keep serving the current snapshot.
+        if not self._lock.acquire(blocking=columns is None):
+            return columns
+        try:
+            if self._columns is None or now - self._full_at >= self.full_reload_seconds:
+                self._changed = False
+                return self.load()
+            if self._changed or now - self._synced_at >= self.poll_seconds:
+                self._changed = False
+                return self.sync()
+            return self._columns
+        except Exception as e:
+            if self._columns is None:
+                raise
+            logger.error(f"Article store sync failed, serving the previous snapshot: {e}")
+            return self._columns
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def synced(self) -> Iterator[ArticleColumns]:
+        """Columns synced just now, with the store lock held until the block exits.
+
+        Waits for a sync already in progress instead of returning the columns it
+        is replacing, and keeps other syncs out while the caller uses them.
+        """
+        with self._lock:
+            self._changed = False
+            yield self.sync()
+
+    def stats(self) -> Dict[str, Any]:
+        columns = self._columns
+        return {
+            "rows": len(columns) if columns is not None else 0,
+            "with_embedding": int(columns.has_embedding.sum()) if columns is not None else 0,
+            "bytes": columns.nbytes() if columns is not None else 0,
+            "version": columns.version if columns is not None else 0,
+            "corpus_version": columns.corpus_version if columns is not None else None,
+            "watermark": self._watermark,
+            "staleness_seconds": round(self.staleness_seconds(), 1),
+        }
+
+
+_store: Optional[ArticleStore] = None
+_store_lock = threading.Lock()
+
+
+def get_article_store() -> ArticleStore:
+    """The process-wide article store, without embeddings when a snapshot serves the index."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArticleStore(with_embeddings=not ARTICLE_SNAPSHOT_DIR)
+        return _store
@@ -0,0 +1,117 @@
+"""
+Content-addressed on-disk cache for arrays derived from a model.
+
+Category prototype matrices and similar precomputed vectors depend only on
+the model, the inference backend and their input, yet used to be re-encoded
+on every process start. ``ArtifactCache`` stores them as ``.npz`` files named
+by the sha256 of ``(kind, model version, input)``: changing
+``constants.CATEGORIES``, the model or ``EMBEDDING_BACKEND`` produces a new
+key, so stale artifacts are never read and never need explicit invalidation.
+
+Files are written atomically, so concurrent processes computing the same
+artifact at worst both compute it. Unreadable files count as misses.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+import zipfile
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from prometheus_client import Counter
+
+from engine.atomic_file import atomic_write
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_CACHE_DIR: str = os.getenv(
+    "ARTIFACT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nexus", "artifacts")
+)
+
+HITS = Counter(
+    "artifact_cache_hits_total", "Derived arrays loaded from the artifact cache", ["kind"]
+)
+MISSES = Counter("artifact_cache_misses_total", "Derived arrays computed and stored", ["kind"])
+
+Arrays = Dict[str, np.ndarray]
+
+
+def artifact_key(kind: str, model_version: str, payload: Any) -> str:
+    """sha256 of the artifact kind, model version and JSON-serializable input."""
+    blob = json.dumps(
+        {"kind": kind, "model": model_version, "input": payload},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """Directory of ``<kind>-<key>.npz`` files holding named arrays."""
+
+    def __init__(self, directory: str = ARTIFACT_CACHE_DIR) -> None:
+        self.directory: str = directory
+
+    def path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, f"{kind}-{key}.npz")
+
+    def load(self, kind: str, key: str) -> Optional[Arrays]:
+        path = self.path(kind, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {name: data[name] for name in data.files}
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile) as e:
+            logger.warning(f"Ignoring unreadable artifact {path}: {e}")
+            return None
+
+    def store(self, kind: str, key: str, arrays: Arrays) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        buffer = io.BytesIO()
+        np.savez(buffer, **{name: np.asarray(value) for name, value in arrays.items()})
+        path = self.path(kind, key)
+        atomic_write(path, buffer.getvalue())
+        return path
+
+    def get_or_compute(
+        self, kind: str, model_version: str, payload: Any, compute: Callable[[], Arrays]
+    ) -> Arrays:
+        """Load the artifact for this input and model, computing and storing it on a miss."""
+        key = artifact_key(kind, model_version, payload)
+        start = time.perf_counter()
+        arrays = self.load(kind, key)
+        if arrays is not None:
+            HITS.labels(kind=kind).inc()
+            logger.info(
+                f"Loaded {kind} artifact {key[:12]} in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+            return arrays
+        MISSES.labels(kind=kind).inc()
+        arrays = {name: np.asarray(value) for name, value in compute().items()}
+        try:
+            self.store(kind, key, arrays)
+        except OSError as e:
+            logger.warning(f"Could not cache {kind} artifact in {self.directory}: {e}")
+        logger.info(
+            f"Computed {kind} artifact {key[:12]} in {time.perf_counter() - start:.2f}s"
+        )
+        return arrays
+
+    def clear(self) -> int:
+        """Remove every cached artifact; returns how many files were deleted."""
+        if not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                os.unlink(os.path.join(self.directory, name))
+                removed += 1
+        return removed
+
+
+artifact_cache = ArtifactCache()
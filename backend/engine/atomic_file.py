@@ -0,0 +1,31 @@
+"""
+Crash-safe file replacement for the index, snapshot and cache files.
+
+A file is written to a temp file in the same directory, fsynced, and renamed
+over its final path, so a reader (or a process restarted after a crash) sees
+either the old file or the complete new one, never a partial write.
+"""
+
+import os
+import tempfile
+from typing import IO, Callable
+
+
+def replace_atomically(path: str, write: Callable[[IO[bytes]], object]) -> None:
+    """Call ``write(file)`` on a temp file next to ``path``, then move it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """Replace ``path`` with ``data`` atomically."""
+    replace_atomically(path, lambda f: f.write(data))
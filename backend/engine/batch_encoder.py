@@ -0,0 +1,159 @@
+"""
+Micro-batching front end for sentence encoders.
+
+Concurrent requests each encoding one short query waste most of a forward
+pass on per-call overhead. ``BatchingEncoder`` queues texts for up to
+``ENCODER_MAX_WAIT_MS`` (or until ``ENCODER_MAX_BATCH`` are waiting), sorts the
+batch by token length, splits it into buckets of similar length so padding
+stays small, runs one ``encode`` per bucket and resolves each caller's future
+with its own vector. A request that arrives while the encoder is idle and
+alone is encoded straight away, so batching adds no latency at low load.
+
+``engine.embedding_pool`` puts one batcher in front of each shared model.
+``ENCODER_BATCHING=false`` limits batches to a single text.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prometheus_client import Histogram
+
+logger = logging.getLogger(__name__)
+
+ENCODER_BATCHING: bool = os.getenv("ENCODER_BATCHING", "true").lower() == "true"
+ENCODER_MAX_BATCH: int = int(os.getenv("ENCODER_MAX_BATCH", "32"))
+ENCODER_MAX_WAIT_MS: float = float(os.getenv("ENCODER_MAX_WAIT_MS", "5"))
+# A bucket is closed once its longest text would exceed this multiple of its shortest.
+MAX_LENGTH_RATIO = 2.0
+
+BATCH_SIZE = Histogram(
+    "encoder_batch_size",
+    "Texts per batched encode call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "encoder_queue_wait_seconds", "Time a text waited in the batching queue"
+)
+
+Pending = Tuple[str, int, Future, float]
+
+
+def token_length_fn(model: Any) -> Callable[[str], int]:
+    """Token counter from the model's tokenizer, or a word count if it has none."""
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is None:
+        return lambda text: len(text.split())
+    return lambda text: len(tokenizer.tokenize(text))
+
+
+def length_buckets(
+    lengths: Sequence[int], max_ratio: float = MAX_LENGTH_RATIO
+) -> List[List[int]]:
+    """Group positions by similar length: sorted, with max/min length <= ``max_ratio``."""
+    buckets: List[List[int]] = []
+    shortest = 0
+    for position in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        length = max(1, lengths[position])
+        if not buckets or length > shortest * max_ratio:
+            buckets.append([])
+            shortest = length
+        buckets[-1].append(position)
+    return buckets
+
+
+class BatchingEncoder:
+    """Coalesces concurrent single-text encodes into batched calls on worker threads.
+
+    ``workers`` threads form batches independently, so up to that many batches
+    can be in flight (e.g. one per embedding worker process).
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[List[str]], Any],
+        max_batch_size: int = ENCODER_MAX_BATCH,
+        max_wait_ms: float = ENCODER_MAX_WAIT_MS,
+        length_fn: Optional[Callable[[str], int]] = None,
+        workers: int = 1,
+    ) -> None:
+        self.encode_batch = encode_batch
+        self.workers: int = max(1, workers)
+        self.max_batch_size: int = max_batch_size
+        self.max_wait: float = max_wait_ms / 1000.0
+        self.length_fn: Callable[[str], int] = length_fn or (lambda text: len(text.split()))
+        self._queue: "queue.Queue[Pending]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        # Started lazily, and again in each forked worker (threads don't survive fork).
+        if self._pid == os.getpid() and all(t.is_alive() for t in self._threads):
+            if len(self._threads) == self.workers:
+                return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._threads = []
+                self._pid = os.getpid()
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name="batching-encoder", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, text: str) -> Future:
+        """Queue a text and return a future resolving to its vector."""
+        future: Future = Future()
+        self._ensure_worker()
+        self._queue.put((text, self.length_fn(text), future, time.perf_counter()))
+        return future
+
+    def encode(self, text: str, timeout: Optional[float] = None) -> np.ndarray:
+        """Encode one text through the batcher, blocking until its vector is ready."""
+        return self.submit(text).result(timeout=timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            # A lone request is encoded immediately; only wait for stragglers
+            # when other requests are already arriving concurrently.
+            while 1 < len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch: List[Pending]) -> None:
+        started = time.perf_counter()
+        BATCH_SIZE.observe(len(batch))
+        for _, _, _, queued_at in batch:
+            QUEUE_WAIT_SECONDS.observe(started - queued_at)
+        for bucket in length_buckets([length for _, length, _, _ in batch]):
+            items = [batch[i] for i in bucket]
+            try:
+                vectors = np.asarray(self.encode_batch([text for text, _, _, _ in items]))
+            except Exception as e:
+                logger.error(f"Batched encode of {len(items)} texts failed: {e}")
+                for _, _, future, _ in items:
+                    future.set_exception(e)
+                continue
+            for (_, _, future, _), vector in zip(items, vectors):
+                future.set_result(vector)
+
@@ -0,0 +1,304 @@
+"""
+Compressed scoring tier for article embeddings with full-precision rescoring.
+
+``CompressedIndex`` keeps a small copy of the corpus for the first pass: the
+normalized 768-dim vectors are projected onto the top principal directions of
+the corpus (PCA, ``reduced_dim`` components) and scalar-quantized to int8 with
+one scale per component. A query scores that compact matrix, keeps
+``rerank_factor * top_k`` candidates and rescores only those against the
+full float32 vectors, so the returned scores are exact.
+
+The projection is persisted next to the index and reused across refreshes
+until the corpus drifts: when the projection keeps noticeably less of the
+corpus energy than it did at fit time, it is refit.
+
+The compressed tier is held *in addition to* the float32 matrix used for
+rescoring, so on its own it adds memory rather than saving it. The saving
+comes from building the index over a memory-mapped matrix (a published
+snapshot, see ``engine.snapshot``): rescoring then only pages in the candidate
+rows, and the file pages are shared between workers and can be evicted.
+``memory_report`` counts the float32 matrix as resident unless it is mapped.
+"""
+
+import json
+import logging
+import mmap
+import os
+import zipfile
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.atomic_file import atomic_write, replace_atomically
+from engine.vector_index import DEFAULT_DIM, VectorIndex, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REDUCED_DIM = 256
+DEFAULT_RERANK_FACTOR = 4
+DEFAULT_DRIFT_TOLERANCE = 0.05
+FIT_SAMPLE_SIZE = 20_000
+PROJECT_CHUNK = 65_536
+# numpy has no int8 GEMV, so codes are widened to float32 in cache-sized blocks.
+DEQUANT_CHUNK = 4_096
+
+
+def _base_path(path: str) -> str:
+    return path[:-4] if path.endswith(".npz") else path
+
+
+def _sample(matrix: np.ndarray, seed: int) -> np.ndarray:
+    n = matrix.shape[0]
+    if n <= FIT_SAMPLE_SIZE:
+        return matrix
+    rows = np.sort(np.random.default_rng(seed).choice(n, size=FIT_SAMPLE_SIZE, replace=False))
+    return matrix[rows]
+
+
+def is_mapped(array: np.ndarray) -> bool:
+    """Whether ``array`` is a view of a memory-mapped file rather than heap memory."""
+    base = array
+    while base is not None:
+        if isinstance(base, mmap.mmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+def fit_projection(matrix: np.ndarray, reduced_dim: int, seed: int = 0) -> np.ndarray:
+    """Top ``reduced_dim`` principal directions of (a sample of) the matrix.
+
+    The data is not mean-centred: inner products are what we rank by, and the
+    uncentred directions preserve them best for a fixed number of components.
+    """
+    sample = _sample(matrix, seed)
+    covariance = np.asarray(sample, dtype=np.float64).T @ np.asarray(sample, dtype=np.float64)
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    order = np.argsort(eigenvalues)[::-1][:reduced_dim]
+    return np.ascontiguousarray(eigenvectors[:, order].T, dtype=np.float32)
+
+
+def retained_energy(matrix: np.ndarray, components: np.ndarray, seed: int = 0) -> float:
+    """Fraction of the squared norm of (a sample of) the rows kept by the projection."""
+    if matrix.shape[0] == 0:
+        return 1.0
+    sample = _sample(matrix, seed)
+    projected = sample @ components.T
+    return float(np.sum(projected * projected) / max(np.sum(sample * sample), 1e-12))
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-column int8 quantization; returns ``(codes, scales)``."""
+    scales = np.abs(matrix).max(axis=0) / 127.0 if matrix.shape[0] else np.ones(matrix.shape[1])
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(matrix / scales), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+class CompressedIndex(VectorIndex):
+    """Two-tier index: compressed candidate scan, exact float32 rescoring.
+
+    ``reduced_dim=0`` disables PCA (int8 only) and ``quantize=False`` keeps the
+    projected vectors as float32 (PCA only).
+    """
+
+    def __init__(
+        self,
+        dim: int = DEFAULT_DIM,
+        reduced_dim: int = DEFAULT_REDUCED_DIM,
+        quantize: bool = True,
+        rerank_factor: int = DEFAULT_RERANK_FACTOR,
+        drift_tolerance: float = DEFAULT_DRIFT_TOLERANCE,
+        projection_path: str = "",
+    ) -> None:
+        super().__init__(dim=dim)
+        self.reduced_dim: int = min(reduced_dim, dim) if reduced_dim else 0
+        self.quantize: bool = quantize
+        self.rerank_factor: int = rerank_factor
+        self.drift_tolerance: float = drift_tolerance
+        self.projection_path: str = projection_path
+        self.components: Optional[np.ndarray] = None
+        self.fit_energy: float = 1.0
+        # (codes, scales) of the projected corpus, rebuilt on every build.
+        self._compressed: Tuple[np.ndarray, np.ndarray] = (
+            np.empty((0, self.reduced_dim or dim), dtype=np.int8),
+            np.ones(self.reduced_dim or dim, dtype=np.float32),
+        )
+
+    def reuse_projection(self, other: "CompressedIndex") -> None:
+        """Start from another index's projection instead of fitting a new one."""
+        if other.components is not None and other.reduced_dim == self.reduced_dim:
+            self.components = other.components
+            self.fit_energy = other.fit_energy
+
+    def build(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        embedding_key: str = "embedding",
+        id_key: str = "url",
+    ) -> int:
+        count = super().build(rows, embedding_key=embedding_key, id_key=id_key)
+        self._compress()
+        return count
+
+    def build_from_matrix(
+        self,
+        matrix: np.ndarray,
+        ids: Sequence[str],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+        normalized: bool = False,
+    ) -> int:
+        count = super().build_from_matrix(matrix, ids, metadata=metadata, normalized=normalized)
+        self._compress()
+        return count
+
+    def _needs_fit(self, matrix: np.ndarray) -> bool:
+        if not self.reduced_dim:
+            return False
+        if self.components is None:
+            return True
+        energy = retained_energy(matrix, self.components)
+        if self.fit_energy - energy > self.drift_tolerance:
+            logger.info(
+                f"Projection drifted (energy {energy:.3f} vs {self.fit_energy:.3f} at fit); "
+                "refitting"
+            )
+            return True
+        return False
+
+    def _compress(self) -> None:
+        matrix = self.matrix
+        if matrix.shape[0] == 0:
+            return
+        if self._needs_fit(matrix):
+            self.components = fit_projection(matrix, self.reduced_dim)
+            self.fit_energy = retained_energy(matrix, self.components)
+            logger.info(
+                f"Fitted {self.reduced_dim}-dim projection keeping {self.fit_energy:.1%} of energy"
+            )
+            if self.projection_path:
+                self.save_projection(self.projection_path)
+        reduced = self._project(matrix)
+        if self.quantize:
+            self._compressed = quantize_int8(reduced)
+        else:
+            self._compressed = (reduced, np.ones(reduced.shape[1], dtype=np.float32))
+
+    def _project(self, matrix: np.ndarray) -> np.ndarray:
+        if self.components is None:
+            return np.asarray(matrix, dtype=np.float32)
+        out = np.empty((matrix.shape[0], self.components.shape[0]), dtype=np.float32)
+        for start in range(0, matrix.shape[0], PROJECT_CHUNK):
+            block = matrix[start:start + PROJECT_CHUNK]
+            out[start:start + block.shape[0]] = block @ self.components.T
+        return out
+
+    def compressed_scores(self, query: np.ndarray) -> np.ndarray:
+        """Approximate scores of a prepared query against the compressed tier."""
+        codes, scales = self._compressed
+        weighted = (self._project(query[None, :])[0] * scales).astype(np.float32)
+        if codes.dtype == np.float32:
+            return codes @ weighted
+        scores = np.empty(codes.shape[0], dtype=np.float32)
+        for start in range(0, codes.shape[0], DEQUANT_CHUNK):
+            block = codes[start:start + DEQUANT_CHUNK]
+            scores[start:start + block.shape[0]] = block.astype(np.float32) @ weighted
+        return scores
+
+    def search(self, query_embedding: Any, top_k: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Pick candidates from the compressed tier and rescore them exactly."""
+        matrix, _, metadata = self._state
+        if matrix.shape[0] == 0:
+            return []
+        query = self.prepare_query(query_embedding)
+        if self._compressed[0].shape[0] != matrix.shape[0]:
+            scores = matrix @ query
+            return [(float(scores[i]), metadata[i]) for i in top_k_indices(scores, top_k)]
+
+        candidates = top_k_indices(self.compressed_scores(query), top_k * self.rerank_factor)
+        exact = matrix[candidates] @ query
+        return [(float(exact[j]), metadata[candidates[j]]) for j in top_k_indices(exact, top_k)]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held by each tier and what the index keeps resident in total.
+
+        ``resident_bytes`` is the compressed tier plus the float32 rescoring
+        matrix, unless that matrix is memory-mapped (``full_mapped``).
+        ``resident_ratio`` compares it with an exact index over the same rows.
+        """
+        codes, scales = self._compressed
+        matrix = self.matrix
+        full = int(matrix.nbytes)
+        mapped = is_mapped(matrix)
+        compressed = int(codes.nbytes + scales.nbytes)
+        if self.components is not None:
+            compressed += int(self.components.nbytes)
+        resident = compressed + (0 if mapped else full)
+        return {
+            "vectors": len(self),
+            "full_bytes": full,
+            "full_mapped": mapped,
+            "compressed_bytes": compressed,
+            "compression_ratio": full / compressed if compressed else 0.0,
+            "resident_bytes": resident,
+            "resident_ratio": resident / full if full else 0.0,
+            "reduced_dim": self.reduced_dim or self.dim,
+            "quantized": self.quantize,
+            "retained_energy": self.fit_energy if self.components is not None else 1.0,
+        }
+
+    def recall_report(self, queries: np.ndarray, top_k: int = 10) -> Dict[str, float]:
+        """Recall@k of the two-tier search and of the compressed tier alone vs exact search."""
+        matrix = self.matrix
+        reranked_hits = raw_hits = 0
+        for raw_query in queries:
+            query = self.prepare_query(raw_query)
+            truth = set(top_k_indices(matrix @ query, top_k).tolist())
+            approx = self.compressed_scores(query)
+            raw_hits += len(truth.intersection(top_k_indices(approx, top_k).tolist()))
+            candidates = top_k_indices(approx, top_k * self.rerank_factor)
+            best = candidates[top_k_indices(matrix[candidates] @ query, top_k)]
+            reranked_hits += len(truth.intersection(best.tolist()))
+        total = max(1, len(queries) * min(top_k, len(self)))
+        return {"recall_compressed": raw_hits / total, "recall_rescored": reranked_hits / total}
+
+    def save_projection(self, path: str) -> None:
+        """Persist the fitted projection so later refreshes and restarts reuse it.
+
+        Both files are replaced atomically, the sidecar first; ``load_projection``
+        rejects components whose shape disagrees with it.
+        """
+        if self.components is None:
+            return
+        base = _base_path(path)
+        os.makedirs(os.path.dirname(base) or ".", exist_ok=True)
+        meta = {"dim": self.dim, "reduced_dim": self.reduced_dim, "fit_energy": self.fit_energy}
+        atomic_write(f"{base}.meta.json", json.dumps(meta).encode())
+        components = self.components
+        replace_atomically(f"{base}.npz", lambda f: np.savez(f, components=components))
+        logger.info(f"Saved {self.reduced_dim}-dim projection to {base}.npz")
+
+    def load_projection(self, path: str) -> bool:
+        """Load a persisted projection; returns False if it does not fit this index."""
+        base = _base_path(path)
+        if not os.path.exists(f"{base}.npz"):
+            return False
+        try:
+            with open(f"{base}.meta.json") as f:
+                meta = json.load(f)
+            with np.load(f"{base}.npz", allow_pickle=False) as data:
+                components = data["components"]
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile) as e:
+            logger.warning(f"Could not load projection from {base}: {e}")
+            return False
+        if (
+            meta.get("dim") != self.dim
+            or meta.get("reduced_dim") != self.reduced_dim
+            or components.ndim != 2
+            or components.shape[1] != self.dim
+        ):
+            logger.warning(f"Ignoring projection at {base}: shape does not match the index")
+            return False
+        self.components = components.astype(np.float32)
+        self.fit_energy = float(meta.get("fit_energy", 1.0))
+        return True
@@ -0,0 +1,119 @@
+"""
+Per-table corpus versions and the ETags derived from them.
+
+Migration ``0004`` keeps a counter per table in ``corpus_versions``. Since
+``0005``, statement-level triggers add the number of rows each write to
+``articles`` or ``likes`` touched. Those
+counters are shared by all workers, so two workers that have seen the same
+writes produce the same ETag.
+
+``CorpusVersions`` caches the counters for ``CORPUS_VERSION_POLL_SECONDS``.
+Conditional GETs compare against the cached values and answer 304 without a
+query. A process that writes (a scrape, saving likes) calls ``bump`` so its
+next read refreshes straight away.
+
+Until the migration is applied the counters can't be read. Versions then
+come from per-process counters, and ETags carry ``BOOT_ID`` so that workers
+never share a tag for different content.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CORPUS_VERSION_POLL_SECONDS: float = float(os.getenv("CORPUS_VERSION_POLL_SECONDS", "5"))
+TABLES = ("articles", "likes")
+
+# Distinguishes this process's local counters from every other process's.
+BOOT_ID: str = uuid.uuid4().hex[:12]
+
+FetchVersions = Callable[[], Dict[str, int]]
+
+
+def supabase_fetch_versions() -> Dict[str, int]:
+    """The shared counters from ``corpus_versions``."""
+    from db.supabase_client import supabase
+
+    result = supabase.table("corpus_versions").select("name, version").execute()
+    return {row["name"]: int(row["version"]) for row in result.data or []}
+
+
+def etag(*parts: Any) -> str:
+    """A strong ETag for a representation determined by ``parts``."""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+class CorpusVersions:
+    """Cached view of the shared counters, with per-process fallbacks."""
+
+    def __init__(
+        self,
+        fetch: FetchVersions = supabase_fetch_versions,
+        poll_seconds: float = CORPUS_VERSION_POLL_SECONDS,
+    ) -> None:
+        self.fetch = fetch
+        self.poll_seconds: float = poll_seconds
+        self._shared: Optional[Dict[str, int]] = None
+        self._local: Dict[str, int] = {table: 0 for table in TABLES}
+        self._fetched_at: float = 0.0
+        self._due = True
+        self._warned = False
+        self._lock = threading.Lock()
+
+    def refresh(self) -> Optional[Dict[str, int]]:
+        """Read the shared counters now; ``None`` when they are unavailable."""
+        try:
+            versions = self.fetch()
+        except Exception as e:
+            if not self._warned:
+                logger.warning(f"Corpus versions unavailable, using per-process counters: {e}")
+                self._warned = True
+            versions = None
+        self._shared = versions or None
+        self._fetched_at = time.monotonic()
+        self._due = False
+        return self._shared
+
+    def _current(self) -> Optional[Dict[str, int]]:
+        due = self._due or time.monotonic() - self._fetched_at >= self.poll_seconds
+        # Only one thread refreshes; the others use the cached counters.
+        if due and self._lock.acquire(blocking=False):
+            try:
+                return self.refresh()
+            finally:
+                self._lock.release()
+        return self._shared
+
+    def shared(self, table: str) -> Optional[int]:
+        """The shared counter for ``table``, or ``None`` without the migration."""
+        shared = self._current()
+        return shared.get(table) if shared is not None else None
+
+    def token(self, table: str) -> str:
+        """A version token for ``table``: the shared counter, else a per-process one."""
+        version = self.shared(table)
+        if version is not None:
+            return str(version)
+        return f"{BOOT_ID}.{self._local[table]}"
+
+    def bump(self, table: str) -> None:
+        """Record a write to ``table`` made by this process."""
+        self._local[table] = self._local.get(table, 0) + 1
+        self._due = True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "shared": dict(self._shared) if self._shared is not None else None,
+            "local": dict(self._local),
+            "boot_id": BOOT_ID,
+        }
+
+
+corpus_versions = CorpusVersions()
@@ -0,0 +1,266 @@
+"""
+Bounded LRU + TTL cache for query embeddings.
+
+Search and recommendation traffic is dominated by a few repeated queries, so
+the encoder output is cached keyed on the normalized query text and the model
+version. Entries expire after ``EMBEDDING_CACHE_TTL_SECONDS`` and the least
+recently used entry is evicted beyond ``EMBEDDING_CACHE_SIZE``.
+
+When ``EMBEDDING_CACHE_PATH`` is set, entries are also written to a small
+SQLite file that is consulted on in-memory misses, so a restarted worker does
+not start cold. Disk I/O never holds the in-memory lock: writes are queued to
+a background writer thread, which also deletes expired rows, and async callers
+read the disk tier on a worker thread (``get(..., disk=False)`` followed by
+``get_from_disk``).
+
+Models opt in by carrying a ``cache_version`` attribute (model name plus
+inference backend); encoders without one are never cached.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "4096"))
+EMBEDDING_CACHE_TTL_SECONDS: float = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "86400"))
+EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "")
+# Queued disk writes beyond this are dropped; the memory tier still has them.
+DISK_QUEUE_SIZE = 1024
+DISK_BATCH_SIZE = 256
+PRUNE_INTERVAL_SECONDS = 3600.0
+
+CACHE_HITS = Counter(
+    "query_embedding_cache_hits_total", "Query embeddings served from cache", ["tier"]
+)
+CACHE_MISSES = Counter("query_embedding_cache_misses_total", "Query embeddings that were encoded")
+CACHE_EVICTIONS = Counter(
+    "query_embedding_cache_evictions_total", "Entries dropped from the cache", ["reason"]
+)
+CACHE_ENTRIES = Gauge("query_embedding_cache_entries", "Entries held in the in-memory cache")
+
+CacheKey = Tuple[str, str]
+DiskRow = Tuple[str, str, bytes, float]
+
+
+def normalize_query(text: str) -> str:
+    """Canonical form of a query for cache keys.
+
+    Unicode is NFKC-normalized, whitespace collapsed and case folded (the BGE
+    tokenizer is uncased, so case does not change the embedding).
+    """
+    return " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+
+
+def model_version(model: Any) -> Optional[str]:
+    """Cache version of an encoder, or None if it has not opted in to caching."""
+    return getattr(model, "cache_version", None)
+
+
+class EmbeddingCache:
+    """Thread-safe LRU + TTL cache of ``(model_version, normalized text) -> vector``."""
+
+    def __init__(
+        self,
+        max_entries: int = EMBEDDING_CACHE_SIZE,
+        ttl_seconds: float = EMBEDDING_CACHE_TTL_SECONDS,
+        persist_path: str = EMBEDDING_CACHE_PATH,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.ttl_seconds: float = ttl_seconds
+        self.persist_path: str = persist_path
+        self._entries: "OrderedDict[CacheKey, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Opened lazily per process: SQLite connections must not cross a fork.
+        # ``_db_lock`` serializes the connection between readers and the writer.
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_pid: Optional[int] = None
+        self._db_lock = threading.Lock()
+        self._writes: "queue.Queue[DiskRow]" = queue.Queue(maxsize=DISK_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_pid: Optional[int] = None
+        self._pruned_at: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """The process's SQLite connection; call with ``_db_lock`` held."""
+        if not self.persist_path:
+            return None
+        if self._db_pid == os.getpid():
+            return self._db
+        self._db_pid = os.getpid()
+        try:
+            os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.persist_path, timeout=1.0, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, query TEXT NOT NULL, vector BLOB NOT NULL, "
+                "created_at REAL NOT NULL, PRIMARY KEY (model, query))"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk tier disabled: {e}")
+            self._db = None
+        return self._db
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def get(self, model: str, text: str, disk: bool = True) -> Optional[np.ndarray]:
+        """Cached vector for ``text`` under ``model``, or None on a miss.
+
+        With ``disk=False`` only memory is checked, and with a disk tier a miss
+        is left for the caller's ``get_from_disk`` to count.
+        """
+        key = (model, normalize_query(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                vector, created_at = entry
+                if not self._expired(created_at):
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.labels(tier="memory").inc()
+                    return vector
+                del self._entries[key]
+                CACHE_EVICTIONS.labels(reason="expired").inc()
+        if disk:
+            return self.get_from_disk(model, text)
+        if not self.persist_path:
+            CACHE_MISSES.inc()
+        return None
+
+    def get_from_disk(self, model: str, text: str) -> Optional[np.ndarray]:
+        """Read ``text`` from the disk tier into memory; blocking, so not on the event loop."""
+        key = (model, normalize_query(text))
+        disk_entry = self._read_disk(key)
+        if disk_entry is None:
+            CACHE_MISSES.inc()
+            return None
+        with self._lock:
+            self._store(key, *disk_entry)
+        CACHE_HITS.labels(tier="disk").inc()
+        return disk_entry[0]
+
+    def put(self, model: str, text: str, vector: Any) -> np.ndarray:
+        """Store a vector as a read-only float32 array and return that array.
+
+        The disk write is queued for the background writer.
+        """
+        key = (model, normalize_query(text))
+        vector = np.array(vector, dtype=np.float32).reshape(-1)
+        vector.flags.writeable = False
+        created_at = time.time()
+        with self._lock:
+            self._store(key, vector, created_at)
+        if self.persist_path:
+            self._queue_write((*key, vector.tobytes(), created_at))
+        return vector
+
+    def get_or_compute(
+        self, model: str, text: str, compute: Callable[[str], Any]
+    ) -> np.ndarray:
+        """Return the cached vector, or compute, cache and return it."""
+        vector = self.get(model, text)
+        if vector is None:
+            vector = self.put(model, text, compute(text))
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            CACHE_ENTRIES.set(0)
+
+    def _store(self, key: CacheKey, vector: np.ndarray, created_at: float) -> None:
+        self._entries[key] = (vector, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            CACHE_EVICTIONS.labels(reason="capacity").inc()
+        CACHE_ENTRIES.set(len(self._entries))
+
+    def _read_disk(self, key: CacheKey) -> Optional[Tuple[np.ndarray, float]]:
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return None
+            try:
+                row = db.execute(
+                    "SELECT vector, created_at FROM embeddings WHERE model = ? AND query = ?", key
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache disk read failed: {e}")
+                return None
+        if row is None or self._expired(row[1]):
+            return None
+        vector = np.frombuffer(row[0], dtype=np.float32)
+        return vector, row[1]
+
+    def _queue_write(self, row: DiskRow) -> None:
+        if self._writer_pid != os.getpid():
+            # First write in this process (or since a fork): start its writer.
+            with self._lock:
+                if self._writer_pid != os.getpid():
+                    self._writes = queue.Queue(maxsize=DISK_QUEUE_SIZE)
+                    self._writer = threading.Thread(
+                        target=self._write_loop, name="embedding-cache-writer", daemon=True
+                    )
+                    self._writer.start()
+                    self._writer_pid = os.getpid()
+        try:
+            self._writes.put_nowait(row)
+        except queue.Full:
+            logger.debug("Embedding cache disk queue full, dropping a write")
+
+    def _write_loop(self) -> None:
+        writes = self._writes
+        while True:
+            batch: List[DiskRow] = [writes.get()]
+            while len(batch) < DISK_BATCH_SIZE:
+                try:
+                    batch.append(writes.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_disk(batch)
+            finally:
+                for _ in batch:
+                    writes.task_done()
+
+    def _write_disk(self, rows: List[DiskRow]) -> None:
+        with self._db_lock:
+            db = self._connection()
+            if db is None:
+                return
+            try:
+                db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)", rows)
+                if self.ttl_seconds > 0 and time.time() - self._pruned_at >= PRUNE_INTERVAL_SECONDS:
+                    deleted = db.execute(
+                        "DELETE FROM embeddings WHERE created_at < ?",
+                        (time.time() - self.ttl_seconds,),
+                    ).rowcount
+                    self._pruned_at = time.time()
+                    if deleted:
+                        CACHE_EVICTIONS.labels(reason="pruned").inc(deleted)
+                db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache disk write failed: {e}")
+
+    def flush(self) -> None:
+        """Wait until queued disk writes are written."""
+        if self._writer_pid == os.getpid():
+            self._writes.join()
+
+
+query_embedding_cache = EmbeddingCache()
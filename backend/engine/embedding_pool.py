@@ -0,0 +1,233 @@
+"""
+Embedding inference off the API event loop.
+
+``EmbeddingWorkerPool`` runs the encoder either in ``EMBEDDING_WORKERS``
+dedicated worker processes (each loading the model through
+``engine.model_registry``) or, with ``EMBEDDING_WORKERS=0``, on a background
+thread of the API process using the shared in-process model. Either way async
+handlers only await a future, so a slow encode no longer stalls every request
+on the worker.
+
+Requests are micro-batched (``engine.batch_encoder``) with one dispatcher per
+worker. At most ``EMBEDDING_MAX_PENDING`` texts may be queued or in flight;
+beyond that ``EncoderSaturated`` is raised so routes can shed load with a 503
+instead of queueing without bound.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from engine.batch_encoder import (
+    ENCODER_BATCHING,
+    ENCODER_MAX_BATCH,
+    BatchingEncoder,
+    token_length_fn,
+)
+from engine.inference import EMBEDDING_BACKEND
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_WORKERS: int = int(os.getenv("EMBEDDING_WORKERS", "0"))
+EMBEDDING_MAX_PENDING: int = int(os.getenv("EMBEDDING_MAX_PENDING", "256"))
+EMBEDDING_TIMEOUT_SECONDS: float = float(os.getenv("EMBEDDING_TIMEOUT_SECONDS", "30"))
+
+PENDING = Gauge("embedding_pool_pending", "Texts queued or being encoded by the embedding pool")
+REJECTED = Counter("embedding_pool_rejected_total", "Encodes rejected because the pool was full")
+FAILURES = Counter("embedding_pool_failures_total", "Batched encodes that raised")
+
+_worker_model: Any = None
+
+
+class EncoderSaturated(Exception):
+    """Raised when the embedding pool already holds ``max_pending`` requests."""
+
+
+def _init_worker(model_name: str, backend: str) -> None:
+    global _worker_model
+    from engine.model_registry import get_model
+
+    _worker_model = get_model(model_name, backend)
+
+
+def _encode_in_worker(texts: List[str]) -> np.ndarray:
+    return np.asarray(_worker_model.encode(texts, batch_size=len(texts)), dtype=np.float32)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class EmbeddingWorkerPool:
+    """Bounded, batched encoder running in worker processes or background threads."""
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = EMBEDDING_BACKEND,
+        processes: int = EMBEDDING_WORKERS,
+        max_pending: int = EMBEDDING_MAX_PENDING,
+        local_model_factory: Optional[Callable[[], Any]] = None,
+        timeout: float = EMBEDDING_TIMEOUT_SECONDS,
+    ) -> None:
+        if processes <= 0 and local_model_factory is None:
+            raise ValueError("A local model factory is required when EMBEDDING_WORKERS is 0")
+        self.model_name: str = model_name
+        self.backend: str = backend
+        self.processes: int = max(0, processes)
+        self.max_pending: int = max_pending
+        self.timeout: float = timeout
+        self._local_model_factory = local_model_factory
+        self._length_fn: Optional[Callable[[str], int]] = None
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self.completed: int = 0
+        self.failures: int = 0
+        self.last_batch_ms: Optional[float] = None
+        self.batcher = BatchingEncoder(
+            self._encode_batch,
+            max_batch_size=ENCODER_MAX_BATCH if ENCODER_BATCHING else 1,
+            length_fn=self._token_length,
+            workers=max(1, self.processes),
+        )
+
+    def _token_length(self, text: str) -> int:
+        # Only the in-process model's tokenizer is reachable; worker processes
+        # bucket by word count.
+        if self._length_fn is None:
+            return len(text.split())
+        return self._length_fn(text)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_name, self.backend),
+                )
+                logger.info(f"Started {self.processes} embedding worker processes")
+            return self._executor
+
+    def _restart_executor(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+        logger.warning("Embedding worker pool broke; it will restart on the next request")
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        # Runs on a batcher thread, never on the event loop.
+        start = time.perf_counter()
+        try:
+            if self.processes:
+                try:
+                    vectors = self._get_executor().submit(_encode_in_worker, texts).result(
+                        timeout=self.timeout
+                    )
+                except BrokenProcessPool:
+                    self._restart_executor()
+                    raise
+            else:
+                model = self._local_model_factory()
+                if self._length_fn is None:
+                    self._length_fn = token_length_fn(model)
+                vectors = model.encode(texts, batch_size=len(texts), device="cpu")
+        except Exception:
+            self.failures += 1
+            FAILURES.inc()
+            raise
+        self.last_batch_ms = (time.perf_counter() - start) * 1000
+        return vectors
+
+    def _reserve(self) -> None:
+        with self._pending_lock:
+            if self._pending >= self.max_pending:
+                REJECTED.inc()
+                raise EncoderSaturated(
+                    f"Embedding pool saturated ({self._pending}/{self.max_pending} pending)"
+                )
+            self._pending += 1
+            PENDING.set(self._pending)
+
+    def _release(self, succeeded: bool) -> None:
+        with self._pending_lock:
+            self._pending -= 1
+            if succeeded:
+                self.completed += 1
+            PENDING.set(self._pending)
+
+    async def encode(self, text: str) -> np.ndarray:
+        """Encode one text without blocking the event loop.
+
+        Raises ``EncoderSaturated`` immediately when the pool is full.
+        """
+        self._reserve()
+        succeeded = False
+        try:
+            future = asyncio.wrap_future(self.batcher.submit(text))
+            vector = await asyncio.wait_for(future, timeout=self.timeout)
+            succeeded = True
+            return vector
+        finally:
+            self._release(succeeded)
+
+    def encode_sync(self, text: str) -> np.ndarray:
+        """Blocking variant of ``encode`` for threads and sync callers."""
+        self._reserve()
+        succeeded = False
+        try:
+            vector = self.batcher.submit(text).result(timeout=self.timeout)
+            succeeded = True
+            return vector
+        finally:
+            self._release(succeeded)
+
+    def health(self, ping_timeout: float = 2.0) -> Dict[str, Any]:
+        """Liveness of the workers plus queue depth and recent latency."""
+        status = "ok"
+        alive: Optional[int] = None
+        if self.processes and self._executor is not None:
+            try:
+                pids = {
+                    future.result(timeout=ping_timeout)
+                    for future in [self._executor.submit(_ping) for _ in range(self.processes)]
+                }
+                alive = len(pids)
+            except Exception as e:
+                logger.error(f"Embedding worker health check failed: {e}")
+                alive = 0
+            if alive == 0:
+                status = "fail"
+        if self._pending >= self.max_pending:
+            status = "saturated" if status == "ok" else status
+        return {
+            "status": status,
+            "mode": "processes" if self.processes else "threads",
+            "workers": self.processes or self.batcher.workers,
+            "workers_responding": alive,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "failures": self.failures,
+            "last_batch_ms": round(self.last_batch_ms, 2) if self.last_batch_ms else None,
+        }
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
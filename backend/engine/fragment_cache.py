@@ -0,0 +1,150 @@
+"""
+Cache of per-article serialized JSON fragments for list responses.
+
+Listing pages are mostly the same few thousand unchanged articles, so each
+article's JSON object is serialized once and kept as bytes, keyed by
+``(id, revision, fields)``. Here the revision is the row's ``updated_at``
+(from ``engine.article_store``) and the fields are the ones included in the
+response. A page body is then the cached fragments joined into a JSON array.
+
+An edit changes ``updated_at`` and so the key, and a stale fragment can't be
+hit again; it ages out of the LRU. ``trigger_scrape`` also calls
+``invalidate`` for rows it inserts or updates, so this process drops them
+straight away. The cache is bounded by ``FRAGMENT_CACHE_MAX_BYTES`` of
+fragment data, and ``stats()`` reports memory and hit ratio.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import orjson
+from prometheus_client import Counter, Gauge
+
+FRAGMENT_CACHE_MAX_BYTES: int = int(os.getenv("FRAGMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+HITS = Counter("fragment_cache_hits_total", "Article JSON fragments served from the cache")
+MISSES = Counter("fragment_cache_misses_total", "Article JSON fragments serialized on a miss")
+CACHE_BYTES = Gauge("fragment_cache_bytes", "Bytes of cached article JSON fragments")
+
+Key = Tuple[str, str, Tuple[str, ...]]
+Prepare = Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]
+
+
+class FragmentCache:
+    """Byte-bounded LRU of serialized article objects."""
+
+    def __init__(self, max_bytes: int = FRAGMENT_CACHE_MAX_BYTES) -> None:
+        self.max_bytes: int = max_bytes
+        self._fragments: "OrderedDict[Key, bytes]" = OrderedDict()
+        self._keys_by_id: Dict[str, Set[Key]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def _discard(self, key: Key) -> None:
+        fragment = self._fragments.pop(key)
+        self._bytes -= len(fragment)
+        keys = self._keys_by_id.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_id[key[0]]
+
+    def _put(self, key: Key, fragment: bytes) -> None:
+        if len(fragment) > self.max_bytes:
+            return
+        if key in self._fragments:
+            self._discard(key)
+        self._fragments[key] = fragment
+        self._keys_by_id.setdefault(key[0], set()).add(key)
+        self._bytes += len(fragment)
+        while self._bytes > self.max_bytes:
+            self._discard(next(iter(self._fragments)))
+            self.evictions += 1
+
+    def fragments(
+        self,
+        columns: Any,
+        positions: Sequence[int],
+        fields: Tuple[str, ...],
+        prepare: Optional[Prepare] = None,
+    ) -> List[bytes]:
+        """Serialized ``fields`` of each row of ``columns`` at ``positions``, in order.
+
+        Misses are built with ``columns.response`` and passed through
+        ``prepare`` (e.g. read-time validation) before being serialized.
+        """
+        keys = [
+            (columns.ids[int(i)], columns.revisions[int(i)], fields) for i in positions
+        ]
+        out: List[Optional[bytes]] = []
+        missing: List[int] = []
+        with self._lock:
+            for slot, key in enumerate(keys):
+                fragment = self._fragments.get(key)
+                if fragment is not None:
+                    self._fragments.move_to_end(key)
+                else:
+                    missing.append(slot)
+                out.append(fragment)
+            hits = len(keys) - len(missing)
+            self.hits += hits
+            self.misses += len(missing)
+        HITS.inc(hits)
+        MISSES.inc(len(missing))
+        if missing:
+            rows = [columns.response(int(positions[slot])) for slot in missing]
+            if prepare is not None:
+                rows = prepare(rows)
+            built = [orjson.dumps({field: row[field] for field in fields}) for row in rows]
+            with self._lock:
+                for slot, fragment in zip(missing, built):
+                    out[slot] = fragment
+                    self._put(keys[slot], fragment)
+                CACHE_BYTES.set(self._bytes)
+        return out
+
+    def invalidate(self, ids: Iterable[str]) -> int:
+        """Drop every cached fragment of these article ids; returns how many."""
+        removed = 0
+        with self._lock:
+            for article_id in ids:
+                for key in list(self._keys_by_id.get(str(article_id), ())):
+                    self._discard(key)
+                    removed += 1
+            CACHE_BYTES.set(self._bytes)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fragments.clear()
+            self._keys_by_id.clear()
+            self._bytes = 0
+            CACHE_BYTES.set(0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._fragments),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+def json_array(fragments: Iterable[bytes]) -> bytes:
+    """A JSON array of already-serialized values."""
+    return b"[" + b",".join(fragments) + b"]"
+
+
+fragment_cache = FragmentCache()
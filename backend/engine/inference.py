@@ -0,0 +1,173 @@
+"""
+Pluggable inference backends for the sentence embedding model.
+
+``EMBEDDING_BACKEND`` selects how the BGE encoder runs on CPU:
+
+- ``torch``: fp32 PyTorch (default)
+- ``torch-int8``: PyTorch with dynamic int8 quantization of the Linear layers
+- ``onnx``: ONNX Runtime, fp32
+- ``onnx-int8``: ONNX Runtime with a dynamically quantized int8 graph
+
+Every backend returns a ``SentenceTransformer``, so callers keep using
+``encode`` unchanged. The ONNX backends need ``optimum[onnxruntime]``; the
+quantized graph is exported once and cached under ``ONNX_CACHE_DIR``.
+
+Before switching production to a cheaper backend, check it agrees with fp32:
+
+    python -m engine.inference parity --backend onnx-int8
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+ONNX_CACHE_DIR: str = os.getenv(
+    "ONNX_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nexus", "onnx")
+)
+# avx512_vnni, avx512, avx2 or arm64, matching the production CPU.
+ONNX_QUANTIZATION: str = os.getenv("ONNX_QUANTIZATION", "avx512_vnni")
+PARITY_MIN_COSINE: float = float(os.getenv("PARITY_MIN_COSINE", "0.98"))
+
+DEFAULT_MODEL_NAME = "BAAI/bge-base-en-v1.5"
+
+PARITY_SENTENCES = [
+    "How we scaled our payments ledger to millions of transactions per day",
+    "Migrating a monolith to microservices without downtime",
+    "Building a real-time feature store for machine learning models",
+    "Lessons learned from running Kafka at scale",
+    "Reducing p99 latency in a distributed cache",
+    "Designing an experimentation platform for A/B tests",
+    "Zero trust networking for internal services",
+    "Improving Android app startup time",
+    "A new query planner for our analytics warehouse",
+    "Incident review: cascading failures in the dispatch service",
+    "Using embeddings to rank search results",
+    "Automating database schema migrations safely",
+    "kubernetes autoscaling",
+    "GraphQL federation in practice",
+    "Fraud detection with gradient boosted trees",
+    "Title: Observability. Category: Infrastructure. Tags: tracing, metrics, logging",
+]
+
+
+def _check_backend(backend: str) -> str:
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}'; expected one of {BACKENDS}")
+    return backend
+
+
+def cache_version(model_name: str, backend: str = EMBEDDING_BACKEND) -> str:
+    """Identifier of the vectors a (model, backend) pair produces, for cache keys."""
+    return f"{model_name}#{_check_backend(backend)}"
+
+
+def _onnx_dir(model_name: str) -> str:
+    return os.path.join(ONNX_CACHE_DIR, model_name.replace("/", "__"))
+
+
+def _load_onnx_int8(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    directory = _onnx_dir(model_name)
+    file_name = f"onnx/model_qint8_{ONNX_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(directory, file_name)):
+        logger.info(f"Exporting int8 ONNX graph for {model_name} to {directory}")
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        model.save(directory)
+        export_dynamic_quantized_onnx_model(model, ONNX_QUANTIZATION, directory)
+    return SentenceTransformer(
+        directory, device="cpu", backend="onnx", model_kwargs={"file_name": file_name}
+    )
+
+
+def load_model(model_name: str = DEFAULT_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> Any:
+    """Load ``model_name`` as a SentenceTransformer running on ``backend``."""
+    backend = _check_backend(backend)
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        model = SentenceTransformer(model_name, device="cpu")
+    elif backend == "torch-int8":
+        import torch
+
+        model = SentenceTransformer(model_name, device="cpu")
+        torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+        )
+    elif backend == "onnx":
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+    else:
+        model = _load_onnx_int8(model_name)
+    model.cache_version = cache_version(model_name, backend)
+    logger.info(f"Loaded {model_name} with the {backend} backend")
+    return model
+
+
+def _embed(model: Any, sentences: Sequence[str]) -> np.ndarray:
+    vectors = np.asarray(model.encode(list(sentences), batch_size=len(sentences)), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def parity_check(
+    candidate: Any,
+    reference: Any,
+    sentences: Sequence[str] = PARITY_SENTENCES,
+    min_cosine: float = PARITY_MIN_COSINE,
+) -> Dict[str, Any]:
+    """Compare a backend's embeddings with the fp32 reference on a fixed sentence set.
+
+    Reports the per-sentence cosine agreement and whether nearest-neighbour
+    rankings among the sentences are preserved.
+    """
+    got = _embed(candidate, sentences)
+    expected = _embed(reference, sentences)
+    cosines = np.sum(got * expected, axis=1)
+
+    got_sim = got @ got.T
+    expected_sim = expected @ expected.T
+    np.fill_diagonal(got_sim, -np.inf)
+    np.fill_diagonal(expected_sim, -np.inf)
+    neighbours_agree = float(np.mean(got_sim.argmax(axis=1) == expected_sim.argmax(axis=1)))
+
+    return {
+        "sentences": len(sentences),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "nearest_neighbour_agreement": neighbours_agree,
+        "passed": bool(cosines.min() >= min_cosine),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=["parity"])
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, choices=BACKENDS)
+    parser.add_argument("--model", default=DEFAULT_MODEL_NAME)
+    parser.add_argument("--min-cosine", type=float, default=PARITY_MIN_COSINE)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    report = parity_check(
+        load_model(args.model, args.backend),
+        load_model(args.model, "torch"),
+        min_cosine=args.min_cosine,
+    )
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Process-wide registry of embedding models.
+
+Search, recommendations and the scrapers used to load their own copy of
+``BAAI/bge-base-en-v1.5`` at import time, and KeyBERT loaded a fourth model.
+Every consumer now asks the registry instead: one instance per
+``(model, backend)`` pair is loaded on first use and shared, KeyBERT wraps
+that same instance, and each model has one ``EmbeddingWorkerPool`` in front
+of it.
+
+The resident memory each load added to the process is recorded, so
+``memory_report()`` (and the ``embedding_model_resident_bytes`` gauge) show
+what the models cost.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import Gauge
+
+from engine.embedding_pool import EmbeddingWorkerPool
+from engine.inference import DEFAULT_MODEL_NAME, EMBEDDING_BACKEND, load_model
+
+logger = logging.getLogger(__name__)
+
+MODEL_RESIDENT_BYTES = Gauge(
+    "embedding_model_resident_bytes",
+    "Resident memory added to the process by loading a model",
+    ["model", "backend"],
+)
+
+ModelKey = Tuple[str, str]
+
+_models: Dict[ModelKey, Any] = {}
+_keybert: Dict[ModelKey, Any] = {}
+_pools: Dict[ModelKey, EmbeddingWorkerPool] = {}
+_stats: Dict[ModelKey, Dict[str, Any]] = {}
+_lock = threading.RLock()
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # ru_maxrss is a high-water mark in KiB on Linux; good enough for a delta.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    parameters = getattr(model, "parameters", None)
+    if parameters is None:
+        return None
+    try:
+        return sum(p.numel() * p.element_size() for p in parameters())
+    except Exception:
+        return None
+
+
+def _key(model_name: str, backend: str) -> ModelKey:
+    return (model_name, backend.lower())
+
+
+def get_model(model_name: str = DEFAULT_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> Any:
+    """The shared encoder for ``(model_name, backend)``, loaded on first use."""
+    key = _key(model_name, backend)
+    model = _models.get(key)
+    if model is not None:
+        return model
+    with _lock:
+        if key not in _models:
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            model = load_model(model_name, backend)
+            resident = max(0, _rss_bytes() - rss_before)
+            _stats[key] = {
+                "model": model_name,
+                "backend": key[1],
+                "resident_bytes": resident,
+                "parameter_bytes": _parameter_bytes(model),
+                "load_seconds": round(time.perf_counter() - start, 2),
+            }
+            MODEL_RESIDENT_BYTES.labels(model=model_name, backend=key[1]).set(resident)
+            logger.info(
+                f"Loaded {model_name} ({key[1]}) in {_stats[key]['load_seconds']}s, "
+                f"+{resident / 2**20:.0f} MiB resident"
+            )
+            _models[key] = model
+        return _models[key]
+
+
+def get_keybert(model_name: str = DEFAULT_MODEL_NAME, backend: str = EMBEDDING_BACKEND) -> Any:
+    """A KeyBERT extractor that reuses the shared encoder instead of loading its own."""
+    key = _key(model_name, backend)
+    with _lock:
+        if key not in _keybert:
+            from keybert import KeyBERT
+
+            _keybert[key] = KeyBERT(model=get_model(model_name, backend))
+        return _keybert[key]
+
+
+def get_pool(
+    model_name: str = DEFAULT_MODEL_NAME, backend: str = EMBEDDING_BACKEND
+) -> EmbeddingWorkerPool:
+    """The embedding pool for a model; in thread mode it encodes with the shared instance."""
+    key = _key(model_name, backend)
+    with _lock:
+        if key not in _pools:
+            _pools[key] = EmbeddingWorkerPool(
+                model_name,
+                backend=backend,
+                local_model_factory=lambda: get_model(model_name, backend),
+            )
+        return _pools[key]
+
+
+def loaded_models() -> List[ModelKey]:
+    return list(_models)
+
+
+def memory_report() -> List[Dict[str, Any]]:
+    """Per-model load statistics: resident bytes added, parameter bytes, load time."""
+    return [dict(stats) for stats in _stats.values()]
+
+
+def close_pools() -> None:
+    with _lock:
+        for pool in _pools.values():
+            pool.close()
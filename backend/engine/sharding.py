@@ -0,0 +1,606 @@
+"""
+Sharded scatter-gather search over the article embedding matrix.
+
+The matrix is split into contiguous row ranges, each held by a shard server
+in its own process (or on another host). ``ShardedIndex`` fans a query out to
+every shard, each shard returns its local top-k, and the coordinator merges
+the per-shard heaps into the global top-k.
+
+Shards speak a small tuple protocol over ``multiprocessing.connection``, so
+the same server loop runs behind a local pipe or a TCP listener. Requests
+carry sequence numbers, so a reply that arrives after its query timed out is
+dropped instead of being read as the answer to the next one.
+
+A TCP server serves any number of coordinators (one per API worker). Each
+coordinator's rows are tagged with a version token, built from the corpus
+version, row count and shard layout. The server keeps one slice per token
+that some connection holds. Coordinators at the same version share a slice,
+while a worker that is ahead or behind gets its own. A search names its
+token, the server answers ``missing`` for a token it does not hold, and the
+coordinator drops a reply tagged with another token. Row ids are therefore
+never mapped onto another worker's metadata.
+
+    python -m engine.sharding serve --port 7100 --authkey secret
+
+Per-shard latency is recorded on every query so stragglers are visible.
+"""
+
+import argparse
+import heapq
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+import uuid
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from prometheus_client import Histogram
+
+from engine.vector_index import DEFAULT_DIM, VectorIndex, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+SHARD_SEARCH_SECONDS = Histogram(
+    "article_shard_search_seconds",
+    "Round-trip time of one shard answering a scatter-gather query",
+    ["shard"],
+)
+
+DEFAULT_SHARD_TIMEOUT = 2.0
+# Loading or fetching a shard's rows moves the whole slice over the wire.
+DEFAULT_SHARD_LOAD_TIMEOUT = 120.0
+STRAGGLER_FACTOR = 3.0
+
+
+# A shard's slice of the matrix and the global row id of its first row.
+ShardSlice = Tuple[np.ndarray, int]
+
+
+class ShardState:
+    """The slices a shard server holds, by version token, shared by all of its connections.
+
+    A slice lives while at least one connection holds its token; a connection
+    holds one token at a time and lets go of it when it moves on or closes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._slices: Dict[str, ShardSlice] = {}
+        self._holders: Dict[str, int] = {}
+
+    def get(self, token: str) -> Optional[ShardSlice]:
+        return self._slices.get(token)
+
+    def hold(self, token: str, data: Optional[ShardSlice] = None) -> Optional[ShardSlice]:
+        """Hold ``token``'s slice, storing ``data`` as it first; None if there is none."""
+        with self._lock:
+            current = self._slices.get(token)
+            if data is not None and (
+                current is None
+                or current[1] != data[1]
+                or current[0].shape != data[0].shape
+            ):
+                current = self._slices[token] = data
+            if current is None:
+                return None
+            self._holders[token] = self._holders.get(token, 0) + 1
+            return current
+
+    def release(self, token: str) -> None:
+        with self._lock:
+            holders = self._holders.get(token, 0) - 1
+            if holders > 0:
+                self._holders[token] = holders
+            else:
+                self._holders.pop(token, None)
+                self._slices.pop(token, None)
+
+    def rows(self) -> int:
+        return sum(matrix.shape[0] for matrix, _ in list(self._slices.values()))
+
+
+def _search(data: ShardSlice, query: np.ndarray, top_k: int):
+    matrix, offset = data
+    start = time.perf_counter()
+    if matrix.shape[0]:
+        scores = matrix @ query
+        best = top_k_indices(scores, top_k)
+        rows, best_scores = best + offset, scores[best]
+    else:
+        rows, best_scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    return rows, best_scores, time.perf_counter() - start
+
+
+def serve_connection(
+    conn: Connection,
+    state: Optional[ShardState] = None,
+    executor: Optional[ThreadPoolExecutor] = None,
+) -> bool:
+    """Answer coordinator requests on one connection until it closes or says stop.
+
+    Every request is ``(command, seq, *args)`` and every reply ``(status, seq,
+    *payload)``, so the coordinator can match replies to requests. ``load``,
+    ``attach``, ``search`` and ``fetch`` name a version token, and the reply
+    echoes it; a token the server does not hold gets ``("missing", seq, token)``.
+    Searches run on ``executor`` (numpy releases the GIL), so one connection
+    can have several queries in flight and replies may come back out of order.
+    Returns ``True`` if the coordinator asked the server to stop.
+    """
+    state = state or ShardState()
+    own_executor = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+    send_lock = threading.Lock()
+    held: List[str] = []
+
+    def reply(*payload: Any) -> None:
+        try:
+            with send_lock:
+                conn.send(payload)
+        except (OSError, ValueError):
+            pass  # The coordinator hung up; nothing to answer.
+
+    def answer_search(seq: int, token: str, query: np.ndarray, top_k: int) -> None:
+        data = state.get(token)
+        if data is None:
+            reply("missing", seq, token)
+        else:
+            reply("ok", seq, token, *_search(data, query, top_k))
+
+    def switch_to(seq: int, token: str, data: Optional[ShardSlice] = None) -> None:
+        slice_ = state.hold(token, data)
+        if slice_ is None:
+            reply("missing", seq, token)
+            return
+        while held:
+            state.release(held.pop())
+        held.append(token)
+        reply("ok", seq, token, int(slice_[0].shape[0]))
+
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return False
+            command, seq = message[0], message[1]
+            if command == "load":
+                _, _, token, matrix, offset = message
+                switch_to(seq, token, (matrix, offset))
+            elif command == "attach":
+                switch_to(seq, message[2])
+            elif command == "search":
+                _, _, token, query, top_k = message
+                executor.submit(answer_search, seq, token, query, top_k)
+            elif command == "fetch":
+                token = message[2]
+                data = state.get(token)
+                if data is None:
+                    reply("missing", seq, token)
+                else:
+                    reply("ok", seq, token, *data)
+            elif command == "ping":
+                reply("ok", seq, state.rows())
+            elif command == "stop":
+                reply("ok", seq)
+                return True
+    finally:
+        while held:
+            state.release(held.pop())
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def serve(host: str, port: int, authkey: bytes) -> None:
+    """Run a shard server that accepts coordinator connections over TCP.
+
+    Each connection (one per API worker) is served on its own thread. Workers
+    at the same version token share one slice.
+    """
+    state = ShardState()
+    executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1)
+
+    def handle(conn: Connection) -> None:
+        with conn:
+            serve_connection(conn, state, executor)
+
+    with Listener((host, port), authkey=authkey) as listener:
+        logger.info(f"Shard server listening on {host}:{port}")
+        while True:
+            try:
+                conn = listener.accept()
+            except (OSError, EOFError) as e:
+                # A failed handshake (e.g. a wrong authkey) affects only that client.
+                logger.warning(f"Rejected shard connection: {e}")
+                continue
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+
+def _local_shard_main(conn: Connection) -> None:
+    serve_connection(conn)
+    conn.close()
+
+
+class _Pending:
+    __slots__ = ("event", "reply")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.reply: Optional[Tuple[Any, ...]] = None
+
+
+class ShardLink:
+    """One coordinator connection to a shard, shared by concurrent requests.
+
+    A reader thread routes each reply to the request with the same sequence
+    number. A reply that arrives after its request timed out has no waiter
+    and is dropped, so it can never be read as the answer to a later request.
+    """
+
+    def __init__(self, conn: Connection, name: str = "shard") -> None:
+        self.conn = conn
+        self.closed: bool = False
+        self._seq = itertools.count(1)
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _Pending] = {}
+        self._reader = threading.Thread(target=self._read, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    def send(self, command: str, *args: Any) -> int:
+        """Send a request and return its sequence number; see ``wait``."""
+        seq = next(self._seq)
+        with self._lock:
+            self._pending[seq] = _Pending()
+        if self.closed:
+            self._fail_all()
+            return seq
+        try:
+            with self._send_lock:
+                self.conn.send((command, seq, *args))
+        except (OSError, ValueError):
+            self._fail_all()
+        return seq
+
+    def wait(self, seq: int, timeout: float) -> Optional[Tuple[Any, ...]]:
+        """The reply to request ``seq``, or ``None`` on timeout or a lost connection."""
+        with self._lock:
+            pending = self._pending.get(seq)
+        if pending is not None:
+            pending.event.wait(max(0.0, timeout))
+        with self._lock:
+            self._pending.pop(seq, None)
+        return pending.reply if pending is not None else None
+
+    def request(self, command: str, *args: Any, timeout: float) -> Tuple[Any, ...]:
+        reply = self.wait(self.send(command, *args), timeout)
+        if reply is None:
+            raise TimeoutError(f"Shard did not answer {command!r} within {timeout:.0f}s")
+        return reply
+
+    def _read(self) -> None:
+        while True:
+            try:
+                reply = self.conn.recv()
+            except (EOFError, OSError):
+                self._fail_all()
+                return
+            with self._lock:
+                pending = self._pending.get(reply[1])
+            if pending is None:
+                logger.debug(f"Dropping a late shard reply to request {reply[1]}")
+                continue
+            pending.reply = reply
+            pending.event.set()
+
+    def _fail_all(self) -> None:
+        self.closed = True
+        with self._lock:
+            waiting = list(self._pending.values())
+        for pending in waiting:
+            pending.event.set()
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            self.conn.close()
+        except OSError:
+            pass
+
+
+class _ReadWriteLock:
+    """Many concurrent searches, or one rebuild; a waiting rebuild blocks new searches."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writing or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+
+def shard_ranges(n: int, num_shards: int) -> List[Tuple[int, int]]:
+    """Split ``n`` rows into ``num_shards`` contiguous, near-equal ranges."""
+    bounds = np.linspace(0, n, num_shards + 1).astype(int)
+    return [(int(bounds[i]), int(bounds[i + 1])) for i in range(num_shards)]
+
+
+class ShardedIndex(VectorIndex):
+    """Coordinator that scatters queries to shard servers and merges their top-k.
+
+    The coordinator keeps ids and metadata; the embedding rows live only in the
+    shards, under ``token``. Searches run concurrently over shared shard links;
+    a build or rebalance waits for in-flight searches and holds new ones until
+    the shards have their new rows. ``lost`` is set when a shard no longer
+    has this coordinator's rows, and a rebuild clears it.
+    """
+
+    def __init__(
+        self,
+        dim: int = DEFAULT_DIM,
+        num_shards: int = 2,
+        addresses: Optional[Sequence[Tuple[str, int]]] = None,
+        authkey: Optional[bytes] = None,
+        max_shard_rows: int = 0,
+        timeout: float = DEFAULT_SHARD_TIMEOUT,
+        load_timeout: float = DEFAULT_SHARD_LOAD_TIMEOUT,
+    ) -> None:
+        super().__init__(dim=dim)
+        self.max_shard_rows: int = max_shard_rows
+        self.timeout: float = timeout
+        self.load_timeout: float = load_timeout
+        self.last_latencies: Dict[int, float] = {}
+        self.token: str = ""
+        self.lost: bool = False
+        self._version: str = ""
+        self._addresses = list(addresses or [])
+        self._authkey = authkey
+        self._links: List[ShardLink] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._lock = _ReadWriteLock()
+        if self._addresses:
+            self._links = [self._connect(address) for address in self._addresses]
+        else:
+            self._spawn(num_shards)
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._links)
+
+    def _connect(self, address: Tuple[str, int]) -> ShardLink:
+        return ShardLink(Client(address, authkey=self._authkey), name=f"shard-{address[1]}")
+
+    def _spawn(self, count: int) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        for _ in range(count):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_local_shard_main, args=(child,), daemon=True)
+            process.start()
+            child.close()
+            self._links.append(ShardLink(parent, name=f"shard-{len(self._links)}"))
+            self._processes.append(process)
+        logger.info(f"Started {count} local shard processes")
+
+    def _layout_token(self, n: int) -> str:
+        # Same corpus version, id order and shard count means the same slices;
+        # the id checksum keeps workers that merged rows in another order apart.
+        checksum = zlib.crc32("\n".join(self._state[1]).encode("utf-8"))
+        return f"{self._version}:{checksum:08x}:{n}x{self.num_shards}"
+
+    def _distribute(self, matrix: np.ndarray) -> None:
+        n = matrix.shape[0]
+        if self.max_shard_rows and not self._addresses:
+            # Grow the local pool when the corpus outgrows the current shards.
+            needed = max(1, math.ceil(n / self.max_shard_rows))
+            if needed > self.num_shards:
+                self._spawn(needed - self.num_shards)
+        token = self._layout_token(n)
+        ranges = shard_ranges(n, self.num_shards)
+        deadline = time.perf_counter() + self.load_timeout
+        # Coordinators at this version may have loaded it already; attach first.
+        attached = [link.send("attach", token) for link in self._links]
+        missing = []
+        for shard, (link, seq) in enumerate(zip(self._links, attached)):
+            reply = link.wait(seq, deadline - time.perf_counter())
+            if reply is None:
+                raise TimeoutError(f"Shard {shard} did not answer attach in time")
+            if reply[0] != "ok" or reply[3] != ranges[shard][1] - ranges[shard][0]:
+                missing.append(shard)
+        # Send every missing slice first so the shards load in parallel.
+        sent = [
+            (shard, self._links[shard].send(
+                "load", token, np.ascontiguousarray(matrix[slice(*ranges[shard])]),
+                ranges[shard][0],
+            ))
+            for shard in missing
+        ]
+        for shard, seq in sent:
+            if self._links[shard].wait(seq, deadline - time.perf_counter()) is None:
+                raise TimeoutError(f"Shard {shard} did not load its rows in time")
+        self.token = token
+        self.lost = False
+        logger.info(
+            f"Distributed {n} vectors across {self.num_shards} shards "
+            f"({len(missing)} loaded, {self.num_shards - len(missing)} shared)"
+        )
+
+    def build(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        embedding_key: str = "embedding",
+        id_key: str = "url",
+        version: Optional[str] = None,
+    ) -> int:
+        """Replace the contents; ``version`` names the corpus so that coordinators at the
+        same version share shard rows (a fresh id when not given)."""
+        with self._lock.write():
+            count = super().build(rows, embedding_key=embedding_key, id_key=id_key)
+            self._version = version or uuid.uuid4().hex
+            self._distribute_and_release()
+        return count
+
+    def build_from_matrix(
+        self,
+        matrix: np.ndarray,
+        ids: Sequence[str],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+        normalized: bool = False,
+        version: Optional[str] = None,
+    ) -> int:
+        with self._lock.write():
+            count = super().build_from_matrix(matrix, ids, metadata=metadata, normalized=normalized)
+            self._version = version or uuid.uuid4().hex
+            self._distribute_and_release()
+        return count
+
+    def add_shard(self, address: Optional[Tuple[str, int]] = None) -> None:
+        """Add a local shard process (or a remote server) and rebalance onto it."""
+        with self._lock.write():
+            matrix = self._gather()
+            if address is not None:
+                self._links.append(self._connect(address))
+                self._addresses.append(address)
+            else:
+                self._spawn(1)
+            self._rebalance(matrix)
+
+    def rebalance(self) -> None:
+        """Re-split the corpus evenly across the current shards."""
+        with self._lock.write():
+            self._rebalance(self._gather())
+
+    def _rebalance(self, matrix: np.ndarray) -> None:
+        self._state = (matrix, self._state[1], self._state[2])
+        self._distribute_and_release()
+
+    def _distribute_and_release(self) -> None:
+        matrix, ids, metadata = self._state
+        self._distribute(matrix)
+        self._state = (np.empty((0, self.dim), dtype=np.float32), ids, metadata)
+
+    def _gather(self) -> np.ndarray:
+        """This coordinator's rows, fetched back from the shards that hold them."""
+        slices = []
+        for shard, link in enumerate(self._links if self.token else []):
+            reply = link.request("fetch", self.token, timeout=self.load_timeout)
+            if reply[0] != "ok" or reply[2] != self.token:
+                raise RuntimeError(f"Shard {shard} no longer holds rows for {self.token}")
+            _, _, _, matrix, offset = reply
+            if matrix.shape[0]:
+                slices.append((offset, matrix))
+        if not slices:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.concatenate([m for _, m in sorted(slices, key=lambda s: s[0])])
+
+    def search(self, query_embedding: Any, top_k: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Scatter the query to every shard and merge the per-shard top-k."""
+        query = self.prepare_query(query_embedding)
+        with self._lock.read():
+            metadata, token = self._state[2], self.token
+            if not metadata:
+                return []
+            sent_at = time.perf_counter()
+            sent = [(link, link.send("search", token, query, top_k)) for link in self._links]
+
+            candidates: List[Tuple[float, int]] = []
+            latencies: Dict[int, float] = {}
+            deadline = sent_at + self.timeout
+            for shard, (link, seq) in enumerate(sent):
+                reply = link.wait(seq, deadline - time.perf_counter())
+                if reply is None:
+                    logger.error(f"Shard {shard} timed out; returning partial results")
+                    continue
+                if reply[0] != "ok" or reply[2] != token:
+                    # Its rows are another version's; their ids don't index ``metadata``.
+                    logger.error(f"Shard {shard} lost rows for {token}; returning partial results")
+                    self.lost = True
+                    continue
+                _, _, _, rows, scores, _ = reply
+                latencies[shard] = time.perf_counter() - sent_at
+                SHARD_SEARCH_SECONDS.labels(shard=str(shard)).observe(latencies[shard])
+                candidates.extend(zip(scores.tolist(), rows.tolist()))
+
+        self.last_latencies = latencies
+        self._report_stragglers(latencies)
+        best = heapq.nlargest(top_k, candidates)
+        return [(score, metadata[row]) for score, row in best]
+
+    def _report_stragglers(self, latencies: Dict[int, float]) -> None:
+        if len(latencies) < 2:
+            return
+        median = statistics.median(latencies.values())
+        for shard, latency in latencies.items():
+            if median > 0 and latency > STRAGGLER_FACTOR * median:
+                logger.warning(
+                    f"Shard {shard} is straggling: {latency * 1000:.1f}ms vs median "
+                    f"{median * 1000:.1f}ms"
+                )
+
+    def close(self) -> None:
+        """Stop local shard processes and close every connection."""
+        for link in self._links:
+            try:
+                if self._processes:
+                    link.request("stop", timeout=self.timeout)
+            except TimeoutError:
+                pass
+            link.close()
+        for process in self._processes:
+            process.join(timeout=5)
+        self._links = []
+        self._processes = []
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7100)
+    parser.add_argument("--authkey", default=os.getenv("SHARD_AUTHKEY", ""))
+    args = parser.parse_args(argv)
+    if not args.authkey:
+        parser.error("--authkey or SHARD_AUTHKEY is required")
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.authkey.encode())
+
+
+if __name__ == "__main__":
+    main()
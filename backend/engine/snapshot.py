@@ -0,0 +1,274 @@
+"""
+Versioned on-disk snapshots of the article embedding index.
+
+A snapshot is a flat float32 ``.npy`` matrix plus two JSON sidecars: a
+manifest (format version, shape, sha256 checksum, model id) and a rows file
+(ids and metadata). Workers ``mmap`` the matrix read-only, so N processes
+share one copy of the corpus through the page cache.
+
+Publishing writes the new files first and then atomically replaces the
+``CURRENT`` pointer, so readers flip from the old snapshot to the new one
+(blue/green) without restarting. Concurrent publishers (several workers, or a
+worker and the CLI) each claim a distinct version by creating its matrix file
+with ``O_EXCL``, and only move the pointer forward, under an ``flock``.
+
+Usage:
+    python -m engine.snapshot publish --dir /var/lib/recommender/snapshots
+    python -m engine.snapshot verify --dir /var/lib/recommender/snapshots
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine.atomic_file import atomic_write
+from engine.vector_index import VectorIndex
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+POINTER_NAME = "CURRENT"
+LOCK_NAME = ".publish.lock"
+KEEP_SNAPSHOTS = 3
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, malformed or fails its checksum."""
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _paths(directory: str, version: int) -> Dict[str, str]:
+    stem = os.path.join(directory, f"articles-{version:08d}")
+    return {"matrix": f"{stem}.npy", "manifest": f"{stem}.json", "rows": f"{stem}.rows.json"}
+
+
+def current_version(directory: str) -> Optional[int]:
+    """Version named by the ``CURRENT`` pointer, or None if nothing is published."""
+    try:
+        with open(os.path.join(directory, POINTER_NAME)) as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _versions_on_disk(directory: str) -> List[int]:
+    versions = []
+    for name in os.listdir(directory):
+        if name.startswith("articles-"):
+            try:
+                versions.append(int(name.split("-")[1].split(".")[0]))
+            except ValueError:
+                continue
+    return versions
+
+
+def _claim_version(directory: str) -> Tuple[int, IO[bytes]]:
+    """The next free version and its matrix file, created exclusively."""
+    version = max(_versions_on_disk(directory) + [current_version(directory) or 0]) + 1
+    while True:
+        try:
+            fd = os.open(_paths(directory, version)["matrix"], os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            version += 1
+            continue
+        return version, os.fdopen(fd, "wb")
+
+
+@contextmanager
+def _publish_lock(directory: str) -> Iterator[None]:
+    with open(os.path.join(directory, LOCK_NAME), "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_snapshot(
+    directory: str,
+    matrix: np.ndarray,
+    ids: Sequence[str],
+    metadata: Sequence[Dict[str, Any]],
+    model_id: str = "",
+) -> int:
+    """Write a new snapshot version and atomically point ``CURRENT`` at it.
+
+    The pointer is only moved forward: a publisher that finishes after a newer
+    version was published leaves its files for pruning.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version, matrix_file = _claim_version(directory)
+    paths = _paths(directory, version)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+
+    try:
+        with matrix_file:
+            np.save(matrix_file, matrix)
+            matrix_file.flush()
+            os.fsync(matrix_file.fileno())
+        rows = {"ids": list(ids), "metadata": list(metadata)}
+        atomic_write(paths["rows"], json.dumps(rows, default=str).encode())
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "version": version,
+            "count": int(matrix.shape[0]),
+            "dim": int(matrix.shape[1]),
+            "dtype": "float32",
+            "normalized": True,
+            "sha256": file_sha256(paths["matrix"]),
+            "model_id": model_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        atomic_write(paths["manifest"], json.dumps(manifest, indent=2).encode())
+    except BaseException:
+        for path in paths.values():
+            if os.path.exists(path):
+                os.unlink(path)
+        raise
+
+    with _publish_lock(directory):
+        current = current_version(directory) or 0
+        if version > current:
+            atomic_write(os.path.join(directory, POINTER_NAME), str(version).encode())
+            logger.info(
+                f"Published snapshot v{version} with {manifest['count']} vectors to {directory}"
+            )
+            current = version
+        else:
+            logger.info(f"Snapshot v{version} superseded by v{current} before it was published")
+        _prune(directory, keep_from=current - KEEP_SNAPSHOTS + 1)
+    return version
+
+
+def _prune(directory: str, keep_from: int) -> None:
+    # Workers still serving an older version keep their mmap valid after unlink.
+    for version in set(_versions_on_disk(directory)):
+        if version < keep_from:
+            for path in _paths(directory, version).values():
+                if os.path.exists(path):
+                    os.unlink(path)
+
+
+def read_manifest(directory: str, version: int) -> Dict[str, Any]:
+    try:
+        with open(_paths(directory, version)["manifest"]) as f:
+            manifest = json.load(f)
+    except FileNotFoundError as e:
+        raise SnapshotError(f"Snapshot v{version} has no manifest in {directory}") from e
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {manifest.get('format_version')}")
+    return manifest
+
+
+def load_snapshot(
+    directory: str,
+    version: Optional[int] = None,
+    verify: bool = True,
+    index: Optional[VectorIndex] = None,
+) -> VectorIndex:
+    """Memory-map a snapshot read-only and build ``index`` (a VectorIndex by default) on it."""
+    version = version or current_version(directory)
+    if version is None:
+        raise SnapshotError(f"No snapshot published in {directory}")
+    manifest = read_manifest(directory, version)
+    paths = _paths(directory, version)
+
+    if verify and file_sha256(paths["matrix"]) != manifest["sha256"]:
+        raise SnapshotError(f"Checksum mismatch for snapshot v{version}")
+
+    matrix = np.load(paths["matrix"], mmap_mode="r")
+    if matrix.shape != (manifest["count"], manifest["dim"]) or matrix.dtype != np.float32:
+        raise SnapshotError(f"Snapshot v{version} matrix does not match its manifest")
+    with open(paths["rows"]) as f:
+        rows = json.load(f)
+
+    if index is None:
+        index = VectorIndex(dim=manifest["dim"])
+    elif index.dim != manifest["dim"]:
+        raise SnapshotError(f"Snapshot v{version} has dim {manifest['dim']}, not {index.dim}")
+    index.build_from_matrix(matrix, rows["ids"], metadata=rows["metadata"], normalized=True)
+    index.snapshot_version = version
+    return index
+
+
+class SnapshotWatcher:
+    """Serves the current snapshot and swaps to a newer one when ``CURRENT`` moves."""
+
+    def __init__(
+        self,
+        directory: str,
+        check_interval: float = 5.0,
+        verify: bool = True,
+        new_index: Optional[Callable[[Optional[VectorIndex]], Optional[VectorIndex]]] = None,
+    ) -> None:
+        self.directory: str = directory
+        self.check_interval: float = check_interval
+        self.verify: bool = verify
+        # new_index(previous) -> the empty index to build the next snapshot into,
+        # or None for a plain VectorIndex.
+        self.new_index = new_index
+        self.version: Optional[int] = None
+        self._index: Optional[VectorIndex] = None
+        self._checked_at: float = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Optional[VectorIndex]:
+        """Return the active index, checking the pointer at most every ``check_interval``."""
+        if time.monotonic() - self._checked_at < self.check_interval:
+            return self._index
+        with self._lock:
+            if time.monotonic() - self._checked_at >= self.check_interval:
+                self._checked_at = time.monotonic()
+                latest = current_version(self.directory)
+                if latest is not None and latest != self.version:
+                    try:
+                        index = self.new_index(self._index) if self.new_index else None
+                        self._index = load_snapshot(
+                            self.directory, latest, verify=self.verify, index=index
+                        )
+                        self.version = latest
+                        logger.info(f"Swapped to snapshot v{latest}")
+                    except (SnapshotError, OSError) as e:
+                        # Keep serving the previous snapshot.
+                        logger.error(f"Failed to load snapshot v{latest}: {e}")
+        return self._index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("command", choices=["publish", "verify"])
+    parser.add_argument("--dir", default=os.getenv("ARTICLE_SNAPSHOT_DIR", ""))
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("--dir or ARTICLE_SNAPSHOT_DIR is required")
+
+    if args.command == "publish":
+        from engine.article_index import publish_snapshot
+
+        print(f"Published snapshot v{publish_snapshot(args.dir)}")
+    else:
+        index = load_snapshot(args.dir, verify=True)
+        print(f"Snapshot v{index.snapshot_version} OK: {len(index)} vectors")
+
+
+if __name__ == "__main__":
+    main()
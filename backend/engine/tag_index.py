@@ -0,0 +1,139 @@
+"""
+Inverted tag index over an ``ArticleColumns`` snapshot.
+
+Tags are normalized (NFKC, case-folded, trimmed) into a dictionary, and each
+normalized tag has a posting list of row positions. Snapshot rows are ordered
+newest first, so sorted positions are posting lists in ``published_date``
+order. Substring queries (``/articles/tags/kaf`` matches ``kafka``) go through
+a trigram index over the dictionary: the query's trigrams narrow the candidate
+tags and a final ``in`` check confirms them. Queries shorter than a trigram
+scan the dictionary, which is far smaller than the corpus.
+
+Tag filters then become unions (``match="any"``) or intersections
+(``match="all"``) of posting lists. Per-tag article counts for ``/all-tags``
+are the posting list lengths; when the store merges a delta they are carried
+forward by adjusting only the tags of the added and replaced rows.
+"""
+
+import unicodedata
+from collections import Counter
+from functools import reduce
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+NGRAM = 3
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def normalize_tag(tag: str) -> str:
+    return unicodedata.normalize("NFKC", tag).casefold().strip()
+
+
+def ngrams(text: str, n: int = NGRAM) -> List[str]:
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def tag_set(tags: Iterable[str]) -> set:
+    """The distinct normalized tags of one article."""
+    return {normalize_tag(tag) for tag in tags} - {""}
+
+
+class TagIndex:
+    """Normalized tag dictionary, posting lists and a trigram index."""
+
+    def __init__(
+        self,
+        raw_tags: Sequence[str],
+        tag_ids: Sequence[np.ndarray],
+        counts: Optional[Counter] = None,
+    ) -> None:
+        self.tags: List[str] = []
+        codes: Dict[str, int] = {}
+        raw_to_norm = np.empty(len(raw_tags), dtype=np.int64)
+        for raw_id, raw in enumerate(raw_tags):
+            norm = normalize_tag(raw)
+            if norm not in codes:
+                codes[norm] = len(self.tags)
+                self.tags.append(norm)
+            raw_to_norm[raw_id] = codes[norm]
+
+        # One (tag, position) pair per tag occurrence, deduplicated and grouped by tag.
+        lengths = np.fromiter((len(ids) for ids in tag_ids), dtype=np.int64, count=len(tag_ids))
+        if lengths.sum():
+            norm_ids = raw_to_norm[np.concatenate(tag_ids)]
+            positions = np.repeat(np.arange(len(tag_ids), dtype=np.int64), lengths)
+            pairs = np.unique(np.stack([norm_ids, positions], axis=1), axis=0)
+            bounds = np.searchsorted(pairs[:, 0], np.arange(len(self.tags) + 1))
+            self._postings: List[np.ndarray] = [
+                pairs[bounds[t]:bounds[t + 1], 1] for t in range(len(self.tags))
+            ]
+        else:
+            self._postings = [_EMPTY for _ in self.tags]
+
+        grams: Dict[str, List[int]] = {}
+        for tag_id, tag in enumerate(self.tags):
+            for gram in set(ngrams(tag)):
+                grams.setdefault(gram, []).append(tag_id)
+        self._ngrams: Dict[str, np.ndarray] = {
+            gram: np.asarray(ids, dtype=np.int64) for gram, ids in grams.items()
+        }
+
+        if counts is None:
+            counts = Counter({tag: len(p) for tag, p in zip(self.tags, self._postings) if len(p)})
+        self.counts: Counter = counts
+        self._sorted_counts: Optional[List[Tuple[str, int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def matching_tags(self, query: str) -> np.ndarray:
+        """Ids of the normalized tags containing ``query``."""
+        query = normalize_tag(query)
+        if not query:
+            return _EMPTY
+        if len(query) < NGRAM:
+            candidates: Iterable[int] = range(len(self.tags))
+        else:
+            lists = [self._ngrams.get(gram, _EMPTY) for gram in set(ngrams(query))]
+            candidates = reduce(np.intersect1d, sorted(lists, key=len))
+        return np.asarray([t for t in candidates if query in self.tags[t]], dtype=np.int64)
+
+    def postings(self, query: str) -> np.ndarray:
+        """Positions of articles with a tag containing ``query``, newest first."""
+        tag_ids = self.matching_tags(query)
+        if tag_ids.size == 0:
+            return _EMPTY
+        if tag_ids.size == 1:
+            return self._postings[int(tag_ids[0])]
+        return np.unique(np.concatenate([self._postings[int(t)] for t in tag_ids]))
+
+    def lookup(self, queries: Sequence[str], match: str = "any") -> np.ndarray:
+        """Positions matching any (union) or all (intersection) of the queries, newest first."""
+        lists = [self.postings(query) for query in queries]
+        if not lists:
+            return _EMPTY
+        if match == "all":
+            return reduce(np.intersect1d, sorted(lists, key=len))
+        return np.unique(np.concatenate(lists))
+
+    def sorted_counts(self) -> List[Tuple[str, int]]:
+        """``(tag, article count)`` pairs, most used first; computed once per snapshot."""
+        if self._sorted_counts is None:
+            self._sorted_counts = sorted(
+                ((tag, count) for tag, count in self.counts.items() if count > 0),
+                key=lambda item: (-item[1], item[0]),
+            )
+        return self._sorted_counts
+
+    def counts_after(
+        self, removed: Iterable[Iterable[str]], added: Iterable[Iterable[str]]
+    ) -> Counter:
+        """Counts after replacing the ``removed`` articles' tags with the ``added`` ones."""
+        counts = Counter(self.counts)
+        for tags in removed:
+            counts.subtract(tag_set(tags))
+        for tags in added:
+            counts.update(tag_set(tags))
+        return +counts
@@ -0,0 +1,158 @@
+"""
+In-memory vector index for article embeddings.
+
+Holds every article embedding as one pre-normalized float32 matrix next to
+parallel id and metadata arrays, so a query is scored with a single
+matrix-vector product and the top-k is selected with ``argpartition``.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 768
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row of a matrix in place and return it."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """Return the indices of the ``top_k`` highest scores, best first."""
+    if top_k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if top_k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class VectorIndex:
+    """Exact cosine-similarity index over a pre-normalized float32 matrix."""
+
+    def __init__(self, dim: int = DEFAULT_DIM) -> None:
+        self.dim: int = dim
+        self.snapshot_version: Optional[int] = None
+        # (matrix, ids, metadata) is swapped as one tuple so readers always
+        # see a consistent snapshot without taking a lock.
+        self._state: Tuple[np.ndarray, List[str], List[Dict[str, Any]]] = (
+            np.empty((0, dim), dtype=np.float32), [], []
+        )
+
+    def __len__(self) -> int:
+        return len(self._state[1])
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The normalized embedding matrix, one row per indexed article."""
+        return self._state[0]
+
+    @property
+    def ids(self) -> List[str]:
+        """Ids of the indexed articles, aligned with the matrix rows."""
+        return self._state[1]
+
+    @property
+    def metadata(self) -> List[Dict[str, Any]]:
+        """Article metadata (without embeddings), aligned with the matrix rows."""
+        return self._state[2]
+
+    def is_valid_embedding(self, embedding: Any) -> bool:
+        """Check that an embedding has the index dimension and finite, non-zero values."""
+        if not isinstance(embedding, (list, tuple, np.ndarray)) or len(embedding) != self.dim:
+            return False
+        if isinstance(embedding, np.ndarray):
+            return bool(np.all(np.isfinite(embedding)) and np.any(embedding))
+        finite = all(isinstance(x, (float, int)) and math.isfinite(x) for x in embedding)
+        return finite and any(embedding)
+
+    def build(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        embedding_key: str = "embedding",
+        id_key: str = "url",
+    ) -> int:
+        """Replace the index contents with ``rows`` and return the number indexed.
+
+        Rows without a valid embedding are skipped. The embedding is stripped from
+        the stored metadata since the matrix already holds it.
+        """
+        ids: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        vectors: List[Sequence[float]] = []
+        skipped = 0
+        for row in rows:
+            embedding = row.get(embedding_key)
+            if not self.is_valid_embedding(embedding):
+                skipped += 1
+                continue
+            ids.append(str(row.get(id_key)))
+            metadata.append({k: v for k, v in row.items() if k != embedding_key})
+            vectors.append(embedding)
+
+        if vectors:
+            matrix = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        else:
+            matrix = np.empty((0, self.dim), dtype=np.float32)
+        self._state = (matrix, ids, metadata)
+
+        if skipped:
+            logger.warning(f"VectorIndex skipped {skipped} rows without a valid embedding")
+        logger.info(f"VectorIndex built with {len(ids)} vectors (dim={self.dim})")
+        return len(ids)
+
+    def build_from_matrix(
+        self,
+        matrix: np.ndarray,
+        ids: Sequence[str],
+        metadata: Optional[Sequence[Dict[str, Any]]] = None,
+        normalized: bool = False,
+    ) -> int:
+        """Replace the index contents with an existing ``(n, dim)`` matrix."""
+        if matrix.ndim != 2 or matrix.shape[1] != self.dim:
+            raise ValueError(f"Expected matrix of shape (n, {self.dim}), got {matrix.shape}")
+        if len(ids) != matrix.shape[0]:
+            raise ValueError("ids must have one entry per matrix row")
+        if metadata is not None and len(metadata) != matrix.shape[0]:
+            raise ValueError("metadata must have one entry per matrix row")
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if not normalized:
+            matrix = normalize_rows(matrix.copy())
+        self._state = (
+            matrix,
+            list(ids),
+            list(metadata) if metadata is not None else [{} for _ in ids],
+        )
+        return len(ids)
+
+    def prepare_query(self, query_embedding: Any) -> np.ndarray:
+        """Convert a query embedding to a normalized float32 vector."""
+        if hasattr(query_embedding, "detach"):  # torch.Tensor
+            query_embedding = query_embedding.detach().cpu().numpy()
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if query.shape[0] != self.dim:
+            raise ValueError(
+                f"Query dimension {query.shape[0]} does not match index dimension {self.dim}"
+            )
+        norm = float(np.linalg.norm(query))
+        return query / norm if norm > 0 else query
+
+    def scores(self, query_embedding: Any) -> np.ndarray:
+        """Cosine similarity of the query against every indexed vector."""
+        return self.matrix @ self.prepare_query(query_embedding)
+
+    def search(self, query_embedding: Any, top_k: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Return the ``top_k`` most similar articles as ``(score, metadata)`` pairs."""
+        matrix, _, metadata = self._state
+        if matrix.shape[0] == 0:
+            return []
+        scores = matrix @ self.prepare_query(query_embedding)
+        return [(float(scores[i]), metadata[i]) for i in top_k_indices(scores, top_k)]
@@ -0,0 +1,121 @@
+"""
+Background warmup for the API process.
+
+Nothing heavy is loaded at import time, so the app starts answering liveness
+probes within a second or two. ``start_warmup()`` (called from the FastAPI
+lifespan) then loads the article index and the shared embedding model on a
+background thread and runs one encode through the embedding pool, so the first
+real query doesn't pay for it. ``readiness()`` reports progress for the
+readiness probe.
+
+With ``WARMUP_MODELS=false`` only the index is loaded; the model is loaded by
+the first request that needs it.
+
+A failed warmup (the database or model host briefly unreachable, say) is
+retried on the same thread, after ``WARMUP_RETRY_SECONDS`` and then doubling
+up to ``WARMUP_RETRY_MAX_SECONDS``, so the process becomes ready once its
+dependencies recover instead of failing its readiness probe until restarted.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODELS: bool = os.getenv("WARMUP_MODELS", "true").lower() == "true"
+WARMUP_RETRY_SECONDS: float = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+WARMUP_RETRY_MAX_SECONDS: float = float(os.getenv("WARMUP_RETRY_MAX_SECONDS", "300"))
+
+_started_at: float = time.time()
+_state: Dict[str, Any] = {
+    "status": "pending",
+    "seconds": None,
+    "error": None,
+    "attempts": 0,
+    "next_retry_seconds": None,
+}
+_thread: Optional[threading.Thread] = None
+_lock = threading.Lock()
+
+
+def warmup(models: bool = WARMUP_MODELS) -> bool:
+    """Load the index and (optionally) the model, recording the outcome.
+
+    Returns whether the attempt succeeded.
+    """
+    from engine.article_index import get_article_index, load_persisted_index
+
+    _state.update(status="warming", next_retry_seconds=None)
+    _state["attempts"] += 1
+    start = time.perf_counter()
+    try:
+        load_persisted_index()
+        get_article_index()
+        if models:
+            from engine.model_registry import get_pool
+
+            get_pool().encode_sync("warmup")
+    except Exception as e:
+        logger.exception(f"Warmup attempt {_state['attempts']} failed")
+        _state.update(status="failed", error=str(e))
+        return False
+    finally:
+        _state["seconds"] = round(time.perf_counter() - start, 2)
+    _state.update(status="ready", error=None)
+    logger.info(f"Warmup finished in {_state['seconds']}s")
+    return True
+
+
+def warmup_until_ready(
+    models: bool = WARMUP_MODELS,
+    retry_seconds: float = WARMUP_RETRY_SECONDS,
+    max_retry_seconds: float = WARMUP_RETRY_MAX_SECONDS,
+) -> None:
+    """Run ``warmup`` until it succeeds, backing off exponentially between attempts."""
+    delay = retry_seconds
+    while not warmup(models):
+        _state["next_retry_seconds"] = delay
+        logger.info(f"Retrying warmup in {delay:.0f}s")
+        time.sleep(delay)
+        delay = min(delay * 2, max_retry_seconds)
+
+
+def start_warmup(models: bool = WARMUP_MODELS) -> threading.Thread:
+    """Run ``warmup_until_ready`` on a daemon thread once per process."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(
+                target=warmup_until_ready, args=(models,), name="warmup", daemon=True
+            )
+            _thread.start()
+        return _thread
+
+
+def uptime_seconds() -> float:
+    return round(time.time() - _started_at, 2)
+
+
+def readiness() -> Dict[str, Any]:
+    """Warmup status plus the models and articles loaded so far."""
+    from engine.article_store import get_article_store
+    from engine.corpus_version import corpus_versions
+    from engine.fragment_cache import fragment_cache
+    from engine.model_registry import memory_report
+
+    return {
+        "ready": _state["status"] == "ready",
+        "status": _state["status"],
+        "warmup_seconds": _state["seconds"],
+        "error": _state["error"],
+        "attempts": _state["attempts"],
+        "next_retry_seconds": _state["next_retry_seconds"],
+        "models": memory_report(),
+        "article_store": get_article_store().stats(),
+        "fragment_cache": fragment_cache.stats(),
+        "corpus_versions": corpus_versions.stats(),
+        "uptime_seconds": uptime_seconds(),
+    }
@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for multi-worker deployments.
+
+``uvicorn --workers N`` spawns fresh interpreters, so every worker loads its own
+copy of the embedding models. Here the app is imported once in the master
+(``preload_app``), the shared model from ``engine.model_registry`` is loaded
+there (models are otherwise loaded on first use), and workers are forked from
+it, sharing the model weights copy-on-write. Set ``PRELOAD_MODELS=false`` to
+skip the load in the master.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+preload_models = os.getenv("PRELOAD_MODELS", "true").lower() == "true"
+
+
+def when_ready(server):
+    if preload_models:
+        from engine.model_registry import get_model
+
+        get_model()
+    # Objects created during preload are moved to the permanent generation so
+    # garbage collections in the workers don't write to (and un-share) them.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Split the cores between workers instead of every worker's torch pool
+    # trying to use all of them.
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, multiprocessing.cpu_count() // workers))
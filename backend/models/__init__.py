@@ -7,7 +7,7 @@ For new code, import directly from specific submodules for better clarity.
 
 # Core domain models
 from .core import (
-    Article, ArticleResponse, ArticleCategory, ArticleSource, User,
+    Article, ArticlePage, ArticleResponse, ArticleCategory, ArticleSource, User,
     BaseEntity, BaseResponse, PaginationParams, SortParams, FilterParams
 )
 
@@ -33,7 +33,9 @@ from .system import (
 )
 
 # Scraping models
-from .scraping import ScraperConfig, ScrapedArticle, ScraperResult
+from .scraping import (
+    ScraperConfig, ScrapedArticle, ScraperResult, ScrapeRunReport, SourceRunResult
+)
 
 # Event models (future)
 # from .events import ...
@@ -41,6 +43,7 @@ from .scraping import ScraperConfig, ScrapedArticle, ScraperResult
 __all__ = [
     # Core models
     "Article",
+    "ArticlePage",
     "ArticleResponse",
     "ArticleCategory", 
     "ArticleSource",
@@ -87,5 +90,7 @@ __all__ = [
     # Scraping models
     "ScraperConfig",
     "ScrapedArticle", 
-    "ScraperResult"
+    "ScraperResult",
+    "ScrapeRunReport",
+    "SourceRunResult"
 ] 
\ No newline at end of file
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from enum import Enum
-from .article import ArticleResponse
+from ..core.article import ArticleResponse
 
 
 class SortOrder(str, Enum):
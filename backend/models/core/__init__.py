@@ -4,12 +4,13 @@ Core domain models for the application.
 This module contains the fundamental business entities and domain models.
 """
 
-from .article import Article, ArticleResponse, ArticleCategory, ArticleSource
+from .article import Article, ArticlePage, ArticleResponse, ArticleCategory, ArticleSource
 from .user import User
 from .base import BaseEntity, BaseResponse, PaginationParams, SortParams, FilterParams
 
 __all__ = [
     "Article",
+    "ArticlePage",
     "ArticleResponse", 
     "ArticleCategory",
     "ArticleSource",
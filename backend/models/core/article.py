@@ -56,4 +56,14 @@ class ArticleResponse(BaseModel):
     source: str
     tags: List[str] = Field(default_factory=list)
     category: str
-    summary: Optional[str] = None 
\ No newline at end of file
+    summary: Optional[str] = None 
+
+
+class ArticlePage(BaseModel):
+    """
+    One page of an article listing with keyset cursors.
+    """
+    data: List[ArticleResponse] = Field(default_factory=list)
+    limit: int
+    next_cursor: Optional[str] = Field(None, description="Pass as `after` for the next page")
+    prev_cursor: Optional[str] = Field(None, description="Pass as `before` for the previous page")
@@ -32,15 +32,12 @@ class BaseResponse(BaseModel):
 
 
 class PaginationParams(BaseModel):
-    """Common pagination parameters."""
+    """Keyset pagination over listings ordered by (published_date, id)."""
     
-    page: int = Field(1, ge=1, description="Page number")
-    limit: int = Field(10, ge=1, le=100, description="Items per page")
-    
-    @property
-    def offset(self) -> int:
-        """Calculate offset for database queries."""
-        return (self.page - 1) * self.limit
+    limit: int = Field(20, ge=1, le=100, description="Items per page")
+    after: Optional[str] = Field(None, description="Cursor: return items after this one")
+    before: Optional[str] = Field(None, description="Cursor: return items before this one")
+    sort: str = Field("latest", pattern="^(latest|oldest)$", description="Sort order")
 
 
 class SortParams(BaseModel):
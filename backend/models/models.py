@@ -8,7 +8,7 @@ from the specific submodules.
 
 # Core domain models
 from .core import (
-    Article, ArticleResponse, ArticleCategory, ArticleSource, User,
+    Article, ArticlePage, ArticleResponse, ArticleCategory, ArticleSource, User,
     BaseEntity, BaseResponse, PaginationParams, SortParams, FilterParams
 )
 
@@ -34,12 +34,15 @@ from .system import (
 )
 
 # Scraping models
-from .scraping import ScraperConfig, ScrapedArticle, ScraperResult
+from .scraping import (
+    ScraperConfig, ScrapedArticle, ScraperResult, ScrapeRunReport, SourceRunResult
+)
 
 # For backward compatibility, export all models
 __all__ = [
     # Core models
     "Article",
+    "ArticlePage",
     "ArticleResponse",
     "ArticleCategory", 
     "ArticleSource",
@@ -86,5 +89,7 @@ __all__ = [
     # Scraping models
     "ScraperConfig",
     "ScrapedArticle", 
-    "ScraperResult"
+    "ScraperResult",
+    "ScrapeRunReport",
+    "SourceRunResult"
 ]
\ No newline at end of file
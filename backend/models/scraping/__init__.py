@@ -4,10 +4,18 @@ Content scraping models.
 This module contains models for web scraping, content processing, and data extraction.
 """
 
-from .scraper import ScraperConfig, ScrapedArticle, ScraperResult
+from .scraper import (
+    ScraperConfig,
+    ScrapedArticle,
+    ScraperResult,
+    ScrapeRunReport,
+    SourceRunResult,
+)
 
 __all__ = [
     "ScraperConfig",
     "ScrapedArticle",
-    "ScraperResult"
+    "ScraperResult",
+    "ScrapeRunReport",
+    "SourceRunResult"
 ] 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -31,4 +31,29 @@ class ScraperResult(BaseModel):
     articles: List[ScrapedArticle] = Field(default_factory=list)
     source: str
     success: bool
-    error: Optional[str] = None 
\ No newline at end of file
+    error: Optional[str] = None 
+class SourceRunResult(BaseModel):
+    """
+    Outcome of one source within a scrape-all run.
+    """
+    source: str
+    status: Literal["ok", "failed", "timeout"]
+    wall_seconds: float
+    scraped: int = 0
+    saved: int = 0
+    updated: int = 0
+    error: Optional[str] = None
+
+class ScrapeRunReport(BaseModel):
+    """
+    Aggregate report of a scrape-all run.
+    """
+    started_at: datetime
+    wall_seconds: float
+    concurrency: int
+    timeout_seconds: float
+    succeeded: int
+    failed: int
+    # What the same run would take one source at a time.
+    serial_seconds: float
+    sources: List[SourceRunResult] = Field(default_factory=list)
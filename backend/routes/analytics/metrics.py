@@ -1,11 +1,12 @@
 from collections import defaultdict
 from typing import List, Dict, Any, Tuple, Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import JSONResponse
 from db.supabase_client import supabase
+from engine.article_store import ArticleColumns, get_article_store
+from engine.corpus_version import corpus_versions, etag
 from logging_config import logger
-from ..utils.retry import with_backoff
-from pydantic import ValidationError
+from routes.utils.conditional import cached, not_modified
 
 
 class AnalyticsController:
@@ -14,79 +15,67 @@ class AnalyticsController:
         self.register_routes()
 
     @staticmethod
-    @with_backoff(max_retries=3, backoff_factor=0.5)
-    def fetch_articles() -> Dict[str, Any]:
-        """Fetch all articles from Supabase."""
-        logger.info("🔄 Fetching all articles from Supabase")
-        return supabase.table("articles").select("*").order("published_date", desc=True).execute()
+    def fetch_articles() -> ArticleColumns:
+        """The current snapshot of the in-process article store."""
+        return get_article_store().snapshot()
 
     @staticmethod
-    @with_backoff(max_retries=3, backoff_factor=0.5)
-    def fetch_categories() -> Dict[str, Any]:
-        """Fetch article categories from Supabase."""
-        logger.info("🔄 Fetching article categories from Supabase")
-        return supabase.table("articles").select("category").execute()
+    def likes_etag(columns: ArticleColumns) -> str:
+        """Like rankings depend on the likes and on the articles they point at."""
+        return etag("likes", corpus_versions.token("likes"), columns.token)
 
     def register_routes(self) -> None:
         """Register all analytics routes."""
         @self.router.get("/blogs-by-source/{limit}")
-        def blogs_by_source(limit: int = 25) -> JSONResponse:
+        def blogs_by_source(request: Request, limit: int = 25) -> Response:
             """Get blogs grouped by source with counts."""
             logger.info(f"📊 Start: blogs-by-source | limit={limit}")
             try:
-                response: Dict[str, Any] = self.fetch_articles()
+                columns = self.fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching articles for source count")
                 raise HTTPException(status_code=500, detail=str(e))
 
-            articles: List[Dict[str, Any]] = response.data or []
-            if not isinstance(articles, list):
-                logger.error(f"Expected list for articles, got {type(articles)}: {articles}")
-                raise HTTPException(status_code=500, detail="Internal error: articles data is not a list")
-            source_count: Dict[str, int] = defaultdict(int)
-            for article in articles:
-                if not isinstance(article, dict):
-                    logger.error(f"Expected dict for article, got {type(article)}: {article}")
-                    continue
-                source: str = article.get("source", "Unknown")
-                source_count[source] += 1
+            current = etag("articles", columns.token)
+            unchanged = not_modified(request, current, "counts")
+            if unchanged is not None:
+                return unchanged
 
-            sorted_sources: List[Tuple[str, int]] = sorted(source_count.items(), key=lambda x: x[1], reverse=True)
+            sorted_sources: List[Tuple[str, int]] = columns.source_counts()
             logger.info(f"SUCCESS Top sources: {sorted_sources[:limit]}")
 
-            return JSONResponse(
-                content={"sources": sorted_sources[:limit]},
-                headers={"Cache-Control": "public, max-age=600"}
-            )
+            return cached(JSONResponse(content={"sources": sorted_sources[:limit]}), current, "counts")
 
         @self.router.get("/category-count")
-        def get_article_count_by_category() -> JSONResponse:
+        def get_article_count_by_category(request: Request) -> Response:
             """Get article count by category."""
             logger.info("📊 Start: category-count")
             try:
-                result: Dict[str, Any] = self.fetch_categories()
+                columns = self.fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching categories")
                 raise HTTPException(status_code=500, detail=str(e))
 
-            category_counts: Dict[str, int] = defaultdict(int)
-            for row in result.data or []:
-                category: str = row.get("category") or "Unknown"
-                category_counts[category] += 1
+            current = etag("articles", columns.token)
+            unchanged = not_modified(request, current, "counts")
+            if unchanged is not None:
+                return unchanged
 
-            sorted_categories: List[Tuple[str, int]] = sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
+            sorted_categories: List[Tuple[str, int]] = columns.category_counts()
             logger.info(f"SUCCESS Category counts: {sorted_categories}")
 
-            return JSONResponse(
-                content={"categories": sorted_categories},
-                headers={"Cache-Control": "public, max-age=600"}
-            )
+            return cached(JSONResponse(content={"categories": sorted_categories}), current, "counts")
 
         @self.router.get("/top-liked-articles")
-        def top_liked_articles() -> JSONResponse:
+        def top_liked_articles(request: Request) -> Response:
             """Return the top 3 most liked articles."""
             logger.info("📊 Start: top-liked-articles")
             try:
+                columns = self.fetch_articles()
+                current = self.likes_etag(columns)
+                unchanged = not_modified(request, current, "likes")
+                if unchanged is not None:
+                    return unchanged
                 # Get all likes where liked is True
                 likes_response: Dict[str, Any] = supabase.table("likes").select("article_url").eq("liked", True).execute()
                 article_like_counts: Dict[str, int] = defaultdict(int)
@@ -96,32 +85,34 @@ class AnalyticsController:
                         article_like_counts[article_url] += 1
                 # Get top 3 article URLs
                 top_articles: List[Tuple[str, int]] = sorted(article_like_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-                # Fetch article details
+                # Article details come from the in-process store
                 articles: List[Dict[str, Any]] = []
-                errors = []
                 for url, count in top_articles:
-                    article_resp: Dict[str, Any] = supabase.table("articles").select("title, url, summary, source, category, published_date").eq("url", url).single().execute()
-                    if article_resp.data:
-                        article: Dict[str, Any] = article_resp.data
+                    position: Optional[int] = columns.find_url(url)
+                    if position is not None:
+                        record: Dict[str, Any] = columns.record(position)
+                        article: Dict[str, Any] = {
+                            key: record[key]
+                            for key in ("title", "url", "summary", "source", "category", "published_date")
+                        }
                         article["like_count"] = count
-                        try:
-                            articles.append(article)
-                        except ValidationError as ve:
-                            logger.error(f"Validation error for top liked article: {article} | {ve}")
-                            errors.append({"article": article, "error": str(ve)})
-                if errors:
-                    logger.warning(f"Some top liked articles could not be validated: {errors}")
+                        articles.append(article)
                 logger.info(f"SUCCESS Top liked articles: {articles}")
-                return JSONResponse(content={"top_liked_articles": articles}, headers={"Cache-Control": "public, max-age=600"})
+                return cached(JSONResponse(content={"top_liked_articles": articles}), current, "likes")
             except Exception as e:
                 logger.exception("ERROR fetching top liked articles")
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.router.get("/top-liked-categories")
-        def top_liked_categories() -> JSONResponse:
+        def top_liked_categories(request: Request) -> Response:
             """Return the top 3 most liked categories (by sum of likes on articles in that category)."""
             logger.info("📊 Start: top-liked-categories")
             try:
+                columns = self.fetch_articles()
+                current = self.likes_etag(columns)
+                unchanged = not_modified(request, current, "likes")
+                if unchanged is not None:
+                    return unchanged
                 # Get all likes where liked is True
                 likes_response: Dict[str, Any] = supabase.table("likes").select("article_url").eq("liked", True).execute()
                 article_like_counts: Dict[str, int] = defaultdict(int)
@@ -132,14 +123,16 @@ class AnalyticsController:
                 # Map article_url to category
                 category_like_counts: Dict[str, int] = defaultdict(int)
                 for url, count in article_like_counts.items():
-                    article_resp: Dict[str, Any] = supabase.table("articles").select("category").eq("url", url).single().execute()
-                    category: Optional[str] = article_resp.data.get("category") if article_resp.data else None
+                    position: Optional[int] = columns.find_url(url)
+                    category: Optional[str] = (
+                        columns.categories[columns.category_codes[position]] if position is not None else None
+                    )
                     if category:
                         category_like_counts[category] += count
                 # Get top 3 categories
                 top_categories: List[Tuple[str, int]] = sorted(category_like_counts.items(), key=lambda x: x[1], reverse=True)[:3]
                 logger.info(f"SUCCESS Top liked categories: {top_categories}")
-                return JSONResponse(content={"top_liked_categories": top_categories}, headers={"Cache-Control": "public, max-age=600"})
+                return cached(JSONResponse(content={"top_liked_categories": top_categories}), current, "likes")
             except Exception as e:
                 logger.exception("ERROR fetching top liked categories")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -6,7 +6,7 @@ This module contains routes for articles, search, and recommendations.
 
 from .articles import ArticlesController
 from .search import SearchController
-from .recommendations import RecommendationController
+from .recommendations import RecommendController as RecommendationController
 
 __all__ = [
     "ArticlesController",
@@ -1,13 +1,17 @@
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Query, HTTPException, Path
-from db.supabase_client import supabase
+from typing import List, Optional, Dict, Tuple
+from fastapi import APIRouter, Depends, Query, HTTPException, Path, Request, Response
+import numpy as np
+from engine.article_store import ArticleColumns, get_article_store
+from engine.corpus_version import etag
+from engine.fragment_cache import fragment_cache, json_array
 from logging_config import logger
-from ..utils.retry import with_backoff
-from collections import defaultdict
-from pydantic import ValidationError
-from models.article import ArticleResponse, ArticleCategory, ArticleSource
+from models.core.article import ArticlePage, ArticleResponse, ArticleCategory, ArticleSource
+from models.core.base import PaginationParams
 from models.analytics import TagCount
-from models.recommendation import SortOrder
+from routes.utils.conditional import cached, not_modified
+from routes.utils.fields import article_fields
+from routes.utils.pagination import pagination_params
+from routes.utils.responses import OrjsonResponse, data_response, trusted_articles
 
 
 class ArticlesController:
@@ -20,56 +24,64 @@ class ArticlesController:
         
         @self.router.get(
             "/",
-            response_model=List[ArticleResponse],
+            response_model=ArticlePage,
             summary="Get All Articles",
             description="""
-            Retrieve all articles from the database with comprehensive metadata.
+            Retrieve articles from the database with comprehensive metadata, one page at a time.
             
-            This endpoint returns all available articles sorted by publication date (newest first).
+            This endpoint returns articles sorted by publication date (newest first).
             Each article includes full metadata including title, URL, content, source, tags, 
             category, and publication date.
             
             **Features:**
-            - Returns all articles with complete metadata
+            - Returns articles with complete metadata
             - Automatic sorting by publication date (newest first)
             - Comprehensive article information including tags and categories
-            - Handles validation errors gracefully
-            - Supports pagination through database-level ordering
+            - Articles are validated once when loaded, not on every request
+            - Keyset pagination: pass `next_cursor` as `after` (or `prev_cursor` as `before`)
+            - Sparse fieldsets: `fields=title,source,published_date` returns only those fields
+            
+            **Example Usage:**
+            ```
+            GET /articles/?limit=20
+            GET /articles/?limit=20&after=<next_cursor>
+            GET /articles/?sort=oldest&before=<prev_cursor>
+            ```
             
             **Response Format:**
-            Returns a list of articles with full metadata including:
+            Returns a page with `data`, `limit`, `next_cursor` and `prev_cursor`; each article includes:
             - Article title and URL
             - Publication date and source
             - Content summary and full text
             - Tags and category classification
             - Source attribution and metadata
             """,
-            response_description="List of all articles with complete metadata",
+            response_description="One page of articles with complete metadata",
             tags=["Articles"]
         )
-        def get_all_articles() -> List[ArticleResponse]:
-            """Get all articles from the database."""
-            logger.info("Fetching all articles")
+        def get_all_articles(
+            request: Request,
+            page: PaginationParams = Depends(pagination_params),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
+            """Get a page of articles from the database."""
+            logger.info(f"Fetching articles (limit={page.limit}, sort='{page.sort}')")
             try:
-                response: Dict[str, Any] = supabase.table("articles").select("*").order("published_date", desc=True).execute()
-                articles = []
-                errors = []
-                for article in response.data:
-                    try:
-                        articles.append(ArticleResponse(**article))
-                    except ValidationError as ve:
-                        logger.error(f"Validation error for article: {article} | {ve}")
-                        errors.append({"article": article, "error": str(ve)})
-                if errors:
-                    logger.warning(f"Some articles could not be validated: {errors}")
-                return articles
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching all articles")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "articles")
+            if unchanged is not None:
+                return unchanged
+
+            return cached(self._to_page(columns, columns.select(), page, fields), current, "articles")
+
         @self.router.get(
             "/tags/{tag}",
-            response_model=List[ArticleResponse],
+            response_model=ArticlePage,
             summary="Get Articles by Tag",
             description="""
             Retrieve articles filtered by a specific tag with optional sorting.
@@ -93,52 +105,44 @@ class ArticlesController:
             Common tags include: machine-learning, python, javascript, architecture, 
             scalability, microservices, database, frontend, backend, devops, etc.
             """,
-            response_description="List of articles matching the specified tag",
+            response_description="One page of articles matching the specified tag",
             tags=["Articles"]
         )
         def get_articles_by_tag(
+            request: Request,
             tag: str = Path(..., description="Tag to filter articles by", example="machine-learning"),
-            sort: str = Query("latest", pattern="^(latest|oldest)$", description="Sort order for results")
-        ) -> List[ArticleResponse]:
+            page: PaginationParams = Depends(pagination_params),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """Get articles filtered by a specific tag."""
-            logger.info(f"Fetching articles by tag: '{tag}' with sort='{sort}'")
+            logger.info(f"Fetching articles by tag: '{tag}' with sort='{page.sort}'")
             tag = tag.lower()
             try:
-                response: Dict[str, Any] = self._fetch_articles()
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching articles by tag")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
-            filtered: List[Dict[str, Any]] = [
-                a for a in response.data
-                if a.get("tags") and any(tag in t.lower() for t in a["tags"])
-            ]
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "articles")
+            if unchanged is not None:
+                return unchanged
 
-            sorted_articles: List[Dict[str, Any]] = self._sort_articles(filtered, sort)
-            articles = []
-            errors = []
-            for article in sorted_articles:
-                try:
-                    articles.append(ArticleResponse(**article))
-                except ValidationError as ve:
-                    logger.error(f"Validation error for article: {article} | {ve}")
-                    errors.append({"article": article, "error": str(ve)})
-            if errors:
-                logger.warning(f"Some articles by tag could not be validated: {errors}")
-            return articles
+            return cached(self._to_page(columns, columns.by_tags([tag]), page, fields), current, "articles")
 
         @self.router.get(
             "/filter",
-            response_model=List[ArticleResponse],
+            response_model=ArticlePage,
             summary="Filter Articles by Multiple Tags",
             description="""
             Filter articles by multiple tags with advanced matching logic.
             
             This endpoint allows filtering articles by multiple tags simultaneously.
-            Articles must match at least one of the provided tags to be included in results.
+            By default articles must match at least one of the provided tags; with
+            `match=all` they must match every one.
             
             **Features:**
-            - Multi-tag filtering with OR logic
+            - Multi-tag filtering with OR (default) or AND logic
             - Case-insensitive tag matching
             - Optional sorting by publication date
             - Support for partial tag matching
@@ -148,53 +152,43 @@ class ArticlesController:
             ```
             GET /articles/filter?tags=machine-learning&tags=python&sort=latest
             GET /articles/filter?tags=architecture&tags=scalability&sort=oldest
+            GET /articles/filter?tags=kafka&tags=streaming&match=all
             ```
             
             **Filtering Logic:**
-            - Articles matching ANY of the provided tags are returned
+            - Articles matching ANY (or, with `match=all`, ALL) of the provided tags are returned
             - Tags are matched case-insensitively
             - Partial matches are supported
             - Results are sorted by publication date
             """,
-            response_description="List of articles matching any of the specified tags",
+            response_description="One page of articles matching the specified tags",
             tags=["Articles"]
         )
         def filter_articles_by_tag(
+            request: Request,
             tags: Optional[List[str]] = Query(None, description="List of tags to filter by"),
-            sort: str = Query("latest", pattern="^(latest|oldest)$", description="Sort order for results")
-        ) -> List[ArticleResponse]:
+            match: str = Query("any", pattern="^(any|all)$", description="Match any or all of the tags"),
+            page: PaginationParams = Depends(pagination_params),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """Filter articles by multiple tags."""
             if not tags:
                 raise HTTPException(status_code=400, detail="No tags provided")
 
             tags = [tag.lower() for tag in tags]
-            logger.info(f"🔍 Filtering by tags: {tags} with sort='{sort}'")
+            logger.info(f"🔍 Filtering by tags: {tags} with sort='{page.sort}'")
             try:
-                response: Dict[str, Any] = self._fetch_articles()
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR filtering articles by tag")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
-            filtered: List[Dict[str, Any]] = [
-                a for a in response.data
-                if a.get("tags") and any(
-                    any(query_tag in tag.lower() for tag in a["tags"])
-                    for query_tag in tags
-                )
-            ]
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "articles")
+            if unchanged is not None:
+                return unchanged
 
-            sorted_articles: List[Dict[str, Any]] = self._sort_articles(filtered, sort)
-            articles = []
-            errors = []
-            for article in sorted_articles:
-                try:
-                    articles.append(ArticleResponse(**article))
-                except ValidationError as ve:
-                    logger.error(f"Validation error for article: {article} | {ve}")
-                    errors.append({"article": article, "error": str(ve)})
-            if errors:
-                logger.warning(f"Some filtered articles could not be validated: {errors}")
-            return articles
+            return cached(self._to_page(columns, columns.by_tags(tags, match=match), page, fields), current, "articles")
 
         @self.router.get(
             "/all-tags",
@@ -230,26 +224,26 @@ class ArticlesController:
             response_description="List of all tags with their usage counts",
             tags=["Articles"]
         )
-        def get_all_tags() -> List[TagCount]:
+        def get_all_tags(request: Request) -> Response:
             """Get all tags with their counts."""
             logger.info("Fetching all tags")
             try:
-                response: Dict[str, Any] = self._fetch_tags()
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching all tags")
                 raise HTTPException(status_code=500, detail=str(e))
 
-            tag_counter: Dict[str, int] = defaultdict(int)
-            for row in response.data:
-                for tag in row.get("tags", []):
-                    tag_counter[tag.lower()] += 1
+            current = self._etag(columns)
+            unchanged = not_modified(request, current, "counts")
+            if unchanged is not None:
+                return unchanged
 
-            sorted_tags: List[tuple] = sorted(tag_counter.items(), key=lambda x: -x[1])
-            return [TagCount(tag=tag, count=count) for tag, count in sorted_tags]
+            counts = [{"tag": tag, "count": count} for tag, count in columns.tag_counts()]
+            return cached(OrjsonResponse(counts), current, "counts")
 
         @self.router.get(
             "/by-category/{category}",
-            response_model=List[ArticleResponse],
+            response_model=ArticlePage,
             summary="Get Articles by Category",
             description="""
             Retrieve articles filtered by category with optional sorting.
@@ -282,38 +276,34 @@ class ArticlesController:
             GET /articles/by-category/machine-learning?sort=oldest
             ```
             """,
-            response_description="List of articles in the specified category",
+            response_description="One page of articles in the specified category",
             tags=["Articles"]
         )
         def get_by_category(
+            request: Request,
             category: str = Path(..., description="Category to filter by", example="architecture"),
-            sort: str = Query("latest", pattern="^(latest|oldest)$", description="Sort order for results")
-        ) -> List[ArticleResponse]:
+            page: PaginationParams = Depends(pagination_params),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """Get articles by category."""
             category = category[0].upper() + category[1:].lower()
             logger.info(f"Fetching articles by category: '{category}'")
             try:
-                response: Dict[str, Any] = supabase.table("articles").select("*").eq("category", category).execute()
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching by category")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
-            sorted_articles: List[Dict[str, Any]] = self._sort_articles(response.data, sort)
-            articles = []
-            errors = []
-            for article in sorted_articles:
-                try:
-                    articles.append(ArticleResponse(**article))
-                except ValidationError as ve:
-                    logger.error(f"Validation error for article: {article} | {ve}")
-                    errors.append({"article": article, "error": str(ve)})
-            if errors:
-                logger.warning(f"Some articles by category could not be validated: {errors}")
-            return articles
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "articles")
+            if unchanged is not None:
+                return unchanged
+
+            return cached(self._to_page(columns, columns.select(category=category), page, fields), current, "articles")
 
         @self.router.get(
             "/by-source/{source}",
-            response_model=List[ArticleResponse],
+            response_model=ArticlePage,
             summary="Get Articles by Source",
             description="""
             Retrieve articles from a specific source with optional sorting.
@@ -346,13 +336,15 @@ class ArticlesController:
             GET /articles/by-source/airbnb?sort=oldest
             ```
             """,
-            response_description="List of articles from the specified source",
+            response_description="One page of articles from the specified source",
             tags=["Articles"]
         )
         def get_by_source(
+            request: Request,
             source: str = Path(..., description="Source to filter by", example="netflix"),
-            sort: str = Query("latest", pattern="^(latest|oldest)$", description="Sort order for results")
-        ) -> List[ArticleResponse]:
+            page: PaginationParams = Depends(pagination_params),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """Get articles by source."""
             source = source.lower()
             source_mapping: Dict[str, str] = {
@@ -366,23 +358,17 @@ class ArticlesController:
 
             logger.info(f"Fetching by source: '{source}'")
             try:
-                response: Dict[str, Any] = supabase.table("articles").select("*").eq("source", source).execute()
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching by source")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
-            sorted_articles: List[Dict[str, Any]] = self._sort_articles(response.data, sort)
-            articles = []
-            errors = []
-            for article in sorted_articles:
-                try:
-                    articles.append(ArticleResponse(**article))
-                except ValidationError as ve:
-                    logger.error(f"Validation error for article: {article} | {ve}")
-                    errors.append({"article": article, "error": str(ve)})
-            if errors:
-                logger.warning(f"Some articles by source could not be validated: {errors}")
-            return articles
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "articles")
+            if unchanged is not None:
+                return unchanged
+
+            return cached(self._to_page(columns, columns.select(source=source), page, fields), current, "articles")
 
         @self.router.get(
             "/{article_id}",
@@ -397,7 +383,7 @@ class ArticlesController:
             **Features:**
             - Single article retrieval by ID
             - Complete article metadata and content
-            - Validation of article data structure
+            - Article data validated once when loaded into the store
             - Error handling for missing articles
             
             **Response Format:**
@@ -410,42 +396,67 @@ class ArticlesController:
             
             **Error Handling:**
             - Returns 404 if article not found
-            - Returns 500 for validation or database errors
+            - Returns 500 for database errors
             - Logs detailed error information for debugging
             """,
             response_description="Complete article data for the specified ID",
             tags=["Articles"]
         )
         def get_article(
-            article_id: str = Path(..., description="Unique article identifier", example="article-123")
-        ) -> ArticleResponse:
+            request: Request,
+            article_id: str = Path(..., description="Unique article identifier", example="article-123"),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """Get a single article by ID."""
             logger.info(f"Fetching single article with id: {article_id}")
             try:
-                response: Dict[str, Any] = supabase.table("articles").select("*").eq("id", article_id).single().execute()
-                try:
-                    return ArticleResponse(**response.data)
-                except ValidationError as ve:
-                    logger.error(f"Validation error for article id {article_id}: {response.data} | {ve}")
-                    raise HTTPException(status_code=500, detail=f"Validation error: {ve}")
+                columns = self._fetch_articles()
             except Exception as e:
                 logger.exception("ERROR fetching article")
                 raise HTTPException(status_code=500, detail=f"Internal error: {e}")
 
-    @with_backoff()
-    def _fetch_articles(self) -> Dict[str, Any]:
-        """Fetch all articles from the database."""
-        return supabase.table("articles").select("*").execute()
+            position: Optional[int] = columns.find(article_id)
+            if position is None:
+                raise HTTPException(status_code=404, detail=f"Article '{article_id}' not found")
+
+            current = self._etag(columns, fields)
+            unchanged = not_modified(request, current, "article")
+            if unchanged is not None:
+                return unchanged
+
+            fragment = fragment_cache.fragments(
+                columns, [position], fields, prepare=trusted_articles
+            )[0]
+            return cached(Response(fragment, media_type="application/json"), current, "article")
+
+    def _fetch_articles(self) -> ArticleColumns:
+        """The current snapshot of the in-process article store."""
+        return get_article_store().snapshot()
 
-    @with_backoff()
-    def _fetch_tags(self) -> Dict[str, Any]:
-        """Fetch all tags from the database."""
-        return supabase.table("articles").select("tags").execute()
+    def _etag(self, columns: ArticleColumns, fields: Tuple[str, ...] = ()) -> str:
+        """Strong ETag for an article representation served from this snapshot."""
+        return etag("articles", columns.token, *fields)
 
-    def _sort_articles(self, articles: List[Dict[str, Any]], sort_order: str) -> List[Dict[str, Any]]:
-        """Sort articles by published date."""
-        return sorted(
-            articles,
-            key=lambda a: a.get("published_date", ""),
-            reverse=(sort_order == SortOrder.LATEST)
+    def _to_page(
+        self,
+        columns: ArticleColumns,
+        positions: np.ndarray,
+        page: PaginationParams,
+        fields: Tuple[str, ...],
+    ) -> Response:
+        """Cut one keyset page out of the selected rows (newest-first positions)."""
+        try:
+            chunk, next_cursor, prev_cursor = columns.page(
+                positions, page.limit, after=page.after, before=page.before, order=page.sort
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Rows were validated when the store loaded them; the page body is
+        # their cached JSON fragments joined into an array.
+        fragments = fragment_cache.fragments(columns, chunk, fields, prepare=trusted_articles)
+        return data_response(
+            json_array(fragments),
+            limit=page.limit,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
         )
@@ -1,11 +1,11 @@
-from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Query, HTTPException
+from typing import List, Dict, Any, Optional, Tuple
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
 from engine.recommender import recommend_articles
 from logging_config import logger
-from .utils.retry import with_backoff
-from models.recommendation import RecommendationRequest, RecommendationResponse
-from models.article import ArticleResponse
-from pydantic import ValidationError
+from ..utils.fields import article_fields
+from ..utils.retry import with_backoff
+from ..utils.responses import OrjsonResponse, trusted_articles
+from models.api.recommendation import RecommendationRequest, RecommendationResponse
 
 
 class RecommendController:
@@ -66,8 +66,9 @@ class RecommendController:
             user_id: Optional[str] = Query(
                 None, 
                 description="User ID for personalized recommendations"
-            )
-        ) -> RecommendationResponse:
+            ),
+            fields: Tuple[str, ...] = Depends(article_fields)
+        ) -> Response:
             """
             Get personalized article recommendations.
             
@@ -78,6 +79,7 @@ class RecommendController:
             - `query`: Natural language description of what you're looking for
             - `top_k`: Number of recommendations (1-50, default: 5)
             - `user_id`: Optional user ID for personalization
+            - `fields`: Optional comma-separated subset of article fields to return
             
             **Example Usage:**
             ```
@@ -106,7 +108,6 @@ class RecommendController:
             **Error Scenarios:**
             - Returns empty list if no recommendations found
             - Handles embedding failures gracefully
-            - Logs validation errors for debugging
             - Provides fallback recommendations for new users
             """
             logger.info(f"Incoming recommendation request | query='{query}', user_id={user_id}")
@@ -114,20 +115,15 @@ class RecommendController:
             try:
                 results: List[Dict[str, Any]] = self.get_recommendation_results(query, top_k, user_id)
                 logger.info(f"SUCCESS Returning {len(results)} recommendations")
-                articles = []
-                errors = []
-                for article in results:
-                    try:
-                        articles.append(ArticleResponse(**article))
-                    except ValidationError as ve:
-                        logger.error(f"Validation error for article: {article} | {ve}")
-                        errors.append({"article": article, "error": str(ve)})
-                if errors:
-                    logger.warning(f"Some articles could not be validated: {errors}")
-                return RecommendationResponse(articles=articles, error=(f"{len(errors)} articles failed validation" if errors else None))
+                # Results come from store rows validated on load; serialize them as they are.
+                articles = [
+                    {field: article[field] for field in fields}
+                    for article in trusted_articles(results)
+                ]
+                return OrjsonResponse({"articles": articles, "error": None})
             except Exception as e:
                 logger.exception("ERROR generating recommendations after retries")
-                return RecommendationResponse(error=f"Internal error: {e}")
+                return OrjsonResponse(RecommendationResponse(error=f"Internal error: {e}").model_dump(mode="json"))
 
     @with_backoff()
     def get_recommendation_results(self, query: str, top_k: int, user_id: Optional[str]) -> List[Dict[str, Any]]:
@@ -1,47 +1,37 @@
 # backend/routes/search_controller.py
 
-from typing import List, Dict, Any, Tuple, Optional
-from fastapi import APIRouter, Query, HTTPException
-from sentence_transformers import util
-from db.supabase_client import supabase
-from ..utils.embedding_utils import safe_encode, semantic_model
+from typing import List, Dict, Any, Tuple, Optional, Union
+from fastapi import APIRouter, Depends, Query, HTTPException, Response
+from starlette.concurrency import run_in_threadpool
+from engine.article_index import get_article_index
+from engine.embedding_pool import EncoderSaturated
+from ..utils.embedding_utils import safe_encode_async
 from logging_config import logger
+from ..utils.fields import SEARCH_FIELDS, search_fields
+from ..utils.responses import OrjsonResponse
 from ..utils.retry import with_backoff
-from models.search import SearchResult, SearchResponse
+from models.api.search import SearchResult, SearchResponse
 from pydantic import ValidationError
 
 
 class SearchController:
     def __init__(self) -> None:
         self.router = APIRouter()
-        self.router.add_api_route("/articles", self.search_articles, methods=["GET"])
+        self.router.add_api_route(
+            "/articles", self.search_articles, methods=["GET"], response_model=SearchResponse
+        )
 
     @with_backoff()
-    def fetch_ranked_articles(self, query_embedding: List[float]) -> List[SearchResult]:
+    def fetch_ranked_articles(self, query_embedding: List[float], top_k: int = 10) -> List[SearchResult]:
         """Fetch and rank articles based on query embedding."""
-        response: Dict[str, Any] = (
-            supabase
-            .table("articles")
-            .select("*")
-            .order("published_date", desc=True)
-            .execute()
-        )
-        logger.info("SUCCESS Retrieved articles from Supabase")
+        index = get_article_index()
+        logger.info(f"SUCCESS Scoring query against {len(index)} indexed articles")
 
-        articles: List[Dict[str, Any]] = response.data or []
-        scores: List[Tuple[float, Dict[str, Any]]] = []
-        
-        for article in articles:
-            emb: Optional[List[float]] = article.get("embedding")
-            if emb:
-                similarity: float = util.cos_sim(query_embedding, [emb])[0][0].item()
-                scores.append((similarity, article))
+        ranked: List[Tuple[float, Dict[str, Any]]] = index.search(query_embedding, top_k=top_k)
 
-        sorted_results: List[Tuple[float, Dict[str, Any]]] = sorted(scores, key=lambda x: x[0], reverse=True)
-        
         top_results = []
         errors = []
-        for _, article in sorted_results[:10]:
+        for score, article in ranked:
             try:
                 top_results.append(SearchResult(
                 title=article["title"],
@@ -52,6 +42,7 @@ class SearchController:
                 tags=article.get("tags", []),
                 category=article.get("category", ""),
                 summary=article.get("summary", ""),
+                similarity_score=score,
                 ))
             except ValidationError as ve:
                 logger.error(f"Validation error for article: {article} | {ve}")
@@ -68,8 +59,9 @@ class SearchController:
             example="machine learning deployment best practices",
             min_length=1,
             max_length=500
-        )
-    ) -> SearchResponse:
+        ),
+        fields: Tuple[str, ...] = Depends(search_fields)
+    ) -> Union[SearchResponse, Response]:
         """
         Search articles using semantic similarity.
         
@@ -82,6 +74,8 @@ class SearchController:
         - Automatic ranking by relevance score
         - Support for natural language queries
         - Returns top 10 most relevant articles
+        - Sparse fieldsets: `fields=title,url,similarity_score` leaves out the rest;
+          `content` is only returned when listed, e.g. `fields=title,url,content`
         
         **Example Queries:**
         - "machine learning deployment"
@@ -100,19 +94,39 @@ class SearchController:
         """
         logger.info(f"Incoming search query: '{q}'")
 
-        query_embedding: Optional[List[float]] = safe_encode(q, semantic_model)
+        try:
+            query_embedding: Optional[List[float]] = await safe_encode_async(q)
+        except EncoderSaturated as e:
+            logger.warning(f"Search shed: {e}")
+            raise HTTPException(
+                status_code=503, detail="Search is busy, retry shortly", headers={"Retry-After": "1"}
+            )
         if query_embedding is None:
             logger.warning("ERROR Failed to embed query")
             return SearchResponse(error="Failed to embed query")
 
         try:
-            top_results: List[SearchResult] = self.fetch_ranked_articles(query_embedding)
+            # Index refreshes and scoring are blocking; keep them off the event loop.
+            top_results: List[SearchResult] = await run_in_threadpool(
+                self.fetch_ranked_articles, query_embedding
+            )
             if not top_results:
                 logger.info("No articles found or matched")
                 return SearchResponse(results=[])
 
             logger.info(f"Returning top {len(top_results)} results")
-            return SearchResponse(results=top_results)
+            return self._respond(SearchResponse(results=top_results), fields)
         except Exception as e:
             logger.exception("ERROR: Search failed after retries")
             return SearchResponse(error=f"Internal error: {e}")
+
+    def _respond(
+        self, response: SearchResponse, fields: Tuple[str, ...]
+    ) -> Union[SearchResponse, Response]:
+        """``response`` as is, or serialized without the fields the client left out."""
+        if fields == SEARCH_FIELDS:
+            return response
+        omitted = set(SEARCH_FIELDS).difference(fields)
+        return OrjsonResponse(
+            response.model_dump(mode="json", exclude={"results": {"__all__": omitted}})
+        )
@@ -1,9 +1,11 @@
 from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Request, HTTPException
+from starlette.concurrency import run_in_threadpool
 from db.supabase_client import supabase
 from logging_config import logger
 from ..utils.retry import with_backoff
-from models.likes import LikeRequest, LikeResponse
+from engine.corpus_version import corpus_versions
+from models.api.likes import LikeRequest, LikeResponse
 from pydantic import ValidationError
 
 
@@ -121,7 +123,7 @@ class LikesController:
                     logger.warning(f"Some likes could not be validated: {errors}")
 
                 if insert_payload:
-                    self.insert_likes(insert_payload)
+                    await run_in_threadpool(self.insert_likes, insert_payload)
 
                 logger.info(f"SAVED {len(insert_payload)} likes for user {user_id}")
                 return LikeResponse(message=f"{len(insert_payload)} likes saved", liked=True)
@@ -132,6 +134,8 @@ class LikesController:
 
     @with_backoff()
     def insert_likes(self, payload: List[Dict[str, Any]]) -> None:
-        """Insert likes into the database."""
-        logger.info(f"SUCCESS Inserting {len(payload)} likes into Supabase")
-        supabase.table("likes").insert(payload).execute()
+        """Upsert likes on (user_id, article_url); the latest like per article wins."""
+        rows = list({(row["user_id"], row["article_url"]): row for row in payload}.values())
+        logger.info(f"SUCCESS Upserting {len(rows)} likes into Supabase")
+        supabase.table("likes").upsert(rows, on_conflict="user_id,article_url").execute()
+        corpus_versions.bump("likes")
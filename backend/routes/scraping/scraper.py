@@ -1,11 +1,15 @@
 # routes/scraper_controller.py
 
-from typing import Dict, Any, List, Callable, Optional
-from fastapi import APIRouter, HTTPException, Path
+from typing import Dict, Any, List, Callable
+from fastapi import APIRouter, HTTPException, Path, Query
+from engine.article_index import invalidate_article_index
+from engine.corpus_version import corpus_versions
+from engine.fragment_cache import fragment_cache
 from logging_config import logger
 from ..utils.retry import with_backoff
-from ..utils.trigger_scrape import SCRAPER_MAP, trigger_scrape
-from models.scraper import ScraperResult, ScrapedArticle
+from ..utils.scrape_all import SCRAPE_CONCURRENCY, SCRAPE_SOURCE_TIMEOUT_SECONDS, run_scrape_all
+from ..utils.trigger_scrape import SCRAPER_MAP, load_scraper, trigger_scrape
+from models.scraping.scraper import ScraperResult, ScrapedArticle, ScrapeRunReport
 from pydantic import ValidationError
 
 
@@ -110,13 +114,12 @@ class ScraperController:
             source = source.lower()
             logger.info(f"Scrape request for source: '{source}'")
 
-            instance_fn: Optional[Callable] = SCRAPER_MAP.get(source)
-            if not instance_fn:
+            if source not in SCRAPER_MAP:
                 logger.warning(f"ERROR Invalid source requested: '{source}'")
                 raise HTTPException(status_code=400, detail=f"Invalid source '{source}'. Must be one of {list(SCRAPER_MAP.keys())}")
 
             try:
-                result: ScraperResult = self.run_scrape(source, instance_fn().scrape)
+                result: ScraperResult = self.run_scrape(source, load_scraper(source)().scrape)
                 # Validate articles in result
                 valid_articles = []
                 errors = []
@@ -145,10 +148,11 @@ class ScraperController:
             content updates and maintaining a fresh article database.
             
             **Scraping Strategy:**
-            - **Parallel Processing**: Scrapes multiple sources concurrently
-            - **Error Isolation**: Individual source failures don't affect others
-            - **Progress Tracking**: Real-time status updates for each source
-            - **Resource Management**: Optimized for large-scale scraping operations
+            - **Parallel Processing**: Each source runs in its own worker process,
+              at most `concurrency` at a time (default `SCRAPE_CONCURRENCY`)
+            - **Error Isolation**: A failing, crashing or hung source doesn't affect others
+            - **Timeouts**: A source running longer than `timeout` seconds is stopped
+            - **Run Report**: Status, wall time and article counts per source
             
             **Supported Sources:**
             All available engineering blog sources including Netflix, Airbnb, Uber,
@@ -170,85 +174,75 @@ class ScraperController:
             - Article count and validation statistics
             - Error reporting for failed sources
             """,
-            response_description="Comprehensive scraping results for all sources",
+            response_model=ScrapeRunReport,
+            response_description="Run report with per-source status and wall time",
             tags=["Scraping"]
         )
-        def trigger_scrape_all() -> Dict[str, ScraperResult]:
+        def trigger_scrape_all(
+            concurrency: int = Query(
+                SCRAPE_CONCURRENCY, ge=1, le=16, description="Sources scraped at the same time"
+            ),
+            timeout: float = Query(
+                SCRAPE_SOURCE_TIMEOUT_SECONDS, gt=0, description="Seconds allowed per source"
+            ),
+        ) -> ScrapeRunReport:
             """
             Trigger scraping for all supported sources.
             
-            Initiates a comprehensive scraping operation across all engineering blog
-            sources. This operation may take several minutes and should be monitored
-            for progress and completion status.
+            Scrapes every source in parallel worker processes and returns a run
+            report once the last one finishes or times out. The total wall time
+            is close to the slowest source; `serial_seconds` is what running them
+            one at a time would have taken.
             
             **Example Request:**
             ```
-            POST /scrape/all
+            POST /scrape/all?concurrency=4&timeout=600
             ```
             
             **Example Response:**
             ```json
             {
-              "netflix": {
-                "source": "netflix",
-                "success": true,
-                "articles_count": 15,
-                "articles": [...],
-                "error": null
-              },
-              "airbnb": {
-                "source": "airbnb",
-                "success": true,
-                "articles_count": 12,
-                "articles": [...],
-                "error": null
-              },
-              "uber": {
-                "source": "uber",
-                "success": false,
-                "articles_count": 0,
-                "articles": [],
-                "error": "Connection timeout"
-              }
+              "started_at": "2024-01-15T03:00:00Z",
+              "wall_seconds": 412.5,
+              "concurrency": 4,
+              "timeout_seconds": 600.0,
+              "succeeded": 9,
+              "failed": 1,
+              "serial_seconds": 1630.2,
+              "sources": [
+                {"source": "netflix", "status": "ok", "wall_seconds": 398.1,
+                 "scraped": 42, "saved": 3, "updated": 39, "error": null},
+                {"source": "uber", "status": "timeout", "wall_seconds": 600.0,
+                 "scraped": 0, "saved": 0, "updated": 0, "error": "no result after 600s"}
+              ]
             }
             ```
             
-            **Response Structure:**
-            - Each source has its own result object
-            - Success/failure status per source
-            - Article count and validation results
-            - Detailed error messages for failed sources
-            
             **Error Handling:**
-            - Individual source failures are isolated
+            - Individual source failures are isolated (`status` is `failed` or `timeout`)
             - Partial success scenarios are supported
-            - Detailed error reporting per source
-            - Graceful degradation for network issues
+            - Detailed error messages per source
             """
-            logger.info("Scrape triggered for all sources")
-            results: Dict[str, ScraperResult] = {}
+            logger.info(f"Scrape triggered for all sources (concurrency={concurrency}, timeout={timeout}s)")
+            changed: List[str] = []
+
+            def on_done(source: str, payload: Dict[str, Any]) -> None:
+                # Workers are separate processes; refresh this process's caches.
+                if payload.get("saved") or payload.get("updated"):
+                    fragment_cache.invalidate(payload.get("ids", []))
+                    changed.append(source)
 
-            for source in SCRAPER_MAP:
-                try:
-                    result = self.run_scrape(source, SCRAPER_MAP[source]().scrape)
-                    # Validate articles in result
-                    valid_articles = []
-                    errors = []
-                    for article in result.articles:
-                        try:
-                            valid_articles.append(ScrapedArticle(**article.dict()))
-                        except ValidationError as ve:
-                            logger.error(f"Validation error for scraped article: {article} | {ve}")
-                            errors.append({"article": article, "error": str(ve)})
-                    if errors:
-                        logger.warning(f"Some scraped articles for {source} could not be validated: {errors}")
-                    result.articles = valid_articles
-                    results[source] = result
-                    logger.info(f"SUCCESS: Successfully scraped '{source}'")
-                except Exception as e:
-                    logger.exception(f"ERROR Failed scraping '{source}'")
-                    results[source] = ScraperResult(source=source, success=False, error=str(e), articles=[])
-            return results
+            report = run_scrape_all(
+                list(SCRAPER_MAP), concurrency=concurrency, timeout=timeout, on_done=on_done
+            )
+            if changed:
+                corpus_versions.bump("articles")
+                invalidate_article_index()
+            logger.info(
+                f"Scrape run finished in {report.wall_seconds:.1f}s "
+                f"({report.succeeded} ok, {report.failed} failed, serial {report.serial_seconds:.1f}s)"
+            )
+            return report
 
     @with_backoff()
     def run_scrape(self, source: str, scrape_fn: Callable[[], List[ScrapedArticle]]) -> ScraperResult:
@@ -4,7 +4,10 @@ from db.supabase_client import supabase
 from logging_config import logger
 import time
 from pydantic import ValidationError
-from models.health import HealthCheckResponse
+from models.system.health import HealthCheckResponse
+from engine.model_registry import memory_report
+from engine.warmup import readiness, uptime_seconds
+from ..utils.embedding_utils import embedding_pool
 
 
 class HealthController:
@@ -139,6 +142,64 @@ class HealthController:
                     }
                 )
 
+        @self.router.get(
+            "/health/live",
+            summary="Liveness Probe",
+            description="""
+            Report that the process is up and serving requests.
+
+            Touches neither the database nor the models, so it answers as soon as the
+            app has started, even while warmup is still loading them.
+            """,
+            response_description="Process liveness and uptime",
+            tags=["Health"]
+        )
+        def liveness() -> Dict[str, Any]:
+            return {"status": "ok", "uptime_seconds": uptime_seconds()}
+
+        @self.router.get(
+            "/health/ready",
+            summary="Readiness Probe",
+            description="""
+            Report whether startup warmup has finished.
+
+            Warmup loads the article index and the shared embedding model in the
+            background after startup, retrying with backoff if an attempt fails. Returns
+            503 until it completes, listing the models loaded so far with their resident
+            memory and, after a failure, the last error and when the next attempt runs.
+            """,
+            response_description="Warmup status and loaded models",
+            tags=["Health"]
+        )
+        def readiness_check() -> Dict[str, Any]:
+            result = readiness()
+            if not result["ready"]:
+                raise HTTPException(status_code=503, detail=result)
+            return result
+
+        @self.router.get(
+            "/health/embedding",
+            summary="Embedding Worker Health",
+            description="""
+            Report the health of the embedding inference pool.
+
+            Includes worker liveness (each worker process answers a ping), the number
+            of pending encodes against the backpressure limit, completed and failed
+            counts, and the duration of the most recent batch. ``models`` lists each
+            loaded (model, backend) with the resident memory its load added. Returns
+            503 when the workers do not respond or the pool is saturated.
+            """,
+            response_description="Embedding pool status, queue depth and worker liveness",
+            tags=["Health"]
+        )
+        def embedding_health() -> Dict[str, Any]:
+            result = embedding_pool.health()
+            result["models"] = memory_report()
+            if result["status"] != "ok":
+                logger.warning(f"HEALTH CHECK: embedding pool {result}")
+                raise HTTPException(status_code=503, detail=result)
+            return result
+
     @staticmethod
     def check_database() -> Dict[str, Any]:
         """Check database connectivity."""
@@ -0,0 +1,200 @@
+"""
+Negotiated gzip/brotli compression of API responses, with per-route metrics.
+
+``CompressionMiddleware`` picks the best coding the client accepts
+(``Accept-Encoding``, honouring ``q`` weights). Brotli is used when the
+``brotli`` package is installed, gzip otherwise. JSON and text bodies of at
+least ``COMPRESSION_MIN_BYTES`` are compressed. Smaller bodies, streamed
+bodies and bodies that already have a ``Content-Encoding`` pass through.
+
+A compressed body is a different representation, so its strong ETag gets the
+coding as a suffix (``"abc-gzip"``). ``routes.utils.conditional`` strips the
+suffix when it compares ``If-None-Match``, and a 304 echoes the variant the
+client holds. Output is deterministic (gzip ``mtime=0``), so one tag always
+names the same bytes.
+
+Every response is measured per route template: wire size and uncompressed
+size in bytes, and seconds to produce and encode the body.
+"""
+
+import gzip
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, MutableMapping, Optional, Tuple
+
+from prometheus_client import Histogram
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from routes.utils.conditional import encoded_etag
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+COMPRESSION_MIN_BYTES: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "5"))
+# Bodies this large are compressed on a worker thread, off the event loop.
+OFFLOAD_BYTES = 256 * 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+RESPONSE_BYTES = Histogram(
+    "api_response_bytes",
+    "Response body bytes sent, after compression",
+    ["route", "encoding"],
+    buckets=SIZE_BUCKETS,
+)
+UNCOMPRESSED_BYTES = Histogram(
+    "api_response_uncompressed_bytes",
+    "Response body bytes before compression",
+    ["route"],
+    buckets=SIZE_BUCKETS,
+)
+RESPONSE_SECONDS = Histogram(
+    "api_response_seconds",
+    "Seconds to produce and encode a response",
+    ["route", "encoding"],
+)
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+def available_encodings() -> Tuple[str, ...]:
+    """Codings this process can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """The coding to use for ``accept_encoding``, or ``None`` for identity."""
+    weights: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if name.strip():
+            weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _route(scope: Scope) -> str:
+    # The router records the matched route in the scope; label by its template.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses buffered JSON/text responses and records metrics."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size: int = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate(request_headers.get("accept-encoding"))
+        if_none_match = request_headers.get("if-none-match", "")
+        started = time.perf_counter()
+        state: Dict[str, Any] = {"start": None, "raw": 0, "sent": 0, "encoding": "identity"}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state["start"] = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            body: bytes = message.get("body", b"")
+            start = state["start"]
+            state["start"] = None
+            state["raw"] += len(body)
+            if start is None or message.get("more_body", False):
+                # A streamed body is sent as it comes.
+                if start is not None:
+                    self._vary(start)
+                    await send(start)
+                state["sent"] += len(body)
+                await send(message)
+                return
+            body = await self._encode(start, body, encoding, if_none_match, state)
+            state["sent"] += len(body)
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route(scope)
+            RESPONSE_BYTES.labels(route, state["encoding"]).observe(state["sent"])
+            UNCOMPRESSED_BYTES.labels(route).observe(state["raw"])
+            RESPONSE_SECONDS.labels(route, state["encoding"]).observe(
+                time.perf_counter() - started
+            )
+
+    @staticmethod
+    def _vary(start: Message) -> MutableHeaders:
+        headers = MutableHeaders(scope=start)
+        headers.add_vary_header("Accept-Encoding")
+        return headers
+
+    async def _encode(
+        self,
+        start: Message,
+        body: bytes,
+        encoding: Optional[str],
+        if_none_match: str,
+        state: Dict[str, Any],
+    ) -> bytes:
+        """Compress ``body`` if it qualifies, updating the headers in ``start``."""
+        headers = self._vary(start)
+        etag = headers.get("etag")
+        if start["status"] == 304:
+            # Echo the variant the client revalidated, so it keeps its cached body.
+            if etag and encoding and encoded_etag(etag, encoding) in if_none_match:
+                headers["ETag"] = encoded_etag(etag, encoding)
+            return body
+        if (
+            encoding is None
+            or len(body) < self.minimum_size
+            or "content-encoding" in headers
+            or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        ):
+            return body
+        if len(body) >= OFFLOAD_BYTES:
+            body = await run_in_threadpool(compress, body, encoding)
+        else:
+            body = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Content-Length"] = str(len(body))
+        if etag:
+            headers["ETag"] = encoded_etag(etag, encoding)
+        state["encoding"] = encoding
+        return body
@@ -0,0 +1,63 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Cache-Control per kind of resource. Everything carries an ETag, so once
+# max-age runs out a client revalidates with If-None-Match and usually gets an
+# empty 304.
+CACHE_POLICIES = {
+    # Article listings change when a scrape lands; the store polls every 30s.
+    "articles": "public, max-age=30, must-revalidate",
+    # A single article is rarely edited after it is scraped.
+    "article": "public, max-age=300",
+    # Tag and source/category counts only move with the corpus.
+    "counts": "public, max-age=60",
+    # Like-driven rankings move with every like.
+    "likes": "public, max-age=15, must-revalidate",
+}
+
+
+# Content codings applied by ``routes.utils.compression``. Each coding is a
+# different representation, so the compressed body carries its own tag.
+ENCODINGS = ("br", "gzip")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The tag of ``etag``'s representation compressed with ``encoding``."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def base_etag(etag: str) -> str:
+    """``etag`` without a weak prefix or an encoding suffix."""
+    etag = etag.strip().removeprefix("W/")
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[: -len(suffix)] + '"'
+    return etag
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison: W/"x" matches "x". A tag the client
+    # got with a compressed body names the same content.
+    return etag in {base_etag(tag) for tag in if_none_match.split(",")}
+
+
+def not_modified(request: Request, etag: str, policy: str) -> Optional[Response]:
+    """A 304 response when the client already holds ``etag``, else ``None``."""
+    if not _matches(request.headers.get("if-none-match"), etag):
+        return None
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_POLICIES[policy]}
+    )
+
+
+def cached(response: Response, etag: str, policy: str) -> Response:
+    """Attach the ETag and the route's Cache-Control to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_POLICIES[policy]
+    return response
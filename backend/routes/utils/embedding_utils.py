@@ -2,12 +2,32 @@ import math
 import os
 
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from starlette.concurrency import run_in_threadpool
+
+from engine.embedding_cache import model_version, query_embedding_cache
+from engine.embedding_pool import EncoderSaturated
+from engine.inference import DEFAULT_MODEL_NAME, cache_version
+from engine.model_registry import get_model, get_pool
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
+SEMANTIC_MODEL_NAME = DEFAULT_MODEL_NAME
+
 device = "cpu"
-semantic_model = SentenceTransformer("BAAI/bge-base-en-v1.5")
+embedding_pool = get_pool(SEMANTIC_MODEL_NAME)
+
+
+def get_semantic_model():
+    """The shared semantic model, loaded on first use."""
+    return get_model(SEMANTIC_MODEL_NAME)
+
+
+def __getattr__(name):
+    # ``semantic_model`` used to be loaded at import; keep the name working lazily.
+    if name == "semantic_model":
+        return get_semantic_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def is_valid_embedding(embedding, expected_dim=768):
     if not isinstance(embedding, list) or len(embedding) != expected_dim:
@@ -16,25 +36,77 @@ def is_valid_embedding(embedding, expected_dim=768):
     return np.all(np.isfinite(arr)) and not np.all(arr == 0)
 
 
+def _validated_list(emb, expected_dim=768):
+    if isinstance(emb, np.ndarray):
+        emb_list = emb.flatten().tolist()
+    elif hasattr(emb, 'cpu'):  # torch.Tensor
+        emb_list = emb.cpu().numpy().flatten().tolist()
+    else:
+        print("❌ Unexpected embedding type:", type(emb))
+        return None
+
+    if len(emb_list) != expected_dim:
+        print(f"❌ Invalid dimension: {len(emb_list)} ≠ {expected_dim}")
+        return None
+    if not all(isinstance(x, (int, float)) and math.isfinite(x) for x in emb_list):
+        print(f"❌ Non-finite values in: {emb_list[:5]}")
+        return None
+    return emb_list
+
+
+def _cached(text, version, expected_dim):
+    if version is None:
+        return None
+    cached = query_embedding_cache.get(version, text)
+    if cached is not None and len(cached) == expected_dim:
+        return cached.tolist()
+    return None
+
+
+async def _cached_async(text, version, expected_dim):
+    # Memory hits are answered inline; the SQLite tier is read off the event loop.
+    if version is None:
+        return None
+    cached = query_embedding_cache.get(version, text, disk=False)
+    if cached is None and query_embedding_cache.persist_path:
+        cached = await run_in_threadpool(query_embedding_cache.get_from_disk, version, text)
+    if cached is not None and len(cached) == expected_dim:
+        return cached.tolist()
+    return None
+
+
 def safe_encode(text, model, expected_dim=768):
+    version = model_version(model)
+    cached = _cached(text, version, expected_dim)
+    if cached is not None:
+        return cached
     try:
-        emb = model.encode(text, device='cpu')  # Force CPU
-        if isinstance(emb, np.ndarray):
-            emb_list = emb.flatten().tolist()
-        elif hasattr(emb, 'cpu'):  # torch.Tensor
-            emb_list = emb.cpu().numpy().flatten().tolist()
-        else:
-            print("❌ Unexpected embedding type:", type(emb))
-            return None
-
-        if len(emb_list) != expected_dim:
-            print(f"❌ Invalid dimension: {len(emb_list)} ≠ {expected_dim}")
-            return None
-        if not all(isinstance(x, (int, float)) and math.isfinite(x) for x in emb_list):
-            print(f"❌ Non-finite values in: {emb_list[:5]}")
-            return None
-
+        emb_list = _validated_list(model.encode(text, device='cpu'), expected_dim)  # Force CPU
+        if emb_list is not None and version is not None:
+            query_embedding_cache.put(version, text, emb_list)
         return emb_list
     except Exception as e:
         print(f"❌ safe_encode failed: {e}")
         return None
+
+
+async def safe_encode_async(text, expected_dim=768):
+    """Like safe_encode with the semantic model, but awaits the embedding pool.
+
+    EncoderSaturated is propagated so the route can shed load.
+    """
+    version = cache_version(SEMANTIC_MODEL_NAME)
+    cached = await _cached_async(text, version, expected_dim)
+    if cached is not None:
+        return cached
+    try:
+        emb = await embedding_pool.encode(text)
+    except EncoderSaturated:
+        raise
+    except Exception as e:
+        print(f"❌ safe_encode_async failed: {e}")
+        return None
+    emb_list = _validated_list(emb, expected_dim)
+    if emb_list is not None and version is not None:
+        query_embedding_cache.put(version, text, emb_list)
+    return emb_list
@@ -0,0 +1,58 @@
+from typing import Callable, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query
+
+from engine.article_store import RESPONSE_FIELDS
+
+# Search results add the article body and the similarity score.
+SEARCH_FIELDS = RESPONSE_FIELDS + ("content", "similarity_score")
+# The body is the bulk of a result; it is only sent when asked for by name.
+SEARCH_DEFAULT_FIELDS = RESPONSE_FIELDS + ("similarity_score",)
+
+
+def parse_fields(
+    value: Optional[str], allowed: Sequence[str], default: Optional[Sequence[str]] = None
+) -> Tuple[str, ...]:
+    """The fields named in a comma-separated ``value``; ``default`` (all of ``allowed``
+    unless given) when empty.
+
+    The result follows the order of ``allowed`` whatever order the client
+    used, so one field set has one fragment cache key and one ETag.
+    """
+    requested = {field.strip() for field in (value or "").split(",") if field.strip()}
+    if not requested:
+        return tuple(allowed if default is None else default)
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(sorted(unknown))}. Choose from {', '.join(allowed)}"
+        )
+    return tuple(field for field in allowed if field in requested)
+
+
+def fields_param(
+    allowed: Sequence[str], default: Optional[Sequence[str]] = None
+) -> Callable[..., Tuple[str, ...]]:
+    """A ``fields=`` query dependency that selects from ``allowed``."""
+    default = tuple(allowed if default is None else default)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=(
+                f"Comma-separated fields to return, from {', '.join(allowed)} "
+                f"(default: {', '.join(default)})"
+            ),
+            examples=["title,source,published_date"],
+        ),
+    ) -> Tuple[str, ...]:
+        try:
+            return parse_fields(fields, allowed, default)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    return dependency
+
+
+article_fields = fields_param(RESPONSE_FIELDS)
+search_fields = fields_param(SEARCH_FIELDS, SEARCH_DEFAULT_FIELDS)
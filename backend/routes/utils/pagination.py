@@ -0,0 +1,17 @@
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from models.core.base import PaginationParams
+
+
+def pagination_params(
+    limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    after: Optional[str] = Query(None, description="Cursor from `next_cursor`: items after it"),
+    before: Optional[str] = Query(None, description="Cursor from `prev_cursor`: items before it"),
+    sort: str = Query("latest", pattern="^(latest|oldest)$", description="Sort order for results"),
+) -> PaginationParams:
+    """Keyset pagination query parameters shared by the article listings."""
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Pass either `after` or `before`, not both")
+    return PaginationParams(limit=limit, after=after, before=before, sort=sort)
@@ -0,0 +1,41 @@
+import os
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from models.core.article import ArticleResponse
+
+# Rows are validated when they enter the article store; set this to re-check
+# them on every read (one batch pass per response) while debugging.
+VALIDATE_ON_READ: bool = os.getenv("VALIDATE_ON_READ", "false").lower() == "true"
+
+
+class OrjsonResponse(Response):
+    """JSON response serialized straight to bytes with orjson, skipping response models."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=1)
+def _articles_adapter() -> TypeAdapter:
+    return TypeAdapter(List[ArticleResponse])
+
+
+def data_response(data: bytes, **fields: Any) -> Response:
+    """``{"data": <data>, **fields}`` where ``data`` is already-serialized JSON."""
+    body = b'{"data":' + data
+    body += b"," + orjson.dumps(fields)[1:] if fields else b"}"
+    return Response(body, media_type="application/json")
+
+
+def trusted_articles(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Article rows from the validated store, batch-checked only with ``VALIDATE_ON_READ``."""
+    if VALIDATE_ON_READ:
+        _articles_adapter().validate_python(rows)
+    return rows
@@ -0,0 +1,209 @@
+"""
+Scrape every source concurrently, one worker process per source.
+
+``POST /scrape/all`` used to run the sources one after another, so a full
+refresh took the sum of every source's time while most cores sat idle.
+``run_scrape_all`` starts each source in its own process, with at most
+``SCRAPE_CONCURRENCY`` running at once. The total then approaches the slowest
+source rather than the sum.
+
+Each source is isolated. An exception, a crashed browser or a worker that
+dies only fails that source. A source still running after
+``SCRAPE_SOURCE_TIMEOUT_SECONDS`` is terminated and reported as ``timeout``.
+Each worker leads its own process group and turns SIGTERM into a normal exit,
+so its driver pool quits Chrome on the way out. Whatever is left in the group
+afterwards (chromedriver and Chrome included) is killed when the source ends.
+The run returns a ``ScrapeRunReport`` with the status, wall time and
+scraped/saved/updated counts of every source.
+
+Workers are spawned rather than forked. Chrome, torch and the API's threads
+don't survive a fork, and each worker loads its own scraper, KeyBERT and
+embedding model, so memory grows with the concurrency cap. Workers save
+articles with ``trigger_scrape(..., notify=False)`` and report the ids they
+touched. The API process then drops those fragments and invalidates the
+article index once for the whole run.
+"""
+
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence
+
+from prometheus_client import Histogram
+
+from models.scraping.scraper import ScrapeRunReport, SourceRunResult
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_CONCURRENCY: int = int(os.getenv("SCRAPE_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+SCRAPE_SOURCE_TIMEOUT_SECONDS: float = float(os.getenv("SCRAPE_SOURCE_TIMEOUT_SECONDS", "900"))
+
+SOURCE_SECONDS = Histogram(
+    "scrape_source_seconds",
+    "Wall time of one source in a scrape-all run",
+    ["source", "status"],
+    buckets=(5, 15, 30, 60, 120, 300, 600, 900, 1800),
+)
+
+# target(source) -> the dict ``trigger_scrape`` returns; runs in the worker.
+ScrapeTarget = Callable[[str], Dict[str, Any]]
+
+
+def scrape_source(source: str) -> Dict[str, Any]:
+    """Scrape and save one source. Runs inside a worker process."""
+    from routes.utils.trigger_scrape import load_scraper, trigger_scrape
+
+    scraper = load_scraper(source)()
+
+    def scrape_fn() -> List[Dict[str, Any]]:
+        # trigger_scrape works on dicts; scrapers return ScrapedArticle models.
+        return [
+            article.model_dump() if hasattr(article, "model_dump") else article
+            for article in scraper.scrape()
+        ]
+
+    return trigger_scrape(source, scrape_fn, notify=False)
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    # Unwinds the scrape, so leased browsers go back to the pool and atexit
+    # closes it; the default action would leave Chrome running.
+    raise SystemExit(128 + signum)
+
+
+def _worker(target: ScrapeTarget, source: str, conn: Connection) -> None:
+    # Its own process group, so the browsers it starts can be killed with it.
+    os.setpgrp()
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+    try:
+        conn.send(("ok", target(source)))
+    except BaseException as e:
+        conn.send(("failed", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def _kill_group(pid: int) -> None:
+    """Kill what is left of a worker's process group, e.g. Chrome it didn't quit."""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+@dataclass
+class _Running:
+    source: str
+    process: Any
+    conn: Connection
+    started: float
+
+
+def _result(source: str, status: str, seconds: float, payload: Any = None) -> SourceRunResult:
+    if status == "ok":
+        payload = payload or {}
+        return SourceRunResult(
+            source=source,
+            status="ok",
+            wall_seconds=round(seconds, 3),
+            scraped=payload.get("scraped", 0),
+            saved=payload.get("saved", 0),
+            updated=payload.get("updated", 0),
+        )
+    return SourceRunResult(
+        source=source, status=status, wall_seconds=round(seconds, 3), error=payload
+    )
+
+
+def run_scrape_all(
+    sources: Sequence[str],
+    concurrency: int = SCRAPE_CONCURRENCY,
+    timeout: float = SCRAPE_SOURCE_TIMEOUT_SECONDS,
+    target: ScrapeTarget = scrape_source,
+    on_done: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+) -> ScrapeRunReport:
+    """Run ``target`` for every source in worker processes and report on each.
+
+    ``on_done(source, payload)`` is called in this process for every source
+    that succeeds, with what ``target`` returned.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    concurrency = max(1, concurrency)
+    started_at = datetime.now(timezone.utc)
+    run_started = time.monotonic()
+    pending: Deque[str] = deque(sources)
+    running: List[_Running] = []
+    results: Dict[str, SourceRunResult] = {}
+
+    def finish(job: _Running, status: str, payload: Any = None) -> None:
+        seconds = time.monotonic() - job.started
+        _kill_group(job.process.pid)
+        results[job.source] = _result(job.source, status, seconds, payload)
+        SOURCE_SECONDS.labels(job.source, status).observe(seconds)
+        job.conn.close()
+        running.remove(job)
+        if status == "ok":
+            logger.info(f"Scraped '{job.source}' in {seconds:.1f}s")
+            if on_done is not None:
+                on_done(job.source, payload or {})
+        else:
+            logger.warning(
+                f"Scrape of '{job.source}' ended with {status} after {seconds:.1f}s: {payload}"
+            )
+
+    while pending or running:
+        while pending and len(running) < concurrency:
+            source = pending.popleft()
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_worker, args=(target, source, child_conn), name=f"scrape-{source}"
+            )
+            process.start()
+            # Only the worker holds the sending end, so its exit shows up as EOF.
+            child_conn.close()
+            running.append(_Running(source, process, parent_conn, time.monotonic()))
+
+        next_deadline = min(job.started + timeout for job in running)
+        wait(
+            [job.conn for job in running] + [job.process.sentinel for job in running],
+            timeout=max(0.0, next_deadline - time.monotonic()),
+        )
+
+        now = time.monotonic()
+        for job in list(running):
+            if job.conn.poll():
+                try:
+                    status, payload = job.conn.recv()
+                except EOFError:
+                    job.process.join()
+                    finish(job, "failed", f"worker exited with code {job.process.exitcode}")
+                    continue
+                job.process.join()
+                finish(job, status, payload)
+            elif not job.process.is_alive():
+                finish(job, "failed", f"worker exited with code {job.process.exitcode}")
+            elif now - job.started >= timeout:
+                job.process.terminate()
+                job.process.join(5)
+                if job.process.is_alive():
+                    job.process.kill()
+                    job.process.join()
+                finish(job, "timeout", f"no result after {timeout:.0f}s")
+
+    ordered = [results[source] for source in sources]
+    return ScrapeRunReport(
+        started_at=started_at,
+        wall_seconds=round(time.monotonic() - run_started, 3),
+        concurrency=concurrency,
+        timeout_seconds=timeout,
+        succeeded=sum(result.status == "ok" for result in ordered),
+        failed=sum(result.status != "ok" for result in ordered),
+        serial_seconds=round(sum(result.wall_seconds for result in ordered), 3),
+        sources=ordered,
+    )
@@ -1,34 +1,38 @@
+import importlib
 import math
 
 from db.supabase_client import supabase
-from engine.summary import summarize
-from scraper.airbnb import AirbnbScraper
-from scraper.netflix import NetflixScraper
-from scraper.stripe import StripeScraper
-from scraper.tinder import TinderScraper
-from scraper.uber import UberScraper
-from scraper.notion import NotionScraper
-from scraper.slack import SlackScraper
-from scraper.robinhood import RobinhoodScraper
-from scraper.doordash import DoorDashScraper
-from scraper.meta import MetaEngineeringScraper
+from engine.article_index import invalidate_article_index
+from engine.corpus_version import corpus_versions
+from engine.fragment_cache import fragment_cache
 from pydantic import ValidationError
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
+# URLs per `url IN (...)` lookup; keeps the PostgREST query string short.
+URL_LOOKUP_BATCH = 100
+
+# Scrapers pull in Selenium, KeyBERT and the embedding model, so they are
+# imported when a scrape runs rather than when the API starts.
 SCRAPER_MAP = {
-    "netflix": NetflixScraper,
-    "tinder": TinderScraper,
-    "airbnb": AirbnbScraper,
-    "uber": UberScraper,
-    "stripe": StripeScraper,
-    "notion": NotionScraper,
-    "slack": SlackScraper,
-    "robinhood": RobinhoodScraper,
-    "doordash": DoorDashScraper,
-    "meta" : MetaEngineeringScraper,
+    "netflix": "scraper.companies.netflix:NetflixScraper",
+    "tinder": "scraper.companies.tinder:TinderScraper",
+    "airbnb": "scraper.companies.airbnb:AirbnbScraper",
+    "uber": "scraper.companies.uber:UberScraper",
+    "stripe": "scraper.companies.stripe:StripeScraper",
+    "notion": "scraper.companies.notion:NotionScraper",
+    "slack": "scraper.companies.slack:SlackScraper",
+    "robinhood": "scraper.companies.robinhood:RobinhoodScraper",
+    "doordash": "scraper.companies.doordash:DoorDashScraper",
+    "meta": "scraper.companies.meta:MetaEngineeringScraper",
 }
 
 
+def load_scraper(source: str):
+    """Import and return the scraper class registered for ``source``."""
+    module_name, class_name = SCRAPER_MAP[source].split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 def is_valid_embedding(embedding, expected_dim=768):
     return (
         isinstance(embedding, list)
@@ -36,13 +40,31 @@ def is_valid_embedding(embedding, expected_dim=768):
         and all(isinstance(x, (float, int)) and math.isfinite(x) for x in embedding)
     )
 
-def trigger_scrape(source_name: str, scrape_fn):
+def trigger_scrape(source_name: str, scrape_fn, notify: bool = True):
+    """Run ``scrape_fn`` and save its articles.
+
+    With ``notify=False`` the article index is left alone; the scrape-all
+    workers use it and their parent process invalidates once for the run.
+    """
+    from engine.summary import summarize
+
     articles = scrape_fn()
     print(f"\nScraper returned {len(articles)} articles.")
 
     saved = 0
+    updated = 0
+    touched = []
     errors = []
 
+    # One indexed lookup for the whole batch instead of one query per article.
+    existing_ids = {}
+    urls = list({article["url"] for article in articles if article.get("url")})
+    for start in range(0, len(urls), URL_LOOKUP_BATCH):
+        existing = supabase.table("articles").select("id, url").in_(
+            "url", urls[start:start + URL_LOOKUP_BATCH]
+        ).execute()
+        existing_ids.update({row["url"]: row["id"] for row in existing.data or []})
+
     for i, article in enumerate(articles):
         print(f"\n--- Article {i+1} ---")
         print(f"Title: {article['title']}")
@@ -60,13 +82,16 @@ def trigger_scrape(source_name: str, scrape_fn):
             errors.append({"article": article, "error": str(ve)})
             continue
 
-        existing = supabase.table("articles").select("id").eq("url", article["url"]).execute()
-        if existing.data:
-            article_id = existing.data[0]['id']
+        article_id = existing_ids.get(article["url"])
+        if article_id is not None:
             try:
                 supabase.table("articles").update({
                     "content": "Content Coming..."
                 }).eq("id", article_id).execute()
+                fragment_cache.invalidate([article_id])
+                corpus_versions.bump("articles")
+                touched.append(article_id)
+                updated += 1
                 print("✅ Updated Content.")
                 continue
             except Exception as e:
@@ -88,6 +113,12 @@ def trigger_scrape(source_name: str, scrape_fn):
             }).execute()
 
             print(result.data)
+            if result.data:
+                existing_ids[article["url"]] = result.data[0].get("id")
+                inserted_ids = [row["id"] for row in result.data if row.get("id")]
+                fragment_cache.invalidate(inserted_ids)
+                touched.extend(inserted_ids)
+            corpus_versions.bump("articles")
             print("✅ Inserted.")
             saved += 1
         except Exception as e:
@@ -96,5 +127,15 @@ def trigger_scrape(source_name: str, scrape_fn):
     if errors:
         print(f"⚠️ Some scraped articles failed validation: {errors}")
 
+    if notify and (saved or updated):
+        invalidate_article_index()
+
     print(f"\nFinished. {saved} new articles inserted.")
-    return {"message": f"{saved} new articles scraped and saved from {source_name}."}
+    return {
+        "message": f"{saved} new articles scraped and saved from {source_name}.",
+        "scraped": len(articles),
+        "saved": saved,
+        "updated": updated,
+        # Lets a parent process drop its caches when this ran in a worker.
+        "ids": touched,
+    }
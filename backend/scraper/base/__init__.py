@@ -6,7 +6,10 @@ for all web scrapers in the system.
 """
 
 from .base_scraper import BaseBlogScraper
+from .driver_pool import DriverPool, get_driver_pool
 
 __all__ = [
-    "BaseBlogScraper"
+    "BaseBlogScraper",
+    "DriverPool",
+    "get_driver_pool"
 ] 
\ No newline at end of file
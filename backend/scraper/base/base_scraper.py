@@ -1,55 +1,150 @@
-import time
-from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any, Union
+from abc import ABC
+from contextlib import ExitStack, contextmanager
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Sequence, Union
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.remote.webdriver import WebDriver
 from pydantic import ValidationError
 
+from .driver_pool import get_driver_pool
+from .fetchers import HttpFetcher, PageFetcher, WebDriverFetcher
+from ..config.settings import get_scraper_settings
 from ..utils.embedding_utils import (
-    category_embeddings,
     classify_article_semantically,
-    kw_model,
+    get_category_embeddings,
+    get_kw_model,
+    get_semantic_model,
     safe_encode,
-    semantic_model,
 )
-from models.scraper import ScrapedArticle, ScraperConfig
+from ..utils.waits import HEIGHT_JS, PageWaits
+from models.scraping.scraper import ScrapedArticle, ScraperConfig
 
 device = "cpu"
 
+# Outer HTML of the post nodes after the first arguments[1], in document order.
+NEW_POSTS_JS = (
+    "return Array.from(document.querySelectorAll(arguments[0]))"
+    ".slice(arguments[1]).map(el => el.outerHTML);"
+)
+
 
 class BaseBlogScraper(ABC):
+    # How listing pages are fetched: "webdriver" (Chrome) or "http" (plain
+    # GETs, for server-rendered blogs). See ``fetch_paginated``.
+    fetcher: str = "webdriver"
+    # CSS selector of one post, for scrapers that read posts straight from the
+    # live page as they are appended (see ``new_posts``).
+    POST_SELECTOR: str = ""
+
     def __init__(self, source_name: str, base_url: str, scroll_limit: int = 30) -> None:
         self.source_name: str = source_name
         self.base_url: str = base_url
         self.scroll_limit: int = scroll_limit
-        self.driver: WebDriver = self._init_driver()
+        self._driver: Optional[WebDriver] = None
+        self._lease = ExitStack()
+        self.fetch_report: Dict[str, Any] = {}
+        # Explicit waits in place of fixed sleeps; reported per browser session.
+        self.waits: PageWaits = PageWaits()
+        self.wait_report: Dict[str, Any] = {}
+        self.extract_report: Dict[str, Any] = {}
+
+    @property
+    def driver(self) -> WebDriver:
+        """A browser tab leased from the driver pool on first use."""
+        if self._driver is None:
+            self._driver = self._lease.enter_context(get_driver_pool().lease())
+        return self._driver
+
+    def close_driver(self) -> None:
+        """Give the browser tab back to the pool, if one was leased."""
+        self._driver = None
+        self._lease.close()
+
+    @contextmanager
+    def browser_session(self) -> Iterator[WebDriver]:
+        """The scraper's browser tab for a block, returned to the pool on exit."""
+        try:
+            yield self.driver
+        finally:
+            self.close_driver()
+            if self.waits.waits:
+                self.wait_report = self.waits.report()
+                print(f"⏱️ {self.source_name}: {self.wait_report}")
+
+    def make_fetcher(self, kind: str) -> PageFetcher:
+        if kind == "http":
+            return HttpFetcher()
+        return WebDriverFetcher(lambda: self.driver)
+
+    def fetch_paginated(
+        self, urls: Sequence[str], stop_when_empty: bool = True
+    ) -> List[BeautifulSoup]:
+        """Soups of the listing pages at ``urls``, up to the first missing or empty page.
 
-    def _init_driver(self) -> WebDriver:
-        chrome_options = Options()
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        return webdriver.Chrome(options=chrome_options)
+        The ``http`` fetcher requests a window of pages at once, so it may
+        fetch a few pages past the end. If the first page comes back missing
+        or with no posts over plain HTTP, the rest of the run falls back to
+        the browser.
+        """
+        fetcher = self.make_fetcher(self.fetcher)
+        soups: List[BeautifulSoup] = []
+        position = 0
+        done = False
+        try:
+            while position < len(urls) and not done:
+                window = fetcher.concurrency if isinstance(fetcher, HttpFetcher) else 1
+                batch = urls[position:position + window]
+                pages = fetcher.fetch_pages(batch)
+                over_http = isinstance(fetcher, HttpFetcher)
+                if position == 0 and over_http and not self._has_posts(pages[0]):
+                    print(f"⚠️ {self.source_name}: no posts over plain HTTP, using the browser")
+                    fetcher.close()
+                    fetcher = self.make_fetcher("webdriver")
+                    continue
+                position += len(batch)
+                for url, html in zip(batch, pages):
+                    soup = BeautifulSoup(html, "html.parser") if html is not None else None
+                    if soup is None or (stop_when_empty and not self.select_posts(soup)):
+                        print(f"✅ No posts at {url} — stopping.")
+                        done = True
+                        break
+                    soups.append(soup)
+        finally:
+            fetcher.close()
+            self.close_driver()
+        self.fetch_report = {
+            "fetcher": fetcher.name,
+            "pages": fetcher.pages_fetched,
+            "seconds": round(fetcher.fetch_seconds, 3),
+            "pages_per_second": round(fetcher.pages_per_second(), 2),
+        }
+        print(f"📄 {self.source_name}: {self.fetch_report}")
+        return soups
+
+    def _has_posts(self, html: Optional[str]) -> bool:
+        return html is not None and bool(self.select_posts(BeautifulSoup(html, "html.parser")))
 
-    @abstractmethod
     def scroll_page(self) -> None:
-        """Scroll the page to load more content. Must be implemented by subclasses."""
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        """Scroll the page to load more content. Subclasses may override.
+
+        Each scroll moves on as soon as the page grows, and the loop ends once
+        a scroll brings nothing new.
+        """
+        delay = get_scraper_settings().SCROLL_DELAY
+        self.waits.watch_network(self.driver)
+        last_height = self.driver.execute_script(HEIGHT_JS)
         for _ in range(self.scroll_limit):
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            new_height = self.waits.height_change(self.driver, last_height, replaces=delay)
             if new_height == last_height:
                 break
             last_height = new_height
 
     def get_soup(self) -> BeautifulSoup:
         """Get BeautifulSoup object from the page."""
-        self.driver.get(self.base_url)
-        self.scroll_page()
-        html: str = self.driver.page_source
-        self.driver.quit()
+        with self.browser_session() as driver:
+            driver.get(self.base_url)
+            self.scroll_page()
+            html: str = driver.page_source
         # Validate scraped data if needed
         try:
             soup = BeautifulSoup(html, "html.parser")
@@ -67,16 +162,58 @@ class BaseBlogScraper(ABC):
     def scrape(self) -> List[ScrapedArticle]:
         """Main scraping method that returns a list of scraped articles."""
         soup: BeautifulSoup = self.get_soup()
-        posts: List[Tag] = self.select_posts(soup)
+        return self.extract_articles(self.select_posts(soup))
+
+    def new_posts(self, driver: WebDriver, seen: int) -> List[Tag]:
+        """Post nodes appended to the live page after the first ``seen``.
+
+        Only those nodes are serialized and parsed, not the whole document,
+        so a load-more loop does work proportional to what each click adds.
+        Assumes the page appends posts and keeps earlier ones in place.
+        """
+        fragments = driver.execute_script(NEW_POSTS_JS, self.POST_SELECTOR, seen) or []
+        posts: List[Tag] = []
+        for html in fragments:
+            node = BeautifulSoup(html, "html.parser").find()
+            if node is not None:
+                posts.append(node)
+        return posts
+
+    def post_url(self, post: Tag) -> Optional[str]:
+        """The post's article URL, used to skip repeats before enrichment.
+
+        ``None`` (the default) parses every post.
+        """
+        return None
+
+    def extract_articles(self, posts: Iterable[Tag]) -> List[ScrapedArticle]:
+        """Parse and enrich the posts, each article URL once."""
         articles: List[ScrapedArticle] = []
+        seen: set = set()
+        parsed = 0
+        duplicates = 0
 
         for post in posts:
+            parsed += 1
+            url = self.post_url(post)
+            if url is not None:
+                if url in seen:
+                    duplicates += 1
+                    continue
+                seen.add(url)
             try:
                 article: Optional[ScrapedArticle] = self.parse_post(post)
                 if article:
                     articles.append(article)
             except Exception as e:
                 print(f"⚠️ Error scraping post: {e}")
+
+        self.extract_report = {
+            "posts_parsed": parsed,
+            "unique_posts": parsed - duplicates,
+            "duplicates": duplicates,
+        }
+        print(f"🧮 {self.source_name}: {self.extract_report}")
         return articles
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
@@ -86,9 +223,10 @@ class BaseBlogScraper(ABC):
     def enrich_article(self, title: str, url: str, published_date: Optional[str], summary: str = "") -> Optional[ScrapedArticle]:
         """Enrich article with semantic analysis and embeddings."""
         text: str = f"{title}. {summary}" if summary else title
-        keywords: List[tuple] = kw_model.extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=5)
+        semantic_model = get_semantic_model()
+        keywords: List[tuple] = get_kw_model().extract_keywords(text, keyphrase_ngram_range=(1, 2), stop_words='english', top_n=5)
         tags: List[str] = [kw for kw, _ in keywords]
-        category: str = classify_article_semantically(title, summary, category_embeddings, semantic_model)
+        category: str = classify_article_semantically(title, summary, get_category_embeddings(), semantic_model)
         embedding: Optional[List[float]] = safe_encode(f"Title: {title}. Category: {category}. Tags: {', '.join(tags)} {self.source_name}", semantic_model)
         
         if embedding is None:
@@ -0,0 +1,265 @@
+"""
+A process-wide pool of headless Chrome browsers for the scrapers.
+
+Starting Chrome costs a second or more, and every scraper used to start its
+own (some started two and orphaned the first). ``DriverPool`` starts browsers
+only when a scraper first needs one, and keeps them between scrapes:
+
+- ``lease()`` is a context manager. It hands out a fresh tab in an idle
+  browser, and closes the tab and returns the browser on exit, whatever
+  happens inside. A browser whose tab can't be closed is quit and replaced.
+- A browser serves one lease at a time, because a WebDriver session drives
+  one tab at a time. Scrapes in the same process take turns on a warm
+  browser, each in its own tab. Up to ``SCRAPER_BROWSERS`` browsers serve concurrent scrapes.
+  Callers beyond that wait up to ``SCRAPER_BROWSER_WAIT_SECONDS``.
+- Browsers idle for longer than ``SCRAPER_BROWSER_IDLE_SECONDS`` are quit.
+  The rest are quit at exit.
+
+Browsers are always headless. Images, fonts and media are blocked at the
+browser level (content settings plus a DevTools URL block list), since the
+scrapers only read markup.
+
+Pool size, leases in use, launches and time spent waiting for a browser are
+exported as Prometheus metrics.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from ..config.settings import get_scraper_settings
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_BROWSERS: int = int(os.getenv("SCRAPER_BROWSERS", "1"))
+SCRAPER_BROWSER_WAIT_SECONDS: float = float(os.getenv("SCRAPER_BROWSER_WAIT_SECONDS", "300"))
+SCRAPER_BROWSER_IDLE_SECONDS: float = float(os.getenv("SCRAPER_BROWSER_IDLE_SECONDS", "300"))
+
+# Requests for these never leave the browser.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mov", "*.m3u8", "*.mp3", "*.ogg", "*.wav",
+]
+BLOCKED_CONTENT = ("images", "media_stream", "plugins", "notifications", "geolocation")
+
+POOL_BROWSERS = Gauge("scraper_browser_pool_size", "Browsers open in the scraper driver pool")
+POOL_IN_USE = Gauge("scraper_browser_pool_in_use", "Browsers leased to a scraper")
+BROWSER_LAUNCHES = Counter("scraper_browser_launches_total", "Browsers started by the driver pool")
+LEASE_WAIT_SECONDS = Histogram(
+    "scraper_browser_wait_seconds",
+    "Seconds a scraper waited for a browser, including launching one",
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 300),
+)
+
+
+def launch_chrome() -> WebDriver:
+    """Start a headless Chrome that loads no images, fonts or media."""
+    options = Options()
+    options.add_argument("--headless=new")
+    for flag, enabled in get_scraper_settings().CHROME_OPTIONS.items():
+        if enabled:
+            options.add_argument(flag)
+    options.add_argument(f"--user-agent={get_scraper_settings().DEFAULT_USER_AGENT}")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_experimental_option(
+        "prefs",
+        {f"profile.managed_default_content_settings.{name}": 2 for name in BLOCKED_CONTENT},
+    )
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(get_scraper_settings().PAGE_LOAD_TIMEOUT)
+    return driver
+
+
+def block_resources(driver: WebDriver) -> None:
+    """Block font and media requests in the driver's current tab."""
+    # DevTools network state is per tab, so each new tab needs it again.
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except Exception as e:
+        logger.debug(f"Could not set blocked URLs: {e}")
+
+
+@dataclass
+class _Browser:
+    driver: WebDriver
+    # The tab the browser started with. It stays open (closing a browser's
+    # last tab quits it), and leased tabs are opened beside it.
+    home: str
+    idle_since: float = field(default_factory=time.monotonic)
+
+
+class DriverPool:
+    """Lazily started, reused headless browsers, leased one tab at a time."""
+
+    def __init__(
+        self,
+        max_size: int = SCRAPER_BROWSERS,
+        wait_seconds: float = SCRAPER_BROWSER_WAIT_SECONDS,
+        idle_seconds: float = SCRAPER_BROWSER_IDLE_SECONDS,
+        launch: Callable[[], WebDriver] = launch_chrome,
+    ) -> None:
+        self.max_size: int = max(1, max_size)
+        self.wait_seconds: float = wait_seconds
+        self.idle_seconds: float = idle_seconds
+        self._launch = launch
+        self._cond = threading.Condition()
+        self._idle: List[_Browser] = []
+        # Browsers open or starting, and how many of them are leased.
+        self._size: int = 0
+        self._in_use: int = 0
+        self.launches: int = 0
+        self.leases: int = 0
+        self.waited_seconds: float = 0.0
+        self._closed: bool = False
+
+    @contextmanager
+    def lease(self) -> Iterator[WebDriver]:
+        """A fresh tab in a pooled browser, returned to the pool on exit."""
+        browser = self._acquire()
+        try:
+            browser.driver.switch_to.new_window("tab")
+            block_resources(browser.driver)
+        except Exception:
+            self._release(browser, healthy=False)
+            raise
+        healthy = True
+        try:
+            yield browser.driver
+        finally:
+            try:
+                browser.driver.close()
+                browser.driver.switch_to.window(browser.home)
+            except Exception as e:
+                logger.warning(f"Dropping a browser whose tab could not be closed: {e}")
+                healthy = False
+            self._release(browser, healthy)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "size": self._size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "launches": self.launches,
+                "leases": self.leases,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+    def close(self) -> None:
+        """Quit every idle browser. Leased ones are quit when they come back."""
+        with self._cond:
+            self._closed = True
+            closing, self._idle = self._idle, []
+            self._size -= len(closing)
+            self._update_gauges()
+        self._quit(closing)
+
+    def _acquire(self) -> _Browser:
+        started = time.monotonic()
+        deadline = started + self.wait_seconds
+        with self._cond:
+            stale = self._take_stale()
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._record_wait(started)
+                    raise TimeoutError(
+                        f"No browser free after {self.wait_seconds:.0f}s "
+                        f"({self._in_use} of {self.max_size} in use)"
+                    )
+                self._cond.wait(remaining)
+            # Most recently used first, so surplus browsers go idle and get reaped.
+            browser = self._idle.pop() if self._idle else None
+            if browser is None:
+                self._size += 1
+            self._in_use += 1
+            self.leases += 1
+            self._update_gauges()
+        self._quit(stale)
+
+        if browser is None:
+            try:
+                driver = self._launch()
+                browser = _Browser(driver, driver.current_window_handle)
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._in_use -= 1
+                    self._update_gauges()
+                    self._cond.notify()
+                raise
+            BROWSER_LAUNCHES.inc()
+            with self._cond:
+                self.launches += 1
+
+        with self._cond:
+            self._record_wait(started)
+        return browser
+
+    def _record_wait(self, started: float) -> None:
+        waited = time.monotonic() - started
+        LEASE_WAIT_SECONDS.observe(waited)
+        self.waited_seconds += waited
+
+    def _release(self, browser: _Browser, healthy: bool) -> None:
+        with self._cond:
+            self._in_use -= 1
+            if healthy and not self._closed:
+                browser.idle_since = time.monotonic()
+                self._idle.append(browser)
+                browser = None
+            else:
+                self._size -= 1
+            self._update_gauges()
+            self._cond.notify()
+        if browser is not None:
+            self._quit([browser])
+
+    def _take_stale(self) -> List[_Browser]:
+        # Called with the lock held; the caller quits them after releasing it.
+        cutoff = time.monotonic() - self.idle_seconds
+        stale = [browser for browser in self._idle if browser.idle_since < cutoff]
+        if stale:
+            self._idle = [browser for browser in self._idle if browser.idle_since >= cutoff]
+            self._size -= len(stale)
+            self._update_gauges()
+        return stale
+
+    def _update_gauges(self) -> None:
+        POOL_BROWSERS.set(self._size)
+        POOL_IN_USE.set(self._in_use)
+
+    @staticmethod
+    def _quit(browsers: List[_Browser]) -> None:
+        for browser in browsers:
+            try:
+                browser.driver.quit()
+            except Exception as e:
+                logger.debug(f"Browser quit failed: {e}")
+
+
+_pool: Optional[DriverPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """The process's driver pool, created on first use and closed at exit."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -0,0 +1,146 @@
+"""
+Page fetchers for the blog scrapers.
+
+Most of the blogs we scrape are server-rendered: their listing pages can be
+read with a plain HTTP GET, and only a few need a browser to run JavaScript.
+A scraper declares which fetcher it uses (``BaseBlogScraper.fetcher``):
+
+- ``HttpFetcher`` fetches pages concurrently on one pooled async httpx
+  client, using HTTP/2 when ``h2`` is installed. Listing pages arrive as fast
+  as the site answers, with no browser startup or rendering.
+- ``WebDriverFetcher`` loads pages one at a time in the scraper's Chrome.
+  It is the default, and the fallback when plain HTTP returns nothing usable.
+
+Both return raw HTML in the order the URLs were given, with ``None`` for a
+page that could not be fetched (an error status, a timeout, or past the last
+page).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional, Sequence
+
+import httpx
+
+from ..config.settings import get_scraper_settings
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_HTTP_CONCURRENCY: int = int(os.getenv("SCRAPER_HTTP_CONCURRENCY", "8"))
+SCRAPER_HTTP_TIMEOUT: float = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "20"))
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PageFetcher(ABC):
+    """Fetches listing pages as HTML."""
+
+    name: str = ""
+
+    def __init__(self) -> None:
+        self.pages_fetched: int = 0
+        self.fetch_seconds: float = 0.0
+
+    @abstractmethod
+    def _fetch(self, urls: Sequence[str]) -> List[Optional[str]]:
+        ...
+
+    def fetch_pages(self, urls: Sequence[str]) -> List[Optional[str]]:
+        """HTML of each URL, in order; ``None`` where a page couldn't be fetched."""
+        started = time.perf_counter()
+        pages = self._fetch(urls)
+        self.fetch_seconds += time.perf_counter() - started
+        self.pages_fetched += sum(page is not None for page in pages)
+        return pages
+
+    def pages_per_second(self) -> float:
+        return self.pages_fetched / self.fetch_seconds if self.fetch_seconds else 0.0
+
+    def close(self) -> None:
+        """Release connections or browsers held by the fetcher."""
+
+
+class HttpFetcher(PageFetcher):
+    """Concurrent GETs over one pooled httpx client."""
+
+    name = "http"
+
+    def __init__(
+        self,
+        concurrency: int = SCRAPER_HTTP_CONCURRENCY,
+        timeout: float = SCRAPER_HTTP_TIMEOUT,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        super().__init__()
+        self.concurrency: int = max(1, concurrency)
+        self.timeout: float = timeout
+        self.http2: bool = _http2_available() if http2 is None else http2
+        # For tests and benchmarks: serve requests without a network.
+        self.transport = transport
+
+    def _client(self) -> httpx.AsyncClient:
+        settings = get_scraper_settings()
+        return httpx.AsyncClient(
+            http2=self.http2,
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={"User-Agent": settings.DEFAULT_USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+            ),
+            transport=self.transport,
+        )
+
+    async def _fetch_all(self, urls: Sequence[str]) -> List[Optional[str]]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch_one(client: httpx.AsyncClient, url: str) -> Optional[str]:
+            async with semaphore:
+                try:
+                    response = await client.get(url)
+                except httpx.HTTPError as e:
+                    logger.warning(f"GET {url} failed: {e}")
+                    return None
+            if response.status_code != 200:
+                logger.info(f"GET {url} returned {response.status_code}")
+                return None
+            return response.text
+
+        async with self._client() as client:
+            return list(await asyncio.gather(*(fetch_one(client, url) for url in urls)))
+
+    def _fetch(self, urls: Sequence[str]) -> List[Optional[str]]:
+        return asyncio.run(self._fetch_all(urls))
+
+
+class WebDriverFetcher(PageFetcher):
+    """Loads pages one after another in a browser."""
+
+    name = "webdriver"
+
+    def __init__(self, get_driver: Callable[[], Any]) -> None:
+        super().__init__()
+        # A callable, so the browser starts only if a page is actually loaded.
+        self.get_driver = get_driver
+
+    def _fetch(self, urls: Sequence[str]) -> List[Optional[str]]:
+        pages: List[Optional[str]] = []
+        for url in urls:
+            try:
+                driver = self.get_driver()
+                driver.get(url)
+                pages.append(driver.page_source)
+            except Exception as e:
+                logger.warning(f"Loading {url} in the browser failed: {e}")
+                pages.append(None)
+        return pages
@@ -11,7 +11,7 @@ from .stripe import StripeScraper
 from .uber import UberScraper
 from .tinder import TinderScraper
 from .doordash import DoorDashScraper
-from .meta import MetaScraper
+from .meta import MetaEngineeringScraper as MetaScraper
 from .notion import NotionScraper
 from .robinhood import RobinhoodScraper
 from .slack import SlackScraper
@@ -1,68 +1,65 @@
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
-import time
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 
 class DoorDashScraper(BaseBlogScraper):
+    POST_SELECTOR: str = "div.fade.h-full"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="DoorDash Engineering Blog",
             base_url="https://careersatdoordash.com/engineering-blog/",
             scroll_limit=0  # Will use click instead of scroll
         )
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver: WebDriver = webdriver.Chrome(options=chrome_options)
 
-    def get_soup_pages(self) -> List[BeautifulSoup]:
-        """Get BeautifulSoup objects from multiple pages using load more button."""
-        soups: List[BeautifulSoup] = []
-        try:
+    def get_posts(self) -> List[Tag]:
+        """Post nodes from the page, read as each "See More" click appends them."""
+        posts: List[Tag] = []
+        with self.browser_session() as driver:
             print(f"🌐 Visiting DoorDash Engineering Blog — {self.base_url}")
-            self.driver.get(self.base_url)
+            driver.get(self.base_url)
+            self.waits.watch_network(driver)
+            # Wait for posts to load
+            self.waits.count_increase(driver, self.POST_SELECTOR, 0, replaces=2.0)
+            posts.extend(self.new_posts(driver, 0))
 
             while True:
-                # Wait for posts to load
-                time.sleep(2)
-                soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-                posts: List[Tag] = self.select_posts(soup)
-                soups.append(soup)
-
                 # Try to click "See More"
                 try:
-                    load_more = self.driver.find_element("id", "load-more")
-                    if load_more.is_displayed():
-                        print("🔄 Clicking 'See More'...")
-                        self.driver.execute_script("arguments[0].click();", load_more)
-                        time.sleep(1)
-                    else:
+                    load_more = driver.find_element("id", "load-more")
+                    if not load_more.is_displayed():
                         break
+                    print("🔄 Clicking 'See More'...")
+                    driver.execute_script("arguments[0].click();", load_more)
                 except Exception:
                     print("✅ No more 'See More' button — finished loading.")
                     break
+                # Until the next batch is appended, instead of 1s after the
+                # click and 2s before the next snapshot.
+                self.waits.count_increase(driver, self.POST_SELECTOR, len(posts), replaces=3.0)
+                appended: List[Tag] = self.new_posts(driver, len(posts))
+                if not appended:
+                    print("✅ 'See More' added no posts — stopping.")
+                    break
+                posts.extend(appended)
 
-        finally:
-            self.driver.quit()
-
-        return soups
+        return posts
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the DoorDash blog."""
-        return soup.select("div.fade.h-full")
+        return soup.select(self.POST_SELECTOR)
+
+    def post_url(self, post: Tag) -> Optional[str]:
+        a_tag: Optional[Tag] = post.select_one("a")
+        return a_tag.get("href") if a_tag else None
 
     def parse_post(self, post: Tag) -> Optional[ScrapedArticle]:
         """Parse a single DoorDash post element."""
-        a_tag: Optional[Tag] = post.select_one("a")
-        url: Optional[str] = a_tag["href"] if a_tag else None
+        url: Optional[str] = self.post_url(post)
 
         title_el: Optional[Tag] = post.select_one("p.with-tags")
         title: Optional[str] = title_el.get_text(strip=True) if title_el else None
@@ -85,18 +82,6 @@ class DoorDashScraper(BaseBlogScraper):
 
     def scrape(self) -> List[ScrapedArticle]:
         """Main scraping method for DoorDash articles."""
-        soups: List[BeautifulSoup] = self.get_soup_pages()
-        articles: List[ScrapedArticle] = []
-
-        for soup in soups:
-            posts: List[Tag] = self.select_posts(soup)
-            for post in posts:
-                try:
-                    article: Optional[ScrapedArticle] = self.parse_post(post)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    print(f"⚠️ Error scraping post: {e}")
-
+        articles: List[ScrapedArticle] = self.extract_articles(self.get_posts())
         print(f"✅ Scraped {len(articles)} DoorDash posts.")
         return articles
@@ -1,72 +1,71 @@
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
-import time
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 
 class MetaEngineeringScraper(BaseBlogScraper):
+    POST_SELECTOR: str = "article.post"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="Meta Engineering Blog",
             base_url="https://engineering.fb.com/",
             scroll_limit=0  # Using button click
         )
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver: WebDriver = webdriver.Chrome(options=chrome_options)
-
-    def get_soup_pages(self) -> List[BeautifulSoup]:
-        """Get BeautifulSoup objects from multiple pages using load more button."""
-        soups: List[BeautifulSoup] = []
+
+    def get_posts(self) -> List[Tag]:
+        """Post nodes from the page, read as each "Load More" click appends them."""
+        posts: List[Tag] = []
         click_count: int = 0
         MAX_CLICKS: int = 30 
 
-        try:
+        with self.browser_session() as driver:
             print(f"🌐 Visiting Meta Engineering Blog — {self.base_url}")
-            self.driver.get(self.base_url)
+            driver.get(self.base_url)
+            self.waits.watch_network(driver)
+            self.waits.count_increase(driver, self.POST_SELECTOR, 0, replaces=2.0)
+            posts.extend(self.new_posts(driver, 0))
 
             while click_count < MAX_CLICKS:
-                time.sleep(2)
-                soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-                soups.append(soup)
-
                 try:
-                    load_more = self.driver.find_element("css selector", "button.loadmore-btn")
-                    if load_more.is_displayed():
-                        print(f"🔄 Clicking 'Load More'... ({click_count + 1}/{MAX_CLICKS})")
-                        self.driver.execute_script("arguments[0].click();", load_more)
-                        click_count += 1
-                        time.sleep(2)
-                    else:
+                    load_more = driver.find_element("css selector", "button.loadmore-btn")
+                    if not load_more.is_displayed():
                         print("✅ 'Load More' not displayed — stopping.")
                         break
+                    print(f"🔄 Clicking 'Load More'... ({click_count + 1}/{MAX_CLICKS})")
+                    driver.execute_script("arguments[0].click();", load_more)
                 except Exception:
                     print("✅ No 'Load More' button found — done.")
                     break
+                click_count += 1
+                # Until the next batch is appended, instead of 2s after the
+                # click and 2s before the next snapshot.
+                self.waits.count_increase(driver, self.POST_SELECTOR, len(posts), replaces=4.0)
+                appended: List[Tag] = self.new_posts(driver, len(posts))
+                if not appended:
+                    print("✅ 'Load More' added no posts — stopping.")
+                    break
+                posts.extend(appended)
 
             if click_count >= MAX_CLICKS:
                 print(f"⏹️ Reached max clicks ({MAX_CLICKS}) — stopping.")
-
-        finally:
-            self.driver.quit()
-        return soups
+        return posts
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the Meta blog."""
-        return soup.select("article.post")
+        return soup.select(self.POST_SELECTOR)
+
+    def post_url(self, post: Tag) -> Optional[str]:
+        a_tag: Optional[Tag] = post.select_one(".entry-title a")
+        return a_tag.get("href") if a_tag else None
 
     def parse_post(self, post: Tag) -> Optional[ScrapedArticle]:
         """Parse a single Meta post element."""
         a_tag: Optional[Tag] = post.select_one(".entry-title a")
-        url: Optional[str] = a_tag["href"] if a_tag else None
+        url: Optional[str] = self.post_url(post)
         title: Optional[str] = a_tag.get_text(strip=True) if a_tag else None
 
         tag_els: List[Tag] = post.select("span.cat-links a.category")
@@ -85,18 +84,6 @@ class MetaEngineeringScraper(BaseBlogScraper):
 
     def scrape(self) -> List[ScrapedArticle]:
         """Main scraping method for Meta Engineering articles."""
-        soups: List[BeautifulSoup] = self.get_soup_pages()
-        articles: List[ScrapedArticle] = []
-
-        for soup in soups:
-            posts: List[Tag] = self.select_posts(soup)
-            for post in posts:
-                try:
-                    article: Optional[ScrapedArticle] = self.parse_post(post)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    print(f"⚠️ Error scraping post: {e}")
-
+        articles: List[ScrapedArticle] = self.extract_articles(self.get_posts())
         print(f"✅ Scraped {len(articles)} Meta Engineering posts.")
         return articles
@@ -1,12 +1,9 @@
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 
 class NotionScraper(BaseBlogScraper):
@@ -17,23 +14,17 @@ class NotionScraper(BaseBlogScraper):
             scroll_limit=0
         )
 
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver: WebDriver = webdriver.Chrome(options=chrome_options)
-
         self.MAX_PAGES: int = 10
 
     def get_soup_pages(self) -> List[BeautifulSoup]:
         """Get BeautifulSoup objects from multiple pages."""
         soups: List[BeautifulSoup] = []
-        try:
+        with self.browser_session() as driver:
             for page in range(1, self.MAX_PAGES + 1):
                 url: str = f"https://www.notion.so/blog/page/{page}"
                 print(f"🌐 Visiting Notion Blog page {page} — {url}")
-                self.driver.get(url)
-                soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
+                driver.get(url)
+                soup: BeautifulSoup = BeautifulSoup(driver.page_source, "html.parser")
 
                 posts: List[Tag] = self.select_posts(soup)
                 if not posts:
@@ -41,8 +32,6 @@ class NotionScraper(BaseBlogScraper):
                     break
 
                 soups.append(soup)
-        finally:
-            self.driver.quit()
         return soups
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
@@ -1,48 +1,29 @@
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 
 class RobinhoodScraper(BaseBlogScraper):
+    # Server-rendered pagination; the browser is only a fallback.
+    fetcher = "http"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="Robinhood Newsroom",
             base_url="https://newsroom.aboutrobinhood.com/page/1/",
             scroll_limit=0
         )
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver: WebDriver = webdriver.Chrome(options=chrome_options)
-
         self.MAX_PAGES: int = 40
 
     def get_soup_pages(self) -> List[BeautifulSoup]:
         """Get BeautifulSoup objects from multiple pages."""
-        soups: List[BeautifulSoup] = []
-        try:
-            for page in range(1, self.MAX_PAGES + 1):
-                url: str = f"https://newsroom.aboutrobinhood.com/page/{page}/"
-                print(f"🌐 Visiting Robinhood Newsroom page {page} — {url}")
-                self.driver.get(url)
-                soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-
-                posts: List[Tag] = self.select_posts(soup)
-                if not posts:
-                    print(f"✅ No posts found on page {page} — stopping.")
-                    break
-
-                soups.append(soup)
-        finally:
-            self.driver.quit()
-        return soups
+        return self.fetch_paginated([
+            f"https://newsroom.aboutrobinhood.com/page/{page}/"
+            for page in range(1, self.MAX_PAGES + 1)
+        ])
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the soup."""
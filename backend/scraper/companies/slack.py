@@ -1,15 +1,15 @@
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.remote.webdriver import WebDriver
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 
 class SlackScraper(BaseBlogScraper):
+    # Server-rendered pagination; the browser is only a fallback.
+    fetcher = "http"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="Slack Engineering Blog",
@@ -19,26 +19,12 @@ class SlackScraper(BaseBlogScraper):
         self.MAX_PAGES: int = 23
         self.PAGE_TEMPLATE: str = "https://slack.engineering/articles/page/{}/"
 
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver: WebDriver = webdriver.Chrome(options=chrome_options)
-
     def get_soup_pages(self) -> List[BeautifulSoup]:
         """Get BeautifulSoup objects from multiple pages."""
-        soups: List[BeautifulSoup] = []
-        try:
-            for page in range(1, self.MAX_PAGES + 1):
-                url: str = self.base_url if page == 1 else self.PAGE_TEMPLATE.format(page)
-                print(f"\n🌐 Visiting Slack Engineering page {page}: {url}")
-                self.driver.get(url)
-                self.driver.implicitly_wait(5)
-                soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-                soups.append(soup)
-        finally:
-            self.driver.quit()
-        return soups
+        return self.fetch_paginated([
+            self.base_url if page == 1 else self.PAGE_TEMPLATE.format(page)
+            for page in range(1, self.MAX_PAGES + 1)
+        ])
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the Slack blog."""
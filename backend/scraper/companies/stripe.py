@@ -1,16 +1,18 @@
 # stripe_scraper.py
-import time
 from datetime import datetime
 from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 device = "cpu"
 
 
 class StripeScraper(BaseBlogScraper):
+    # Server-rendered pagination.
+    fetcher = "http"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="Stripe Blog",
@@ -21,15 +23,9 @@ class StripeScraper(BaseBlogScraper):
 
     def get_soup_pages(self) -> List[BeautifulSoup]:
         """Get BeautifulSoup objects from multiple pages."""
-        soups: List[BeautifulSoup] = []
-        for page in range(1, self.MAX_PAGES + 1):
-            print(f"🌐 Visiting page {page}")
-            self.driver.get(f"https://stripe.com/blog/page/{page}")
-            time.sleep(3)
-            soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-            soups.append(soup)
-        self.driver.quit()
-        return soups
+        return self.fetch_paginated(
+            [f"https://stripe.com/blog/page/{page}" for page in range(1, self.MAX_PAGES + 1)]
+        )
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the Stripe blog."""
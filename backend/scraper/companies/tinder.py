@@ -4,7 +4,7 @@ from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 device = "cpu"
 
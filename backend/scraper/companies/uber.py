@@ -4,12 +4,15 @@ from typing import List, Optional
 from bs4 import BeautifulSoup, Tag
 
 from ..base.base_scraper import BaseBlogScraper
-from models.scraper import ScrapedArticle
+from models.scraping.scraper import ScrapedArticle
 
 device = "cpu"
 
 
 class UberScraper(BaseBlogScraper):
+    # Server-rendered pagination.
+    fetcher = "http"
+
     def __init__(self) -> None:
         super().__init__(
             source_name="Uber Engineering Blog",
@@ -21,15 +24,9 @@ class UberScraper(BaseBlogScraper):
 
     def get_soup_pages(self) -> List[BeautifulSoup]:
         """Get BeautifulSoup objects from multiple pages."""
-        soups: List[BeautifulSoup] = []
-        for page in range(1, self.MAX_PAGES + 1):
-            print(f"\n🌐 Visiting Uber page {page}")
-            self.driver.get(self.PAGE_TEMPLATE.format(page))
-            self.driver.implicitly_wait(5)
-            soup: BeautifulSoup = BeautifulSoup(self.driver.page_source, "html.parser")
-            soups.append(soup)
-        self.driver.quit()
-        return soups
+        return self.fetch_paginated(
+            [self.PAGE_TEMPLATE.format(page) for page in range(1, self.MAX_PAGES + 1)]
+        )
 
     def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
         """Select post elements from the Uber blog."""
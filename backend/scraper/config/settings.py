@@ -6,7 +6,7 @@ for all web scrapers in the system.
 """
 
 from typing import Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -20,6 +20,12 @@ class ScraperSettings:
     # Default timeouts
     PAGE_LOAD_TIMEOUT: int = 30
     SCROLL_DELAY: float = 2.0
+
+    # Explicit waits (see utils.waits): the longest wait for new content, how
+    # often to check, and how long without network activity counts as idle
+    WAIT_TIMEOUT: float = 10.0
+    WAIT_POLL_INTERVAL: float = 0.1
+    NETWORK_IDLE_SECONDS: float = 0.5
     
     # Default retry settings
     MAX_RETRIES: int = 3
@@ -29,7 +35,7 @@ class ScraperSettings:
     DEFAULT_USER_AGENT: str = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
     
     # Chrome options
-    CHROME_OPTIONS: Dict[str, Any] = {
+    CHROME_OPTIONS: Dict[str, Any] = field(default_factory=lambda: {
         "--no-sandbox": True,
         "--disable-dev-shm-usage": True,
         "--disable-gpu": True,
@@ -37,7 +43,7 @@ class ScraperSettings:
         "--disable-plugins": True,
         "--disable-images": True,
         "--disable-javascript": False,
-    }
+    })
     
     # Rate limiting
     RATE_LIMIT_DELAY: float = 1.0
@@ -5,14 +5,16 @@ This module contains common utilities, helpers, and constants
 used across different web scrapers.
 """
 
+from . import embedding_utils
 from .embedding_utils import (
-    category_embeddings,
     classify_article_semantically,
-    kw_model,
-    safe_encode,
-    semantic_model
+    get_category_embeddings,
+    get_kw_model,
+    get_semantic_model,
+    safe_encode
 )
 from .constants import CATEGORIES
+from .waits import PageWaits
 from .helpers import (
     safe_get_text,
     safe_get_attribute,
@@ -29,6 +31,9 @@ __all__ = [
     # Embedding utilities
     "category_embeddings",
     "classify_article_semantically",
+    "get_category_embeddings",
+    "get_kw_model",
+    "get_semantic_model",
     "kw_model",
     "safe_encode",
     "semantic_model",
@@ -45,5 +50,15 @@ __all__ = [
     "wait_for_page_load",
     "scroll_page_smoothly",
     "validate_article_data",
-    "log_scraping_progress"
-] 
\ No newline at end of file
+    "log_scraping_progress",
+
+    # Explicit page waits
+    "PageWaits"
+] 
+
+
+def __getattr__(name):
+    # The models load on first use rather than when the package is imported.
+    if name in ("category_embeddings", "kw_model", "semantic_model"):
+        return getattr(embedding_utils, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
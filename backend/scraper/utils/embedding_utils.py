@@ -1,16 +1,74 @@
 import math
 import os
+import threading
 
 import numpy as np
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer, util
+import torch
+from sentence_transformers import util
+
+from engine.artifact_cache import artifact_cache
+from engine.inference import DEFAULT_MODEL_NAME, cache_version
+from engine.model_registry import get_keybert, get_model
 
 from .constants import CATEGORIES
 
 os.environ["TOKENIZERS_PARALLELISM"] = "false"
 
 device = "cpu"
-semantic_model = SentenceTransformer("BAAI/bge-base-en-v1.5")
+
+_category_embeddings = None
+_category_lock = threading.Lock()
+
+
+def get_semantic_model():
+    """The shared semantic model, loaded on first use."""
+    return get_model(DEFAULT_MODEL_NAME)
+
+
+def get_kw_model():
+    """KeyBERT backed by the shared semantic model rather than its own."""
+    return get_keybert(DEFAULT_MODEL_NAME)
+
+
+def _encode_categories():
+    model = get_semantic_model()
+    return {cat: model.encode(examples) for cat, examples in CATEGORIES.items()}
+
+
+def get_category_embeddings():
+    """Prototype embeddings for each category.
+
+    Loaded from the artifact cache, keyed by model, backend and ``CATEGORIES``;
+    encoded (and cached) only when one of those changed.
+    """
+    global _category_embeddings
+    with _category_lock:
+        if _category_embeddings is None:
+            arrays = artifact_cache.get_or_compute(
+                "category-prototypes",
+                cache_version(DEFAULT_MODEL_NAME),
+                CATEGORIES,
+                _encode_categories,
+            )
+            _category_embeddings = {
+                cat: torch.from_numpy(arrays[cat]) for cat in CATEGORIES
+            }
+        return _category_embeddings
+
+
+_LAZY_ATTRIBUTES = {
+    "semantic_model": get_semantic_model,
+    "kw_model": get_kw_model,
+    "category_embeddings": get_category_embeddings,
+}
+
+
+def __getattr__(name):
+    # These used to be built at import; keep the names working lazily.
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def is_valid_embedding(embedding, expected_dim=768):
     if not isinstance(embedding, list) or len(embedding) != expected_dim:
@@ -64,10 +122,3 @@ def classify_article_semantically(title: str, summary: str, category_embeddings,
             best_score = sim
 
     return best_cat
-
-kw_model = KeyBERT()
-
-category_embeddings = {
-    cat: semantic_model.encode(examples, convert_to_tensor=True)
-    for cat, examples in CATEGORIES.items()
-}
@@ -5,13 +5,14 @@ This module contains common utility functions used across
 different web scrapers.
 """
 
-import time
 import logging
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from bs4 import BeautifulSoup, Tag
 from selenium.webdriver.remote.webdriver import WebDriver
 
+from .waits import HEIGHT_JS, PageWaits
+
 
 logger = logging.getLogger(__name__)
 
@@ -102,33 +103,37 @@ def extract_summary(element: Optional[Tag], max_length: int = 200) -> str:
 
 
 def wait_for_page_load(driver: WebDriver, timeout: int = 30) -> bool:
-    """Wait for page to load completely."""
+    """Wait until the document has loaded and its network has gone idle."""
+    waits = PageWaits(timeout=timeout)
     try:
-        # Wait for document ready state
-        driver.execute_script("return document.readyState") == "complete"
-        time.sleep(2)  # Additional buffer
-        return True
+        return waits.ready(driver, replaces=2.0) and waits.network_idle(driver)
     except Exception as e:
         logger.warning(f"Error waiting for page load: {e}")
         return False
 
 
-def scroll_page_smoothly(driver: WebDriver, scroll_limit: int = 30, delay: float = 2.0) -> None:
-    """Scroll page smoothly to load dynamic content."""
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    
+def scroll_page_smoothly(
+    driver: WebDriver, scroll_limit: int = 30, delay: float = 2.0
+) -> Dict[str, Any]:
+    """Scroll to the bottom until the page stops growing; returns the wait report.
+
+    Each scroll waits until the page height changes (up to the configured
+    wait timeout) instead of sleeping; ``delay`` is the fixed pause that wait
+    replaces, for the report.
+    """
+    waits = PageWaits()
+    waits.watch_network(driver)
+    last_height = driver.execute_script(HEIGHT_JS)
+
     for i in range(scroll_limit):
-        # Scroll to bottom
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(delay)
-        
-        # Check if page height changed
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        new_height = waits.height_change(driver, last_height, replaces=delay)
         if new_height == last_height:
             break
         last_height = new_height
-        
+
         logger.debug(f"Scrolled {i+1}/{scroll_limit} times")
+    return waits.report()
 
 
 def validate_article_data(title: str, url: str) -> bool:
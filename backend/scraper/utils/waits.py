@@ -0,0 +1,188 @@
+"""
+Explicit page waits for the browser scrapers.
+
+Scroll and "Load More" loops used to sleep a fixed 1-3 seconds per step,
+whether the new content arrived in 100 ms or not at all. ``PageWaits`` polls
+the page instead and moves on as soon as something changes:
+
+- ``count_increase``: more elements match a CSS selector
+- ``height_change``: ``document.body.scrollHeight`` changed
+- ``network_idle``: the document is loaded, no fetch/XHR request is in
+  flight, and no resource has finished for ``NETWORK_IDLE_SECONDS``
+- ``ready``: ``document.readyState`` is ``complete``
+
+Every wait has a timeout (``WAIT_TIMEOUT`` by default). The content waits also
+stop, unchanged, once the network is idle, but never before the fixed sleep
+they replace has passed. A slow "Load More" response therefore gets at least
+as long as it used to, while at the end of a feed the loop ends after the old
+sleep rather than the full timeout.
+
+Each wait records how long it took and how long the sleep it replaces would
+have taken. ``report()`` sums them, with ``saved_seconds`` as the difference.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from ..config.settings import get_scraper_settings
+
+logger = logging.getLogger(__name__)
+
+HEIGHT_JS = "return document.body.scrollHeight"
+COUNT_JS = "return document.querySelectorAll(arguments[0]).length"
+# Resource timing only lists finished requests, so fetch() and XHR are wrapped
+# to count the ones still in flight. The hooks are installed on the first
+# check and see requests started after it.
+NETWORK_JS = """
+if (!window.__scraperInflight) {
+  const box = window.__scraperInflight = {n: 0};
+  const done = () => { box.n = Math.max(0, box.n - 1); };
+  if (window.fetch) {
+    const fetch = window.fetch;
+    window.fetch = function () {
+      box.n++;
+      return fetch.apply(this, arguments).finally(done);
+    };
+  }
+  const send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    box.n++;
+    this.addEventListener("loadend", done, {once: true});
+    return send.apply(this, arguments);
+  };
+  performance.setResourceTimingBufferSize(5000);
+}
+return [document.readyState, performance.getEntriesByType("resource").length,
+        window.__scraperInflight.n];
+"""
+
+
+class _NetworkIdle:
+    """Tracks when a page last had a request in flight or finish."""
+
+    def __init__(self, driver: Any, idle_seconds: float) -> None:
+        self.driver = driver
+        self.idle_seconds: float = idle_seconds
+        self.resources: Optional[int] = None
+        self.since: float = time.monotonic()
+
+    def check(self) -> bool:
+        state, resources, in_flight = self.driver.execute_script(NETWORK_JS)
+        now = time.monotonic()
+        if state != "complete" or in_flight or resources != self.resources:
+            self.resources = resources
+            self.since = now
+            return False
+        return now - self.since >= self.idle_seconds
+
+
+class PageWaits:
+    """Polling waits on a page, with the time they took against the sleeps they replace."""
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        idle_seconds: Optional[float] = None,
+    ) -> None:
+        settings = get_scraper_settings()
+        self.timeout: float = settings.WAIT_TIMEOUT if timeout is None else timeout
+        self.poll_interval: float = (
+            settings.WAIT_POLL_INTERVAL if poll_interval is None else poll_interval
+        )
+        self.idle_seconds: float = (
+            settings.NETWORK_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        )
+        self.waits: int = 0
+        self.timeouts: int = 0
+        self.waited_seconds: float = 0.0
+        self.replaced_seconds: float = 0.0
+
+    def until(
+        self,
+        condition: Callable[[], bool],
+        replaces: float = 0.0,
+        timeout: Optional[float] = None,
+        idle_driver: Any = None,
+    ) -> bool:
+        """Poll ``condition`` until it holds (``True``) or the wait gives up (``False``).
+
+        The wait gives up after ``timeout`` seconds or, given ``idle_driver``,
+        once that page's network is idle and at least ``replaces`` seconds
+        (the fixed sleep this wait stands in for) have passed.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        floor = started + replaces
+        idle = _NetworkIdle(idle_driver, self.idle_seconds) if idle_driver is not None else None
+        met = False
+        while True:
+            try:
+                met = bool(condition())
+                if met:
+                    break
+                # Checked every poll to keep the idle window current.
+                if idle is not None and idle.check() and time.monotonic() >= floor:
+                    break
+            except Exception as e:
+                logger.debug(f"Wait condition raised: {e}")
+            if time.monotonic() >= deadline:
+                self.timeouts += 1
+                break
+            time.sleep(self.poll_interval)
+        self.waits += 1
+        self.waited_seconds += time.monotonic() - started
+        self.replaced_seconds += replaces
+        return met
+
+    def count_increase(
+        self, driver: Any, selector: str, previous: int, replaces: float = 0.0
+    ) -> int:
+        """The number of ``selector`` matches, once it exceeds ``previous``."""
+        count = [previous]
+
+        def grown() -> bool:
+            count[0] = driver.execute_script(COUNT_JS, selector)
+            return count[0] > previous
+
+        self.until(grown, replaces, idle_driver=driver)
+        return count[0]
+
+    def height_change(self, driver: Any, previous: int, replaces: float = 0.0) -> int:
+        """The page's scroll height, once it differs from ``previous``."""
+        height = [previous]
+
+        def changed() -> bool:
+            height[0] = driver.execute_script(HEIGHT_JS)
+            return height[0] != previous
+
+        self.until(changed, replaces, idle_driver=driver)
+        return height[0]
+
+    def watch_network(self, driver: Any) -> None:
+        """Start counting the page's in-flight requests, before triggering any."""
+        try:
+            driver.execute_script(NETWORK_JS)
+        except Exception as e:
+            logger.debug(f"Could not watch network requests: {e}")
+
+    def network_idle(self, driver: Any, replaces: float = 0.0) -> bool:
+        """Whether the page's network went idle before the timeout."""
+        return self.until(_NetworkIdle(driver, self.idle_seconds).check, replaces)
+
+    def ready(self, driver: Any, replaces: float = 0.0) -> bool:
+        """Whether the document finished loading before the timeout."""
+        return self.until(
+            lambda: driver.execute_script("return document.readyState") == "complete", replaces
+        )
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+            "waited_seconds": round(self.waited_seconds, 2),
+            "fixed_sleep_seconds": round(self.replaced_seconds, 2),
+            "saved_seconds": round(self.replaced_seconds - self.waited_seconds, 2),
+        }
@@ -7,6 +7,8 @@ async def test_scrape_all_sources(client):
     assert response.status_code == 200
     body = response.json()
     assert isinstance(body, dict)
-    for source, result in body.items():
+    assert body["succeeded"] + body["failed"] == len(body["sources"])
+    for result in body["sources"]:
         assert isinstance(result, dict)
-        assert "status" in result or "error" in result
+        assert result["status"] in ("ok", "failed", "timeout")
+        assert result["status"] == "ok" or result["error"]
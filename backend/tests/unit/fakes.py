@@ -0,0 +1,37 @@
+"""
+Article rows and a fake articles table shared by the unit tests.
+"""
+
+
+def article(n, published="2024-01-01T00:00:00+00:00", inserted=None, **fields):
+    """An ``articles`` row; ``inserted_at`` increases with ``n``."""
+    row = {
+        "id": f"id-{n}",
+        "title": f"Article {n}",
+        "url": f"https://example.com/{n}",
+        "published_date": published,
+        "source": "Netflix Tech Blog",
+        "tags": ["Kafka", "streaming"],
+        "category": "Backend",
+        "summary": "summary",
+        "content": "",
+        "embedding": [float(n + 1)] + [0.0] * 3,
+        "inserted_at": inserted or f"2024-06-01T00:{n // 60:02d}:{n % 60:02d}+00:00",
+    }
+    row.update(fields)
+    return row
+
+
+class FakeTable:
+    """Serves pages of rows, honouring the watermark like the Supabase query."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.calls = []
+
+    def __call__(self, watermark, offset, limit):
+        self.calls.append(watermark)
+        rows = sorted(self.rows, key=lambda r: r["inserted_at"])
+        if watermark is not None:
+            rows = [r for r in rows if r["inserted_at"] > watermark]
+        return rows[offset:offset + limit]
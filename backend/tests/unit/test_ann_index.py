@@ -0,0 +1,66 @@
+"""
+Unit tests for the IVF approximate nearest-neighbour index.
+"""
+
+import numpy as np
+
+from engine.ann_index import IVFIndex
+from engine.vector_index import VectorIndex
+
+
+def make_matrix(n: int, dim: int = 16, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+class TestIVFIndex:
+    """Test cases for training, searching, incremental adds and persistence."""
+
+    def test_full_probe_matches_exact(self):
+        """Probing every list returns the same results as the exact index."""
+        matrix = make_matrix(500)
+        ids = [str(i) for i in range(500)]
+        exact = VectorIndex(dim=16)
+        exact.build_from_matrix(matrix, ids, metadata=[{"id": i} for i in ids])
+        ivf = IVFIndex(dim=16, nlist=10)
+        ivf.build_from_matrix(matrix, ids, metadata=[{"id": i} for i in ids])
+
+        query = make_matrix(1, seed=3)[0]
+        expected = [meta["id"] for _, meta in exact.search(query, top_k=5)]
+        found = [meta["id"] for _, meta in ivf.search(query, top_k=5, nprobe=10)]
+        assert found == expected
+
+    def test_add_is_searchable_without_retraining(self):
+        """Vectors added after training are assigned to lists and found."""
+        ivf = IVFIndex(dim=16, nlist=4)
+        ivf.build_from_matrix(make_matrix(200), [str(i) for i in range(200)])
+        centroids = ivf.centroids
+
+        new_vector = make_matrix(1, seed=9)
+        ivf.add(new_vector, ["new"], metadata=[{"id": "new"}])
+        assert ivf.centroids is centroids
+        assert len(ivf) == 201
+        assert ivf.search(new_vector[0], top_k=1, nprobe=4)[0][1]["id"] == "new"
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """A saved index loads with the same quantizer and results."""
+        matrix = make_matrix(300)
+        ids = [str(i) for i in range(300)]
+        ivf = IVFIndex(dim=16, nlist=8, nprobe=3)
+        ivf.build_from_matrix(matrix, ids, metadata=[{"id": i} for i in ids])
+        path = str(tmp_path / "articles")
+        ivf.save(path)
+
+        loaded = IVFIndex.load(path)
+        query = make_matrix(1, seed=5)[0]
+        assert loaded.nprobe == 3
+        assert np.allclose(loaded.centroids, ivf.centroids)
+        assert loaded.search(query, top_k=5) == ivf.search(query, top_k=5)
+
+    def test_rebuild_reuses_quantizer(self):
+        """A new index adopting a trained quantizer skips retraining."""
+        first = IVFIndex(dim=16, nlist=4)
+        first.build_from_matrix(make_matrix(200), [str(i) for i in range(200)])
+        second = IVFIndex(dim=16, nlist=4)
+        second.reuse_quantizer(first)
+        second.build_from_matrix(make_matrix(250, seed=1), [str(i) for i in range(250)])
+        assert second.centroids is first.centroids
@@ -0,0 +1,92 @@
+"""
+Unit tests for refreshing and persisting the shared article index.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from engine import article_index
+from engine.ann_index import IVFIndex
+from engine.article_store import ArticleStore
+from engine.vector_index import DEFAULT_DIM, VectorIndex
+from tests.unit import fakes
+from tests.unit.fakes import FakeTable
+
+RNG = np.random.default_rng(0)
+
+
+def article(n):
+    return fakes.article(n, embedding=RNG.standard_normal(DEFAULT_DIM).tolist())
+
+
+@pytest.fixture
+def ivf(monkeypatch, tmp_path):
+    """IVF mode over a fake table, with fresh module state and a temp index path."""
+    table = FakeTable([article(n) for n in range(200)])
+    store = ArticleStore(fetch_page=table, poll_seconds=3600)
+    monkeypatch.setattr(article_index, "get_article_store", lambda: store)
+    monkeypatch.setattr(article_index, "ARTICLE_INDEX_MODE", "ivf")
+    monkeypatch.setattr(article_index, "ARTICLE_INDEX_PATH", str(tmp_path / "articles"))
+    monkeypatch.setattr(article_index, "IVF_NLIST", 8)
+    monkeypatch.setattr(article_index, "_watcher", None)
+    monkeypatch.setattr(article_index, "_index", VectorIndex())
+    monkeypatch.setattr(article_index, "_built_version", 0)
+    monkeypatch.setattr(article_index, "_built_loaded_version", None)
+    monkeypatch.setattr(article_index, "_stale", True)
+    monkeypatch.setattr(article_index, "_saver", None)
+    monkeypatch.setattr(article_index, "_save_requested", article_index.threading.Event())
+    monkeypatch.setattr(article_index, "_save_lock_file", None)
+    return table, store, tmp_path
+
+
+def wait_for(path, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return path.exists()
+
+
+class TestArticleIndexRefresh:
+    """Test cases for incremental IVF refreshes and background saves."""
+
+    def test_new_rows_are_added_without_a_rebuild(self, ivf):
+        """A delta sync adds the new rows to the live index and keeps its quantizer."""
+        table, store, _ = ivf
+        index = article_index.get_article_index()
+        assert isinstance(index, IVFIndex) and len(index) == 200
+        centroids = index.centroids
+
+        table.rows.append(article(200))
+        article_index.invalidate_article_index()
+        assert article_index.get_article_index() is index
+        assert len(index) == 201 and index.centroids is centroids
+        query = np.asarray(table.rows[-1]["embedding"])
+        assert index.search(query, top_k=1, nprobe=8)[0][1]["url"] == "https://example.com/200"
+
+    def test_full_reload_rebuilds(self, ivf):
+        """A full store reload, which may carry edits and deletes, builds a new index."""
+        table, store, _ = ivf
+        index = article_index.get_article_index()
+        del table.rows[0]
+        store.load()
+        rebuilt = article_index.get_article_index()
+        assert rebuilt is not index and len(rebuilt) == 199
+
+    def test_growth_past_the_threshold_rebuilds(self, ivf, monkeypatch):
+        """Adding more rows than the quantizer's retrain threshold builds a new index."""
+        table, _, _ = ivf
+        monkeypatch.setattr(article_index, "IVF_RETRAIN_GROWTH", 1.1)
+        index = article_index.get_article_index()
+        table.rows.extend(article(n) for n in range(200, 230))
+        article_index.invalidate_article_index()
+        assert article_index.get_article_index() is not index
+
+    def test_saved_in_the_background_and_atomically(self, ivf):
+        """The saver thread writes the index; no temp files are left behind."""
+        _, _, tmp_path = ivf
+        index = article_index.get_article_index()
+        assert wait_for(tmp_path / "articles.npz")
+        assert not list(tmp_path.glob(".tmp-*"))
+        assert len(IVFIndex.load(str(tmp_path / "articles"))) == len(index)
@@ -0,0 +1,245 @@
+"""
+Unit tests for the in-process columnar article store.
+"""
+
+import numpy as np
+import pytest
+
+from engine.article_store import (
+    ArticleColumns,
+    ArticleStore,
+    decode_cursor,
+    encode_cursor,
+    validate_rows,
+)
+from models.core.article import ArticleResponse
+from tests.unit.fakes import FakeTable, article
+
+
+class TestArticleColumns:
+    """Test cases for the columnar snapshot."""
+
+    def test_rows_are_ordered_newest_first_with_undated_last(self):
+        """Default order matches sorting by published_date descending."""
+        columns = ArticleColumns(
+            [
+                article(1, "2023-01-01T00:00:00+00:00"),
+                article(2, None),
+                article(3, "2024-05-01T00:00:00+00:00"),
+            ],
+            dim=4,
+        )
+        assert [columns.ids[i] for i in columns.select()] == ["id-3", "id-1", "id-2"]
+        assert [columns.ids[i] for i in columns.select(order="oldest")] == ["id-2", "id-1", "id-3"]
+
+    def test_filters_by_source_category_and_tag_substring(self):
+        """Dictionary-coded columns answer the listing filters."""
+        columns = ArticleColumns(
+            [
+                article(1, tags=["Machine Learning"], category="ML"),
+                article(2, source="Uber Engineering Blog", tags=["kafka"]),
+            ],
+            dim=4,
+        )
+        assert len(columns.select(source="Uber Engineering Blog")) == 1
+        assert len(columns.select(source="Unknown source")) == 0
+        assert [columns.ids[i] for i in columns.select(category="ML")] == ["id-1"]
+        assert [columns.ids[i] for i in columns.by_tags(["learn"])] == ["id-1"]
+
+    def test_counts(self):
+        """Source, category and case-insensitive tag counts."""
+        columns = ArticleColumns(
+            [article(1, tags=["Kafka"]), article(2, tags=["kafka", "go"]), article(3, category="")],
+            dim=4,
+        )
+        assert columns.source_counts() == [("Netflix Tech Blog", 3)]
+        assert columns.category_counts() == [("Backend", 2), ("Unknown", 1)]
+        assert columns.tag_counts()[0] == ("kafka", 3)
+
+    def test_index_inputs_skip_rows_without_embeddings(self):
+        """Only rows with a valid embedding reach the search index, normalized."""
+        columns = ArticleColumns([article(1), article(2, embedding=None)], dim=4)
+        matrix, urls, metadata = columns.index_inputs()
+        assert urls == ["https://example.com/1"]
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0)
+        assert "embedding" not in metadata[0]
+
+    def test_index_inputs_share_the_embedding_matrix(self):
+        """The index gets the snapshot's own matrix, not a second copy of it."""
+        columns = ArticleColumns([article(1), article(2, embedding=None), article(3)], dim=4)
+        matrix, urls, _ = columns.index_inputs()
+        assert matrix is columns.embeddings and matrix.shape == (2, 4)
+        assert urls == ["https://example.com/3", "https://example.com/1"]
+        assert columns.embedding(1) is None
+        assert np.shares_memory(columns.embedding(2), matrix)
+
+    def test_responses_match_the_response_model(self):
+        """Trusted response dicts carry exactly what ArticleResponse would accept."""
+        columns = ArticleColumns([article(1, summary=None)], dim=4)
+        response = columns.response(0)
+        assert set(response) == set(ArticleResponse.model_fields)
+        assert ArticleResponse(**response).url == response["url"]
+
+
+class TestValidateRows:
+    """Test cases for the batch validation done when rows are loaded."""
+
+    def test_drops_only_invalid_rows(self):
+        """One bad row is dropped; the rest of the batch survives, in order."""
+        rows = [article(1), article(2, title=None), article(3, published="not a date")]
+        rows.append(article(4))
+        assert [row["id"] for row in validate_rows(rows)] == ["id-1", "id-4"]
+
+    def test_valid_batch_is_returned_as_is(self):
+        """Rows are not copied or rebuilt."""
+        rows = [article(1), article(2)]
+        assert validate_rows(rows) == rows
+        assert validate_rows([]) == []
+
+
+def walk(columns, positions, limit, order="latest"):
+    """Follow ``next_cursor`` to the end, returning the ids of every page."""
+    pages = []
+    chunk, next_cursor, _ = columns.page(positions, limit, order=order)
+    pages.append([columns.ids[i] for i in chunk])
+    while next_cursor is not None:
+        chunk, next_cursor, _ = columns.page(positions, limit, after=next_cursor, order=order)
+        pages.append([columns.ids[i] for i in chunk])
+    return pages
+
+
+class TestPagination:
+    """Test cases for keyset pagination over (published_date, id)."""
+
+    def setup_method(self):
+        # Three articles share a timestamp, so ids break the tie; two are undated.
+        dates = ["2024-01-0%dT00:00:00+00:00" % d for d in (1, 2, 2, 2, 3, 4, 5)] + [None, None]
+        self.columns = ArticleColumns(
+            [article(n, published) for n, published in enumerate(dates)], dim=4
+        )
+
+    def test_cursor_round_trip(self):
+        """Cursors encode the sort key, including a missing date."""
+        assert decode_cursor(encode_cursor(1704067200.0, "id-1")) == (1704067200.0, "id-1")
+        ts, article_id = decode_cursor(encode_cursor(float("nan"), "id-7"))
+        assert np.isnan(ts) and article_id == "id-7"
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    @pytest.mark.parametrize("order", ["latest", "oldest"])
+    @pytest.mark.parametrize("limit", [1, 2, 4, 9, 20])
+    def test_pages_cover_every_row_once_in_order(self, order, limit):
+        """Walking next cursors yields the full ordering with no gaps or repeats."""
+        positions = self.columns.select()
+        pages = walk(self.columns, positions, limit, order)
+        expected = [self.columns.ids[i] for i in self.columns.select(order=order)]
+        assert [article_id for page in pages for article_id in page] == expected
+        assert all(len(page) == limit for page in pages[:-1])
+
+    def test_ties_and_undated_rows_use_id_order(self):
+        """Equal dates are ordered by id descending; undated rows come last."""
+        ids = [self.columns.ids[i] for i in self.columns.select()]
+        assert ids == ["id-6", "id-5", "id-4", "id-3", "id-2", "id-1", "id-0", "id-8", "id-7"]
+
+    @pytest.mark.parametrize("order", ["latest", "oldest"])
+    def test_before_returns_the_previous_page(self, order):
+        """``prev_cursor`` of page two leads back to page one."""
+        positions = self.columns.select()
+        first, next_cursor, prev_cursor = self.columns.page(positions, 3, order=order)
+        assert prev_cursor is None
+        second, _, prev_cursor = self.columns.page(positions, 3, after=next_cursor, order=order)
+        back, _, _ = self.columns.page(positions, 3, before=prev_cursor, order=order)
+        assert list(back) == list(first)
+        assert not set(second) & set(first)
+
+    def test_cursor_from_a_filtered_out_row_still_positions(self):
+        """A cursor for a row missing from the selection still splits it by key."""
+        rows = [
+            article(n, f"2024-01-0{n + 1}T00:00:00+00:00", category="AB"[n % 2]) for n in range(6)
+        ]
+        columns = ArticleColumns(rows, dim=4)
+        positions = columns.select(category="A")
+        cursor = columns.cursor(columns.find("id-3"))
+        chunk, _, _ = columns.page(positions, 10, after=cursor)
+        assert [columns.ids[i] for i in chunk] == ["id-2", "id-0"]
+
+    def test_empty_selection(self):
+        """Empty listings have no cursors."""
+        chunk, next_cursor, prev_cursor = self.columns.page(np.empty(0, dtype=np.int64), 5)
+        assert len(chunk) == 0 and next_cursor is None and prev_cursor is None
+
+
+class TestArticleStore:
+    """Test cases for loading and watermark delta syncs."""
+
+    def test_full_load_pages_through_the_table(self):
+        """Loading keeps requesting pages until a short one comes back."""
+        table = FakeTable([article(n) for n in range(5)])
+        store = ArticleStore(fetch_page=table, page_size=2, dim=4)
+        assert len(store.load()) == 5
+        assert table.calls == [None, None, None]
+
+    def test_delta_sync_fetches_only_new_rows(self):
+        """After a change notification only rows past the watermark are fetched."""
+        table = FakeTable([article(1), article(2)])
+        store = ArticleStore(fetch_page=table, poll_seconds=3600, dim=4)
+        first = store.snapshot()
+        assert store.snapshot() is first
+
+        table.rows.append(article(3, "2025-01-01T00:00:00+00:00"))
+        store.notify_changed()
+        second = store.snapshot()
+        assert table.calls[-1] == "2024-06-01T00:00:02+00:00"
+        assert second.version == first.version + 1
+        assert second.ids[0] == "id-3"
+        assert len(second) == 3
+        assert second.has_embedding.all()
+
+    def test_synced_waits_for_and_blocks_other_syncs(self):
+        """synced() returns freshly synced columns and holds the lock while in use."""
+        table = FakeTable([article(1)])
+        store = ArticleStore(fetch_page=table, poll_seconds=3600, dim=4)
+        first = store.snapshot()
+        table.rows.append(article(2, "2025-01-01T00:00:00+00:00"))
+        with store.synced() as columns:
+            assert len(columns) == 2
+            store.notify_changed()
+            # A reader meanwhile gets the same columns instead of starting a sync.
+            assert store.snapshot() is columns
+        assert first is not columns
+
+    def test_store_without_embeddings(self):
+        """A store serving alongside a snapshot keeps no embedding matrix, across syncs too."""
+        table = FakeTable([article(1)])
+        store = ArticleStore(fetch_page=table, poll_seconds=3600, dim=4, with_embeddings=False)
+        store.snapshot()
+        table.rows.append(article(2, "2025-01-01T00:00:00+00:00"))
+        store.notify_changed()
+        columns = store.snapshot()
+        assert len(columns) == 2 and columns.embeddings.shape == (0, 4)
+        assert not columns.has_embedding.any()
+
+    def test_delta_replaces_rows_with_the_same_id(self):
+        """A re-inserted id replaces the previous row instead of duplicating it."""
+        table = FakeTable([article(1)])
+        store = ArticleStore(fetch_page=table, poll_seconds=3600, dim=4)
+        store.snapshot()
+        table.rows.append(article(1, title="Renamed", inserted="2024-07-01T00:00:00+00:00"))
+        store.notify_changed()
+        columns = store.snapshot()
+        assert len(columns) == 1
+        assert columns.titles[0] == "Renamed"
+
+    def test_failed_sync_serves_previous_snapshot(self):
+        """A sync error keeps the last good snapshot instead of failing reads."""
+        table = FakeTable([article(1)])
+        store = ArticleStore(fetch_page=table, poll_seconds=3600, dim=4)
+        first = store.snapshot()
+
+        def broken(watermark, offset, limit):
+            raise ConnectionError("down")
+
+        store.fetch_page = broken
+        store.notify_changed()
+        assert store.snapshot() is first
+        assert store.stats()["rows"] == 1
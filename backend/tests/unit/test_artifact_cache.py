@@ -0,0 +1,66 @@
+"""
+Unit tests for the content-addressed artifact cache.
+"""
+
+import numpy as np
+
+from engine.artifact_cache import ArtifactCache, artifact_key
+
+CATEGORIES = {"Backend": ["API development", "database design"], "Cloud": ["serverless"]}
+
+
+def counting_compute(calls):
+    def compute():
+        calls.append(1)
+        return {cat: np.full((len(examples), 4), len(calls), dtype=np.float32)
+                for cat, examples in CATEGORIES.items()}
+    return compute
+
+
+class TestArtifactCache:
+    """Test cases for keying, persistence and invalidation of derived arrays."""
+
+    def test_key_depends_on_model_and_input(self):
+        """Model, backend and input changes all produce different keys."""
+        base = artifact_key("prototypes", "bge#torch", CATEGORIES)
+        assert base == artifact_key("prototypes", "bge#torch", dict(reversed(CATEGORIES.items())))
+        assert base != artifact_key("prototypes", "bge#onnx-int8", CATEGORIES)
+        assert base != artifact_key("prototypes", "other#torch", CATEGORIES)
+        assert base != artifact_key("prototypes", "bge#torch", {**CATEGORIES, "Cloud": ["AWS"]})
+
+    def test_second_process_loads_instead_of_computing(self, tmp_path):
+        """A fresh cache on the same directory reads the stored arrays."""
+        calls = []
+        first = ArtifactCache(str(tmp_path)).get_or_compute(
+            "prototypes", "bge#torch", CATEGORIES, counting_compute(calls)
+        )
+        second = ArtifactCache(str(tmp_path)).get_or_compute(
+            "prototypes", "bge#torch", CATEGORIES, counting_compute(calls)
+        )
+        assert len(calls) == 1
+        for cat in CATEGORIES:
+            np.testing.assert_array_equal(first[cat], second[cat])
+
+    def test_changed_input_recomputes(self, tmp_path):
+        """Editing the categories misses the old artifact."""
+        cache = ArtifactCache(str(tmp_path))
+        calls = []
+        cache.get_or_compute("prototypes", "bge#torch", CATEGORIES, counting_compute(calls))
+        cache.get_or_compute(
+            "prototypes", "bge#torch", {**CATEGORIES, "Cloud": ["AWS"]}, counting_compute(calls)
+        )
+        assert len(calls) == 2
+        assert cache.clear() == 2
+
+    def test_corrupt_file_is_a_miss(self, tmp_path):
+        """An unreadable artifact is recomputed and rewritten."""
+        cache = ArtifactCache(str(tmp_path))
+        key = artifact_key("prototypes", "bge#torch", CATEGORIES)
+        (tmp_path / f"prototypes-{key}.npz").write_bytes(b"PK\x03\x04truncated")
+        calls = []
+        arrays = cache.get_or_compute(
+            "prototypes", "bge#torch", CATEGORIES, counting_compute(calls)
+        )
+        assert len(calls) == 1
+        assert set(arrays) == set(CATEGORIES)
+        assert cache.load("prototypes", key) is not None
@@ -0,0 +1,64 @@
+"""
+Unit tests for the micro-batching encoder.
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from engine.batch_encoder import BatchingEncoder, length_buckets
+
+
+class RecordingModel:
+    """Stand-in encoder whose vector for a text is ``[len(text), 0]``."""
+
+    def __init__(self) -> None:
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        return np.array([[len(t), 0.0] for t in texts], dtype=np.float32)
+
+
+class TestLengthBuckets:
+    """Test cases for grouping texts by token length."""
+
+    def test_similar_lengths_share_a_bucket(self):
+        """Lengths within 2x of the bucket's shortest are grouped together."""
+        assert length_buckets([3, 40, 4, 5, 70, 6]) == [[0, 2, 3, 5], [1, 4]]
+
+
+class TestBatchingEncoder:
+    """Test cases for coalescing concurrent encodes."""
+
+    def test_concurrent_requests_are_batched(self):
+        """Concurrent callers share encode calls and each gets its own vector."""
+        model = RecordingModel()
+        encoder = BatchingEncoder(model, max_batch_size=16, max_wait_ms=50)
+        texts = [f"query {'x' * i}" for i in range(8)]
+        results = {}
+        barrier = threading.Barrier(len(texts))
+
+        def call(text):
+            barrier.wait()
+            results[text] = encoder.encode(text, timeout=5)
+
+        threads = [threading.Thread(target=call, args=(t,)) for t in texts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(model.batches) < len(texts)
+        for text in texts:
+            assert results[text][0] == len(text)
+
+    def test_errors_reach_every_caller(self):
+        """A failing encode resolves the callers' futures with the exception."""
+        def fail(texts):
+            raise RuntimeError("model crashed")
+
+        encoder = BatchingEncoder(fail, max_wait_ms=1)
+        with pytest.raises(RuntimeError):
+            encoder.encode("hello", timeout=5)
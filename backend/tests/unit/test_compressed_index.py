@@ -0,0 +1,102 @@
+"""
+Unit tests for the compressed int8/PCA scoring tier.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from engine.compressed_index import CompressedIndex, quantize_int8
+from engine.snapshot import load_snapshot, write_snapshot
+from engine.vector_index import normalize_rows
+
+
+def clustered(n: int = 500, dim: int = 64, clusters: int = 10, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = normalize_rows(rng.standard_normal((clusters, dim)).astype(np.float32))
+    labels = rng.integers(0, clusters, size=n)
+    noise = 0.03 * rng.standard_normal((n, dim)).astype(np.float32)
+    return normalize_rows(centers[labels] + noise)
+
+
+def build(matrix: np.ndarray, **kwargs) -> CompressedIndex:
+    index = CompressedIndex(dim=matrix.shape[1], **kwargs)
+    ids = [str(i) for i in range(len(matrix))]
+    index.build_from_matrix(matrix, ids, [{"row": i} for i in range(len(matrix))], normalized=True)
+    return index
+
+
+class TestQuantization:
+    """Test cases for int8 scalar quantization."""
+
+    def test_round_trip_error_is_small(self):
+        """Dequantized values are within half a quantization step."""
+        matrix = clustered()
+        codes, scales = quantize_int8(matrix)
+        assert codes.dtype == np.int8
+        assert np.all(np.abs(codes * scales - matrix) <= scales / 2 + 1e-6)
+
+
+class TestCompressedIndex:
+    """Test cases for two-tier search."""
+
+    def test_scores_are_exact_after_rescoring(self):
+        """Returned scores are the full-precision cosine similarities."""
+        matrix = clustered()
+        index = build(matrix, reduced_dim=16)
+        query = matrix[7]
+        results = index.search(query, top_k=5)
+        assert results[0][1] == {"row": 7}
+        for score, meta in results:
+            assert score == pytest.approx(float(matrix[meta["row"]] @ query), abs=1e-6)
+
+    def test_memory_and_recall_report(self):
+        """The compressed tier is smaller and rescoring recovers most of the recall."""
+        matrix = clustered()
+        index = build(matrix, reduced_dim=16)
+        report = index.memory_report()
+        assert report["compressed_bytes"] < report["full_bytes"] / 4
+        queries = matrix[:20] + 0.02 * np.random.default_rng(3).standard_normal((20, 64))
+        recall = index.recall_report(queries, top_k=10)
+        assert recall["recall_rescored"] >= recall["recall_compressed"]
+        assert recall["recall_rescored"] > 0.9
+
+    def test_resident_memory_counts_the_rescoring_matrix(self, tmp_path):
+        """In-heap, the float32 matrix is resident too; over a snapshot only the tier is."""
+        matrix = clustered()
+        in_heap = build(matrix, reduced_dim=16).memory_report()
+        assert not in_heap["full_mapped"]
+        assert in_heap["resident_bytes"] == in_heap["full_bytes"] + in_heap["compressed_bytes"]
+        assert in_heap["resident_ratio"] > 1
+
+        ids = [str(i) for i in range(len(matrix))]
+        write_snapshot(str(tmp_path), matrix, ids, [{"row": i} for i in range(len(matrix))])
+        index = load_snapshot(str(tmp_path), index=CompressedIndex(dim=64, reduced_dim=16))
+        mapped = index.memory_report()
+        assert mapped["full_mapped"]
+        assert mapped["resident_bytes"] == mapped["compressed_bytes"]
+        assert index.search(matrix[7], top_k=1)[0][1] == {"row": 7}
+
+    def test_projection_is_persisted_and_refit_on_drift(self, tmp_path):
+        """A saved projection is reused, and refit when the corpus no longer fits it."""
+        path = str(tmp_path / "projection")
+        first = build(clustered(), reduced_dim=8, projection_path=path)
+
+        reloaded = CompressedIndex(dim=64, reduced_dim=8, projection_path=path)
+        assert reloaded.load_projection(path)
+        np.testing.assert_array_equal(reloaded.components, first.components)
+
+        reloaded.build_from_matrix(clustered(seed=9), [str(i) for i in range(500)], normalized=True)
+        assert not np.array_equal(reloaded.components, first.components)
+
+    def test_truncated_projection_is_ignored(self, tmp_path):
+        """A projection file cut short by a crash is skipped, not raised."""
+        path = str(tmp_path / "projection")
+        build(clustered(), reduced_dim=8, projection_path=path)
+        with open(f"{path}.npz", "r+b") as f:
+            f.truncate(40)
+
+        reloaded = CompressedIndex(dim=64, reduced_dim=8, projection_path=path)
+        assert not reloaded.load_projection(path)
+        assert not [name for name in os.listdir(tmp_path) if name.startswith(".tmp-")]
@@ -0,0 +1,109 @@
+"""
+Unit tests for response compression and encoding-aware ETags.
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from routes.utils import compression
+from routes.utils.compression import RESPONSE_BYTES, CompressionMiddleware, negotiate
+from routes.utils.conditional import base_etag, cached, encoded_etag, not_modified
+
+TAG = '"0123456789abcdef"'
+BODY = b'{"data":[' + b",".join(b'{"title":"Scaling Kafka"}' for _ in range(200)) + b"]}"
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+
+
+@pytest.fixture
+def client(gzip_only):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=512)
+
+    @app.get("/big")
+    def big(request: Request) -> Response:
+        unchanged = not_modified(request, TAG, "articles")
+        if unchanged is not None:
+            return unchanged
+        return cached(Response(BODY, media_type="application/json"), TAG, "articles")
+
+    @app.get("/small")
+    def small() -> Response:
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    return TestClient(app)
+
+
+class TestNegotiate:
+    """Test cases for Accept-Encoding negotiation."""
+
+    def test_prefers_brotli_when_installed(self, monkeypatch):
+        """br wins ties over gzip, but only if it can be produced."""
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate("gzip, deflate, br") == "br"
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate("gzip, deflate, br") == "gzip"
+
+    def test_honours_weights(self, gzip_only):
+        """q=0 refuses a coding; no acceptable coding means identity."""
+        assert negotiate("gzip;q=0, identity") is None
+        assert negotiate("*;q=0.5") == "gzip"
+        assert negotiate("") is None
+        assert negotiate(None) is None
+
+
+class TestEtagVariants:
+    """Test cases for per-encoding ETags."""
+
+    def test_variant_round_trip(self):
+        """The encoded tag differs, and strips back to the base tag."""
+        assert encoded_etag(TAG, "gzip") == '"0123456789abcdef-gzip"'
+        assert base_etag(encoded_etag(TAG, "br")) == TAG
+        assert base_etag("W/" + TAG) == TAG
+
+
+class TestCompressionMiddleware:
+    """Test cases for CompressionMiddleware."""
+
+    def test_large_json_is_gzipped_with_its_own_etag(self, client):
+        """Compressed bodies carry Content-Encoding, Vary and a distinct strong tag."""
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == encoded_etag(TAG, "gzip")
+        assert response.content == BODY
+        assert int(response.headers["content-length"]) < len(BODY)
+
+    def test_output_is_deterministic(self, gzip_only):
+        """One tag always names the same compressed bytes."""
+        assert compression.compress(BODY, "gzip") == compression.compress(BODY, "gzip")
+        assert gzip.decompress(compression.compress(BODY, "gzip")) == BODY
+
+    def test_identity_and_small_bodies_pass_through(self, client):
+        """No acceptable coding, or a body under the minimum, is sent as is."""
+        plain = client.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+        assert plain.headers["etag"] == TAG
+        small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in small.headers
+
+    def test_revalidating_a_compressed_copy_gets_304(self, client):
+        """The encoded tag matches, and the 304 echoes it back."""
+        tag = client.get("/big", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        response = client.get(
+            "/big", headers={"Accept-Encoding": "gzip", "If-None-Match": tag}
+        )
+        assert response.status_code == 304
+        assert response.headers["etag"] == tag
+
+    def test_sizes_are_recorded_per_route(self, client):
+        """Wire bytes are labelled by route template and coding."""
+        before = RESPONSE_BYTES.labels("/big", "gzip")._sum.get()
+        client.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert RESPONSE_BYTES.labels("/big", "gzip")._sum.get() > before
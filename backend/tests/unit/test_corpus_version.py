@@ -0,0 +1,117 @@
+"""
+Unit tests for corpus versions, ETags and conditional GET helpers.
+"""
+
+from starlette.requests import Request
+
+from engine.article_store import ArticleStore
+from engine.corpus_version import BOOT_ID, CorpusVersions, etag
+from routes.utils.conditional import CACHE_POLICIES, cached, not_modified
+from tests.unit.fakes import FakeTable, article
+
+
+def request_with(if_none_match=None):
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class SharedCounter:
+    """Stands in for the corpus_versions table."""
+
+    def __init__(self, **versions):
+        self.versions = versions
+        self.reads = 0
+
+    def __call__(self):
+        self.reads += 1
+        return dict(self.versions)
+
+
+class TestCorpusVersions:
+    """Test cases for the cached shared counters."""
+
+    def test_reads_are_cached_until_the_poll_or_a_bump(self):
+        """Requests reuse the counters; a local write forces a refresh."""
+        counter = SharedCounter(articles=3, likes=7)
+        versions = CorpusVersions(fetch=counter, poll_seconds=3600)
+        assert versions.token("likes") == "7"
+        counter.versions["likes"] = 8
+        assert versions.token("likes") == "7"
+        versions.bump("likes")
+        assert versions.token("likes") == "8"
+        assert counter.reads == 2
+
+    def test_falls_back_to_per_process_counters(self):
+        """Without the table, tokens are local and carry the boot id."""
+
+        def missing():
+            raise RuntimeError("relation corpus_versions does not exist")
+
+        versions = CorpusVersions(fetch=missing, poll_seconds=0)
+        before = versions.token("articles")
+        versions.bump("articles")
+        assert before.startswith(BOOT_ID) and versions.token("articles") != before
+
+    def test_etag_is_strong_and_deterministic(self):
+        """Same inputs give the same quoted tag; different ones don't."""
+        assert etag("articles", "3") == etag("articles", "3")
+        assert etag("articles", "3") != etag("articles", "4")
+        assert etag("articles", "3").startswith('"') and not etag("x").startswith("W/")
+
+
+class TestConditionalGet:
+    """Test cases for If-None-Match handling."""
+
+    def test_matching_tag_gets_304(self):
+        """A listed (or weak-prefixed) tag matches; others don't."""
+        tag = etag("articles", "3")
+        response = not_modified(request_with(f'"other", W/{tag}'), tag, "articles")
+        assert response.status_code == 304
+        assert response.headers["etag"] == tag
+        assert response.headers["cache-control"] == CACHE_POLICIES["articles"]
+        assert not_modified(request_with('"other"'), tag, "articles") is None
+        assert not_modified(request_with(), tag, "articles") is None
+        assert not_modified(request_with("*"), tag, "articles") is not None
+
+    def test_cached_sets_headers(self):
+        """Full responses carry the ETag and the route policy."""
+        from fastapi import Response
+
+        response = cached(Response(b"{}"), '"x"', "counts")
+        assert response.headers["etag"] == '"x"'
+        assert response.headers["cache-control"] == CACHE_POLICIES["counts"]
+
+
+class TestStoreVersions:
+    """Test cases for syncs driven by the shared articles counter."""
+
+    def test_unchanged_counter_skips_the_delta_query(self):
+        """No writes since the last sync means no fetch at all."""
+        table = FakeTable([article(1)])
+        counter = SharedCounter(articles=1)
+        store = ArticleStore(fetch_page=table, fetch_version=lambda: counter()["articles"], dim=4)
+        store.load()
+        calls = len(table.calls)
+        store.sync()
+        assert len(table.calls) == calls
+        assert store.snapshot().token == "1"
+
+    def test_insert_is_merged_and_edit_forces_reload(self):
+        """Inserts explain the counter; an unexplained bump reloads everything."""
+        table = FakeTable([article(1), article(2)])
+        counter = SharedCounter(articles=2)
+        store = ArticleStore(fetch_page=table, fetch_version=lambda: counter()["articles"], dim=4)
+        store.load()
+
+        table.rows.append(article(3))
+        counter.versions["articles"] = 3
+        columns = store.sync()
+        assert len(columns) == 3 and columns.corpus_version == 3
+        assert table.calls[-1] is not None
+
+        table.rows[0] = article(1, title="Edited", inserted=table.rows[0]["inserted_at"])
+        counter.versions["articles"] = 4
+        columns = store.sync()
+        assert table.calls[-1] is None
+        assert columns.titles[columns.find("id-1")] == "Edited"
+        assert columns.token == "4"
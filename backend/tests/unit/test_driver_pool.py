@@ -0,0 +1,155 @@
+"""
+Unit tests for the scraper driver pool.
+"""
+
+import threading
+from typing import List
+
+import pytest
+
+from scraper.base import base_scraper
+from scraper.base.base_scraper import BaseBlogScraper
+from scraper.base.driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self.driver = driver
+
+    def new_window(self, kind: str) -> None:
+        self.driver.opened += 1
+        handle = f"tab-{self.driver.opened}"
+        self.driver.handles.append(handle)
+        self.driver.current_window_handle = handle
+
+    def window(self, handle: str) -> None:
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    def __init__(self, broken: bool = False) -> None:
+        self.handles: List[str] = ["home"]
+        self.current_window_handle = "home"
+        self.opened = 0
+        self.cdp: List[str] = []
+        self.quit_called = False
+        self.broken = broken
+        self.switch_to = FakeSwitchTo(self)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> None:
+        self.cdp.append(cmd)
+
+    def close(self) -> None:
+        if self.broken:
+            raise RuntimeError("browser went away")
+        self.handles.remove(self.current_window_handle)
+
+    def quit(self) -> None:
+        self.quit_called = True
+
+
+class Launcher:
+    def __init__(self, broken: bool = False) -> None:
+        self.drivers: List[FakeDriver] = []
+        self.broken = broken
+
+    def __call__(self) -> FakeDriver:
+        self.drivers.append(FakeDriver(self.broken))
+        return self.drivers[-1]
+
+
+class TabScraper(BaseBlogScraper):
+    def __init__(self) -> None:
+        super().__init__("Test Blog", "https://blog.test/", scroll_limit=0)
+
+
+class TestDriverPool:
+    """Test cases for DriverPool."""
+
+    def test_browser_is_started_lazily_and_reused(self):
+        """One browser serves successive leases, each in a new tab that is closed after."""
+        launch = Launcher()
+        pool = DriverPool(max_size=2, launch=launch)
+        assert launch.drivers == []
+        with pool.lease() as first:
+            assert first.current_window_handle == "tab-1"
+            assert "Network.setBlockedURLs" in first.cdp
+        with pool.lease() as second:
+            assert second is first and second.current_window_handle == "tab-2"
+        assert len(launch.drivers) == 1
+        assert first.handles == ["home"] and first.current_window_handle == "home"
+        assert pool.stats()["size"] == 1 and pool.stats()["in_use"] == 0
+        assert pool.stats()["leases"] == 2
+
+    def test_tab_is_closed_when_the_block_raises(self):
+        """The lease is returned even if the scrape fails."""
+        pool = DriverPool(launch=Launcher())
+        with pytest.raises(ValueError):
+            with pool.lease() as driver:
+                raise ValueError("parse failed")
+        assert driver.handles == ["home"]
+        assert pool.stats()["in_use"] == 0 and pool.stats()["idle"] == 1
+
+    def test_broken_browser_is_replaced(self):
+        """A browser whose tab can't be closed is quit and not handed out again."""
+        launch = Launcher(broken=True)
+        pool = DriverPool(launch=launch)
+        with pool.lease():
+            pass
+        assert launch.drivers[0].quit_called
+        assert pool.stats()["size"] == 0
+        with pool.lease() as driver:
+            assert driver is launch.drivers[1]
+
+    def test_waits_for_a_browser_up_to_the_limit(self):
+        """Leases beyond max_size wait, then time out."""
+        pool = DriverPool(max_size=1, wait_seconds=0.2, launch=Launcher())
+        holding, release = threading.Event(), threading.Event()
+
+        def hold():
+            with pool.lease():
+                holding.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait(5)
+        with pytest.raises(TimeoutError):
+            with pool.lease():
+                pass
+        release.set()
+        thread.join()
+        assert pool.stats()["waited_seconds"] >= 0.2
+        with pool.lease():
+            assert pool.stats()["size"] == 1
+
+    def test_idle_browsers_are_quit(self):
+        """Browsers idle past idle_seconds are quit instead of reused."""
+        launch = Launcher()
+        pool = DriverPool(idle_seconds=0, launch=launch)
+        with pool.lease():
+            pass
+        with pool.lease():
+            pass
+        assert launch.drivers[0].quit_called and len(launch.drivers) == 2
+        pool.close()
+        assert launch.drivers[1].quit_called and pool.stats()["size"] == 0
+
+
+class TestScraperBrowserSession:
+    """Test cases for BaseBlogScraper's leased browser."""
+
+    def test_scraper_leases_a_tab_only_when_used(self, monkeypatch):
+        """Creating a scraper starts no browser; a session returns its tab to the pool."""
+        launch = Launcher()
+        pool = DriverPool(launch=launch)
+        monkeypatch.setattr(base_scraper, "get_driver_pool", lambda: pool)
+        scraper = TabScraper()
+        assert launch.drivers == []
+        with scraper.browser_session() as driver:
+            assert scraper.driver is driver
+            assert pool.stats()["in_use"] == 1
+        assert pool.stats()["in_use"] == 0
+        with scraper.browser_session() as again:
+            assert again is driver
+        assert len(launch.drivers) == 1
@@ -0,0 +1,93 @@
+"""
+Unit tests for the query embedding cache.
+"""
+
+import numpy as np
+
+from engine.embedding_cache import CACHE_MISSES, EmbeddingCache, normalize_query
+
+MODEL = "test-model"
+
+
+class CountingEncoder:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, text: str) -> np.ndarray:
+        self.calls += 1
+        return np.full(4, len(text), dtype=np.float32)
+
+
+class TestEmbeddingCache:
+    """Test cases for the LRU + TTL embedding cache."""
+
+    def test_normalized_queries_share_an_entry(self):
+        """Case and whitespace variants of a query hit the same entry."""
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path="")
+        encode = CountingEncoder()
+        cache.get_or_compute(MODEL, "Machine  Learning", encode)
+        cache.get_or_compute(MODEL, " machine learning ", encode)
+        assert encode.calls == 1
+        assert normalize_query("  Ｍachine\tLEARNING ") == "machine learning"
+
+    def test_model_version_is_part_of_the_key(self):
+        """The same text under another model version is a miss."""
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path="")
+        cache.put(MODEL, "query", [1.0, 2.0])
+        assert cache.get("other-model", "query") is None
+
+    def test_lru_eviction_and_ttl_expiry(self):
+        """The least recently used entry is evicted and expired entries miss."""
+        cache = EmbeddingCache(max_entries=2, ttl_seconds=60, persist_path="")
+        cache.put(MODEL, "a", [1.0])
+        cache.put(MODEL, "b", [2.0])
+        cache.get(MODEL, "a")
+        cache.put(MODEL, "c", [3.0])
+        assert cache.get(MODEL, "b") is None
+        assert cache.get(MODEL, "a") is not None
+
+        expiring = EmbeddingCache(max_entries=2, ttl_seconds=1e-9, persist_path="")
+        expiring.put(MODEL, "a", [1.0])
+        misses = CACHE_MISSES._value.get()
+        assert expiring.get(MODEL, "a") is None
+        assert CACHE_MISSES._value.get() == misses + 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        """A new cache instance reads entries persisted by a previous one."""
+        path = str(tmp_path / "embeddings.sqlite")
+        first = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path=path)
+        first.put(MODEL, "q", [0.5, 1.5])
+        first.flush()
+
+        restarted = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path=path)
+        np.testing.assert_array_equal(restarted.get(MODEL, "Q"), [0.5, 1.5])
+        assert len(restarted) == 1
+
+    def test_memory_only_lookup_leaves_the_disk_for_a_worker_thread(self, tmp_path):
+        """disk=False never touches SQLite; get_from_disk then fills the memory tier."""
+        path = str(tmp_path / "embeddings.sqlite")
+        first = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path=path)
+        first.put(MODEL, "q", [0.5])
+        first.flush()
+
+        restarted = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path=path)
+        assert restarted.get(MODEL, "q", disk=False) is None
+        assert restarted._db is None
+        np.testing.assert_array_equal(restarted.get_from_disk(MODEL, "q"), [0.5])
+        assert restarted.get(MODEL, "q", disk=False) is not None
+
+    def test_writer_prunes_expired_rows(self, tmp_path):
+        """The background writer deletes rows older than the TTL from the file."""
+        path = str(tmp_path / "embeddings.sqlite")
+        cache = EmbeddingCache(max_entries=10, ttl_seconds=60, persist_path=path)
+        cache.put(MODEL, "old", [1.0])
+        cache.flush()
+        with cache._db_lock:
+            cache._db.execute("UPDATE embeddings SET created_at = 0")
+            cache._db.commit()
+        cache._pruned_at = 0.0
+        cache.put(MODEL, "new", [2.0])
+        cache.flush()
+        with cache._db_lock:
+            rows = cache._db.execute("SELECT query FROM embeddings").fetchall()
+        assert rows == [("new",)]
@@ -0,0 +1,74 @@
+"""
+Unit tests for the embedding worker pool.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from engine.embedding_pool import EmbeddingWorkerPool, EncoderSaturated
+
+
+class BlockingModel:
+    """Encoder that waits on an event, so requests can be held in flight."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.release.set()
+
+    def encode(self, texts, batch_size=32, device="cpu"):
+        self.release.wait(timeout=5)
+        return np.array([[float(len(t))] * 4 for t in texts], dtype=np.float32)
+
+
+class TestEmbeddingWorkerPool:
+    """Test cases for off-loop encoding, backpressure and health."""
+
+    def test_encode_does_not_block_the_event_loop(self):
+        """Other coroutines keep running while an encode is in flight."""
+        model = BlockingModel()
+        model.release.clear()
+        pool = EmbeddingWorkerPool("test", processes=0, local_model_factory=lambda: model)
+
+        async def scenario():
+            task = asyncio.ensure_future(pool.encode("hello"))
+            ticks = 0
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            model.release.set()
+            return ticks, await task
+
+        ticks, vector = asyncio.run(scenario())
+        assert ticks == 5
+        assert vector[0] == 5.0
+
+    def test_saturated_pool_rejects_requests(self):
+        """Requests beyond max_pending fail fast with EncoderSaturated."""
+        model = BlockingModel()
+        model.release.clear()
+        pool = EmbeddingWorkerPool(
+            "test", processes=0, local_model_factory=lambda: model, max_pending=1
+        )
+
+        async def scenario():
+            first = asyncio.ensure_future(pool.encode("a"))
+            await asyncio.sleep(0.01)
+            with pytest.raises(EncoderSaturated):
+                await pool.encode("b")
+            assert pool.health()["status"] == "saturated"
+            model.release.set()
+            await first
+
+        asyncio.run(scenario())
+        health = pool.health()
+        assert health["status"] == "ok"
+        assert health["completed"] == 1
+        assert health["pending"] == 0
+
+    def test_local_mode_requires_a_model(self):
+        """Thread mode without a model is a configuration error."""
+        with pytest.raises(ValueError):
+            EmbeddingWorkerPool("test", processes=0)
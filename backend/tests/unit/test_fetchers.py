@@ -0,0 +1,110 @@
+"""
+Unit tests for the scraper page fetchers and paginated fetching.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import List
+
+import httpx
+from bs4 import BeautifulSoup, Tag
+
+from scraper.base.base_scraper import BaseBlogScraper
+from scraper.base.fetchers import HttpFetcher, PageFetcher
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "scraper"
+LISTING = (FIXTURES / "stripe_page.html").read_text()
+EMPTY = (FIXTURES / "empty_page.html").read_text()
+
+
+def blog_transport(last_page: int, in_flight: List[int] = None) -> httpx.MockTransport:
+    """Pages 1..last_page have posts, the next is empty, later ones are 404."""
+    active = [0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        active[0] += 1
+        if in_flight is not None:
+            in_flight.append(active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+        page = int(request.url.path.rstrip("/").rsplit("/", 1)[-1])
+        if page <= last_page:
+            return httpx.Response(200, text=LISTING.replace("<main>", f"<main data-page='{page}'>"))
+        if page == last_page + 1:
+            return httpx.Response(200, text=EMPTY)
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+class FakeBrowser(PageFetcher):
+    name = "webdriver"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.urls: List[str] = []
+
+    def _fetch(self, urls):
+        self.urls.extend(urls)
+        return [LISTING for _ in urls]
+
+
+class PagedScraper(BaseBlogScraper):
+    fetcher = "http"
+
+    def __init__(self, transport: httpx.MockTransport) -> None:
+        super().__init__("Test Blog", "https://blog.test/page/1", scroll_limit=0)
+        self.transport = transport
+        self.browser = FakeBrowser()
+
+    def make_fetcher(self, kind: str) -> PageFetcher:
+        if kind == "http":
+            return HttpFetcher(concurrency=4, transport=self.transport)
+        return self.browser
+
+    def select_posts(self, soup: BeautifulSoup) -> List[Tag]:
+        return soup.select("article.BlogIndexPost")
+
+
+def urls(n: int) -> List[str]:
+    return [f"https://blog.test/page/{page}" for page in range(1, n + 1)]
+
+
+class TestHttpFetcher:
+    """Test cases for HttpFetcher."""
+
+    def test_pages_in_order_with_missing_pages_as_none(self):
+        """Responses line up with the URLs; error statuses become None."""
+        fetcher = HttpFetcher(concurrency=3, transport=blog_transport(last_page=2))
+        pages = fetcher.fetch_pages(urls(4))
+        assert "data-page='1'" in pages[0] and "data-page='2'" in pages[1]
+        assert pages[2] == EMPTY and pages[3] is None
+        assert fetcher.pages_fetched == 3 and fetcher.pages_per_second() > 0
+
+    def test_concurrency_is_capped(self):
+        """No more than ``concurrency`` requests are in flight."""
+        in_flight: List[int] = []
+        fetcher = HttpFetcher(concurrency=3, transport=blog_transport(20, in_flight))
+        fetcher.fetch_pages(urls(12))
+        assert max(in_flight) == 3
+
+
+class TestFetchPaginated:
+    """Test cases for BaseBlogScraper.fetch_paginated."""
+
+    def test_stops_at_the_first_empty_page(self):
+        """Pages after the last listing page are not kept."""
+        scraper = PagedScraper(blog_transport(last_page=6))
+        soups = scraper.fetch_paginated(urls(40))
+        assert len(soups) == 6
+        assert scraper.fetch_report["fetcher"] == "http"
+        # At most one window is fetched past the end.
+        assert scraper.fetch_report["pages"] <= 6 + 4
+
+    def test_falls_back_to_the_browser(self):
+        """A first page without posts over HTTP switches the run to the browser."""
+        scraper = PagedScraper(blog_transport(last_page=0))
+        soups = scraper.fetch_paginated(urls(3))
+        assert len(soups) == 3
+        assert scraper.browser.urls == urls(3)
+        assert scraper.fetch_report["fetcher"] == "webdriver"
@@ -0,0 +1,32 @@
+"""
+Unit tests for the fields= sparse fieldset parameter.
+"""
+
+import pytest
+
+from engine.article_store import RESPONSE_FIELDS
+from routes.utils.fields import SEARCH_DEFAULT_FIELDS, SEARCH_FIELDS, parse_fields
+
+
+class TestParseFields:
+    """Test cases for parse_fields."""
+
+    def test_defaults_to_every_field(self):
+        """Leaving fields out (or empty) returns the full representation."""
+        assert parse_fields(None, RESPONSE_FIELDS) == RESPONSE_FIELDS
+        assert parse_fields(" , ", RESPONSE_FIELDS) == RESPONSE_FIELDS
+
+    def test_search_leaves_content_out_by_default(self):
+        """Search results only carry the article body when it is requested."""
+        assert "content" not in parse_fields(None, SEARCH_FIELDS, SEARCH_DEFAULT_FIELDS)
+        assert "content" in parse_fields("title,content", SEARCH_FIELDS, SEARCH_DEFAULT_FIELDS)
+
+    def test_subset_in_canonical_order(self):
+        """Requested order and duplicates don't change the result."""
+        assert parse_fields("source, title,title", RESPONSE_FIELDS) == ("title", "source")
+
+    def test_unknown_field_is_rejected(self):
+        """content is a search field, not an article listing field."""
+        assert parse_fields("content", SEARCH_FIELDS) == ("content",)
+        with pytest.raises(ValueError, match="content"):
+            parse_fields("title,content", RESPONSE_FIELDS)
@@ -0,0 +1,65 @@
+"""
+Unit tests for the per-article JSON fragment cache.
+"""
+
+import json
+
+from engine.article_store import RESPONSE_FIELDS, ArticleColumns
+from engine.fragment_cache import FragmentCache, json_array
+from tests.unit.fakes import article
+
+
+class TestFragmentCache:
+    """Test cases for fragment reuse, keys and invalidation."""
+
+    def setup_method(self):
+        self.columns = ArticleColumns([article(n) for n in range(5)], dim=4)
+        self.cache = FragmentCache()
+
+    def test_fragments_join_into_the_listing_json(self):
+        """Concatenated fragments equal serializing the response rows directly."""
+        positions = self.columns.select()
+        body = json_array(self.cache.fragments(self.columns, positions, RESPONSE_FIELDS))
+        assert json.loads(body) == self.columns.responses(positions)
+
+    def test_second_request_is_served_from_cache(self):
+        """Repeated pages only serialize each article once."""
+        positions = self.columns.select()[:3]
+        self.cache.fragments(self.columns, positions, RESPONSE_FIELDS)
+        self.cache.fragments(self.columns, positions, RESPONSE_FIELDS)
+        stats = self.cache.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (3, 3, 0.5)
+        assert stats["entries"] == 3 and stats["bytes"] > 0
+
+    def test_field_set_and_revision_are_part_of_the_key(self):
+        """A different field set or an edited row gets its own fragment."""
+        self.cache.fragments(self.columns, [0], RESPONSE_FIELDS)
+        (fragment,) = self.cache.fragments(self.columns, [0], ("title", "url"))
+        assert set(json.loads(fragment)) == {"title", "url"}
+        edited = ArticleColumns([article(4, title="Edited", updated_at="2024-02-01")], dim=4)
+        (fragment,) = self.cache.fragments(edited, [0], RESPONSE_FIELDS)
+        assert json.loads(fragment)["title"] == "Edited"
+        assert self.cache.stats()["hits"] == 0
+
+    def test_merge_keeps_revisions_of_unchanged_rows(self):
+        """A delta sync doesn't invalidate fragments of rows it didn't touch."""
+        self.cache.fragments(self.columns, self.columns.select(), RESPONSE_FIELDS)
+        merged = self.columns.merged([article(9)], version=2)
+        self.cache.fragments(merged, merged.select(), RESPONSE_FIELDS)
+        assert self.cache.stats()["misses"] == 6
+
+    def test_invalidate_drops_every_fragment_of_an_id(self):
+        """Invalidation by id covers all field sets."""
+        self.cache.fragments(self.columns, [0, 1], RESPONSE_FIELDS)
+        self.cache.fragments(self.columns, [0], ("title",))
+        assert self.cache.invalidate([self.columns.ids[0]]) == 2
+        assert len(self.cache) == 1
+
+    def test_byte_budget_evicts_least_recently_used(self):
+        """Fragments past the budget evict the oldest ones."""
+        (fragment,) = self.cache.fragments(self.columns, [0], RESPONSE_FIELDS)
+        cache = FragmentCache(max_bytes=len(fragment) * 2 + 10)
+        cache.fragments(self.columns, [0, 1, 2], RESPONSE_FIELDS)
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] <= cache.max_bytes
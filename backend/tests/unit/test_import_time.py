@@ -0,0 +1,63 @@
+"""
+Import-time budget for the API process.
+
+Importing ``app`` must stay cheap: the scraping and ML stack (Selenium,
+KeyBERT, sentence-transformers, torch) loads lazily or during warmup, never on
+the import path. ``python -X importtime`` gives per-module timings, and the
+slowest modules are printed when the budget is exceeded.
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+import pytest
+
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_BUDGET_SECONDS", "3.0"))
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "keybert", "selenium", "scraper")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def import_times(module: str) -> Dict[str, Tuple[int, int]]:
+    """Map each module imported by ``import module`` to (self, cumulative) microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "WARMUP_MODELS": "false"},
+    )
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    assert result.returncode == 0, result.stderr[-2000:]
+    return times
+
+
+def slowest(times: Dict[str, Tuple[int, int]], n: int = 15) -> str:
+    ranked = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:n]
+    return "\n".join(f"{us / 1000:8.1f} ms  {name}" for name, (us, _) in ranked)
+
+
+class TestImportTime:
+    """Test cases for keeping API startup fast."""
+
+    def test_app_imports_within_budget(self):
+        """Importing the app finishes within IMPORT_BUDGET_SECONDS."""
+        times = import_times("app")
+        total = times["app"][1] / 1e6
+        assert total <= IMPORT_BUDGET_SECONDS, (
+            f"Importing app took {total:.2f}s (budget {IMPORT_BUDGET_SECONDS}s). "
+            f"Slowest modules:\n{slowest(times)}"
+        )
+
+    @pytest.mark.parametrize("heavy", HEAVY_MODULES)
+    def test_app_does_not_import_ml_or_scraping_stack(self, heavy):
+        """Models and scrapers load lazily, not when the app is imported."""
+        times = import_times("app")
+        loaded = [name for name in times if name == heavy or name.startswith(heavy + ".")]
+        assert not loaded, f"Importing app pulled in {loaded[:5]}"
@@ -0,0 +1,48 @@
+"""
+Unit tests for inference backend selection and the parity check.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+from engine.inference import load_model, parity_check
+
+
+class FakeEncoder:
+    """Deterministic encoder: a fixed random vector per sentence, plus optional noise."""
+
+    def __init__(self, noise: float = 0.0) -> None:
+        self.noise = noise
+
+    def encode(self, sentences, batch_size=32):
+        vectors = []
+        for sentence in sentences:
+            rng = np.random.default_rng(zlib.crc32(sentence.encode()))
+            vectors.append(rng.standard_normal(32))
+        vectors = np.array(vectors)
+        if self.noise:
+            vectors += self.noise * np.random.default_rng(0).standard_normal(vectors.shape)
+        return vectors
+
+
+class TestInferenceBackends:
+    """Test cases for backend configuration and accuracy parity."""
+
+    def test_unknown_backend_is_rejected(self):
+        """An unsupported backend name fails before any model is loaded."""
+        with pytest.raises(ValueError):
+            load_model(backend="tensorrt")
+
+    def test_parity_passes_for_close_embeddings(self):
+        """Small quantization-like noise keeps cosine agreement above the threshold."""
+        report = parity_check(FakeEncoder(noise=0.01), FakeEncoder())
+        assert report["passed"]
+        assert report["min_cosine"] > 0.99
+        assert report["nearest_neighbour_agreement"] == 1.0
+
+    def test_parity_fails_for_divergent_embeddings(self):
+        """A backend that changes the embeddings substantially fails the check."""
+        report = parity_check(FakeEncoder(noise=1.0), FakeEncoder())
+        assert not report["passed"]
@@ -0,0 +1,96 @@
+"""
+Unit tests for incremental extraction on "Load More" sources.
+"""
+
+from types import SimpleNamespace
+from typing import List
+
+from scraper.companies.meta import MetaEngineeringScraper
+from scraper.utils.waits import PageWaits
+
+
+def meta_post(n: int) -> str:
+    return (
+        f'<article class="post"><h2 class="entry-title">'
+        f'<a href="https://engineering.fb.com/post-{n}/">Post {n}</a></h2>'
+        f'<span class="cat-links"><a class="category">Infra</a></span></article>'
+    )
+
+
+class FakeButton:
+    def __init__(self, page: "LoadMorePage") -> None:
+        self.page = page
+
+    def is_displayed(self) -> bool:
+        return self.page.shown < len(self.page.batches)
+
+
+class LoadMorePage:
+    """A feed that appends one batch of posts per "Load More" click."""
+
+    def __init__(self, batches: List[List[int]]) -> None:
+        self.batches = batches
+        self.shown = 1
+        self.offsets: List[int] = []
+
+    @property
+    def page_source(self) -> str:
+        raise AssertionError("the whole document should not be re-read")
+
+    def _posts(self) -> List[str]:
+        return [meta_post(n) for batch in self.batches[: self.shown] for n in batch]
+
+    def get(self, url: str) -> None:
+        self.shown = 1
+
+    def find_element(self, by: str, value: str) -> FakeButton:
+        return FakeButton(self)
+
+    def execute_script(self, script: str, *args):
+        if "click()" in script:
+            self.shown += 1
+            return None
+        if "slice" in script:
+            self.offsets.append(args[1])
+            return self._posts()[args[1]:]
+        if "querySelectorAll" in script:
+            return len(self._posts())
+        if "getEntriesByType" in script:
+            return ["complete", self.shown, 0]
+        raise AssertionError(script)
+
+
+class RecordingMetaScraper(MetaEngineeringScraper):
+    def __init__(self, page: LoadMorePage) -> None:
+        super().__init__()
+        self._driver = page
+        self.waits = PageWaits(timeout=1, poll_interval=0.01, idle_seconds=0.05)
+        self.enriched: List[str] = []
+
+    def enrich_article(self, title, url, published_date, summary=""):
+        self.enriched.append(url)
+        return SimpleNamespace(title=title, url=url, tags=[])
+
+
+class TestIncrementalLoadMore:
+    """Test cases for reading only newly appended posts."""
+
+    def test_each_click_reads_only_appended_posts(self):
+        """Posts are read from the offset of the last batch, never the whole DOM again."""
+        page = LoadMorePage([[1, 2, 3], [4, 5], [6, 7, 8]])
+        scraper = RecordingMetaScraper(page)
+        posts = scraper.get_posts()
+        assert page.offsets == [0, 3, 5]
+        assert len(posts) == 8
+        assert posts[-1].name == "article" and "post-8" in posts[-1].select_one("a")["href"]
+
+    def test_duplicates_are_dropped_before_enrichment(self):
+        """A post repeated in a later batch is enriched once, and the run reports it."""
+        page = LoadMorePage([[1, 2, 3], [3, 4], [4, 5]])
+        scraper = RecordingMetaScraper(page)
+        articles = scraper.scrape()
+        assert [a.url for a in articles] == [
+            f"https://engineering.fb.com/post-{n}/" for n in (1, 2, 3, 4, 5)
+        ]
+        assert len(scraper.enriched) == 5
+        assert scraper.extract_report == {"posts_parsed": 7, "unique_posts": 5, "duplicates": 2}
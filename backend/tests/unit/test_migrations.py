@@ -0,0 +1,56 @@
+"""
+Unit tests for migration discovery and bookkeeping.
+"""
+
+import pytest
+
+from db.migrate import Migration, MigrationError, discover, pending
+
+
+def write(directory, name, sql="SELECT 1;"):
+    (directory / name).write_text(sql)
+
+
+class TestDiscover:
+    """Test cases for reading the migrations directory."""
+
+    def test_orders_by_version_and_ignores_other_files(self, tmp_path):
+        """Migrations come back in version order; non-SQL files are skipped."""
+        write(tmp_path, "0002_second.sql")
+        write(tmp_path, "0001_first.sql")
+        (tmp_path / "README.md").write_text("notes")
+        assert [(m.version, m.name) for m in discover(str(tmp_path))] == [
+            (1, "first"),
+            (2, "second"),
+        ]
+
+    def test_rejects_bad_names_and_duplicate_versions(self, tmp_path):
+        """File names must carry a four-digit version, used only once."""
+        write(tmp_path, "add_index.sql")
+        with pytest.raises(MigrationError):
+            discover(str(tmp_path))
+        (tmp_path / "add_index.sql").unlink()
+        write(tmp_path, "0001_a.sql")
+        write(tmp_path, "0001_b.sql")
+        with pytest.raises(MigrationError):
+            discover(str(tmp_path))
+
+    def test_shipped_migrations_are_well_formed(self):
+        """The repository's own migrations load and start at version 1."""
+        migrations = discover()
+        assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+
+
+class TestPending:
+    """Test cases for deciding what still has to run."""
+
+    def test_skips_applied_migrations(self):
+        """Only versions missing from the ledger are pending."""
+        first, second = Migration(1, "first", "SELECT 1;"), Migration(2, "second", "SELECT 2;")
+        assert pending([first, second], {1: first.checksum}) == [second]
+
+    def test_edited_migration_is_an_error(self):
+        """A checksum mismatch means an applied migration was changed."""
+        migration = Migration(1, "first", "SELECT 1;")
+        with pytest.raises(MigrationError):
+            pending([migration], {1: "not-the-checksum"})
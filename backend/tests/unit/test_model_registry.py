@@ -0,0 +1,74 @@
+"""
+Unit tests for the shared model registry.
+"""
+
+import numpy as np
+import pytest
+
+import engine.model_registry as registry
+
+
+class FakeModel:
+    """Stand-in encoder recording which backend it was loaded for."""
+
+    def __init__(self, name: str, backend: str) -> None:
+        self.name = name
+        self.backend = backend
+
+    def encode(self, texts, batch_size=32, device="cpu"):
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+@pytest.fixture
+def fake_loader(monkeypatch):
+    loads = []
+
+    def load_model(name, backend):
+        loads.append((name, backend))
+        return FakeModel(name, backend)
+
+    monkeypatch.setattr(registry, "load_model", load_model)
+    states = (registry._models, registry._keybert, registry._pools, registry._stats)
+    saved = [dict(state) for state in states]
+    for state in states:
+        state.clear()
+    yield loads
+    registry.close_pools()
+    for state, before in zip(states, saved):
+        state.clear()
+        state.update(before)
+
+class TestModelRegistry:
+    """Test cases for sharing one model instance per (model, backend)."""
+
+    def test_one_instance_per_model_and_backend(self, fake_loader):
+        """Repeated lookups return the same instance and load it once."""
+        first = registry.get_model("m", "torch")
+        second = registry.get_model("m", "TORCH")
+        assert first is second
+        assert fake_loader == [("m", "torch")]
+
+    def test_backends_are_separate_instances(self, fake_loader):
+        """A different backend of the same model is loaded separately."""
+        fp32 = registry.get_model("m", "torch")
+        int8 = registry.get_model("m", "onnx-int8")
+        assert fp32 is not int8
+        assert sorted(registry.loaded_models()) == [("m", "onnx-int8"), ("m", "torch")]
+
+    def test_memory_report_lists_loaded_models(self, fake_loader):
+        """Each load records its resident memory and load time."""
+        registry.get_model("m", "torch")
+        report = registry.memory_report()
+        assert len(report) == 1
+        assert report[0]["model"] == "m"
+        assert report[0]["backend"] == "torch"
+        assert report[0]["resident_bytes"] >= 0
+
+    def test_pool_encodes_with_the_shared_instance(self, fake_loader):
+        """The embedding pool reuses the registry's model instead of loading another."""
+        pool = registry.get_pool("m", "torch")
+        assert registry.get_pool("m", "torch") is pool
+        assert fake_loader == []
+        vector = pool.encode_sync("hello")
+        assert vector.shape == (4,)
+        assert fake_loader == [("m", "torch")]
@@ -0,0 +1,105 @@
+"""
+Unit tests for the concurrent scrape-all orchestrator.
+
+Targets are module-level so spawned workers can import them.
+"""
+
+import os
+import subprocess
+import time
+
+from routes.utils.scrape_all import run_scrape_all
+
+
+def quick(source):
+    time.sleep(0.5)
+    return {"scraped": 3, "saved": 1, "updated": 2, "ids": [f"{source}-1"]}
+
+
+def flaky(source):
+    if source == "broken":
+        raise RuntimeError("selector not found")
+    return quick(source)
+
+
+def hangs(source):
+    if source == "slow":
+        time.sleep(60)
+    return quick(source)
+
+
+def crashes(source):
+    if source == "crash":
+        os._exit(3)
+    return quick(source)
+
+
+def starts_browser(pid_file):
+    # Stands in for a scraper whose Chrome outlives a hung scrape.
+    child = subprocess.Popen(["sleep", "60"])
+    with open(pid_file, "w") as f:
+        f.write(str(child.pid))
+    time.sleep(60)
+
+
+def alive(pid):
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+class TestRunScrapeAll:
+    """Test cases for run_scrape_all."""
+
+    def test_sources_run_concurrently(self):
+        """Four 0.5s sources with two slots take about 1s, not 2s."""
+        report = run_scrape_all(["a", "b", "c", "d"], concurrency=2, timeout=30, target=quick)
+        assert [r.source for r in report.sources] == ["a", "b", "c", "d"]
+        assert report.succeeded == 4 and report.failed == 0
+        assert report.wall_seconds < report.serial_seconds
+        assert report.sources[0].scraped == 3 and report.sources[0].saved == 1
+
+    def test_failure_is_isolated(self):
+        """An exception fails its own source only, with the error reported."""
+        done = []
+        report = run_scrape_all(
+            ["ok", "broken"],
+            concurrency=2,
+            timeout=30,
+            target=flaky,
+            on_done=lambda source, payload: done.append((source, payload["ids"])),
+        )
+        statuses = {r.source: r for r in report.sources}
+        assert statuses["ok"].status == "ok"
+        assert statuses["broken"].status == "failed"
+        assert "selector not found" in statuses["broken"].error
+        assert done == [("ok", ["ok-1"])]
+
+    def test_timeout_terminates_the_source(self):
+        """A hung source is stopped at its deadline; the others finish."""
+        report = run_scrape_all(["slow", "fast"], concurrency=2, timeout=8, target=hangs)
+        statuses = {r.source: r.status for r in report.sources}
+        assert statuses == {"slow": "timeout", "fast": "ok"}
+        assert report.wall_seconds < 30
+
+    def test_dead_worker_is_reported(self):
+        """A worker that exits without a result counts as failed."""
+        report = run_scrape_all(["crash", "fine"], concurrency=1, timeout=30, target=crashes)
+        statuses = {r.source: r for r in report.sources}
+        assert statuses["crash"].status == "failed"
+        assert "exited" in statuses["crash"].error
+        assert statuses["fine"].status == "ok"
+
+    def test_timeout_kills_the_workers_browsers(self, tmp_path):
+        """Processes the worker started (Chrome, chromedriver) die with it at the deadline."""
+        pid_file = str(tmp_path / "child.pid")
+        report = run_scrape_all([pid_file], concurrency=1, timeout=8, target=starts_browser)
+        assert report.sources[0].status == "timeout"
+        with open(pid_file) as f:
+            child = int(f.read())
+        deadline = time.monotonic() + 5
+        while alive(child) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not alive(child)
@@ -0,0 +1,170 @@
+"""
+Unit tests for sharded scatter-gather search.
+"""
+
+import multiprocessing
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from engine.sharding import ShardedIndex, ShardLink, serve, shard_ranges
+from engine.vector_index import VectorIndex
+
+
+def make_corpus(n: int = 200, dim: int = 16, seed: int = 0):
+    matrix = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    ids = [f"https://example.com/{i}" for i in range(n)]
+    return matrix, ids, [{"url": i} for i in ids]
+
+
+AUTHKEY = b"test"
+
+
+def start_server() -> int:
+    """Start a TCP shard server on a free port and return the port."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    threading.Thread(target=serve, args=("127.0.0.1", port, AUTHKEY), daemon=True).start()
+    time.sleep(0.2)
+    return port
+
+
+@pytest.fixture
+def sharded():
+    index = ShardedIndex(dim=16, num_shards=3)
+    yield index
+    index.close()
+
+
+class TestShardRanges:
+    """Test cases for splitting rows between shards."""
+
+    def test_ranges_cover_all_rows(self):
+        """Ranges are contiguous, near-equal and cover every row."""
+        ranges = shard_ranges(10, 3)
+        assert ranges[0][0] == 0 and ranges[-1][1] == 10
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+        assert max(stop - start for start, stop in ranges) <= 4
+
+
+class TestShardedIndex:
+    """Test cases for the scatter-gather coordinator."""
+
+    def test_matches_exact_search(self, sharded):
+        """Merged shard results equal a single exact index."""
+        matrix, ids, metadata = make_corpus()
+        exact = VectorIndex(dim=16)
+        exact.build_from_matrix(matrix, ids, metadata)
+        sharded.build_from_matrix(matrix, ids, metadata)
+
+        query = np.random.default_rng(1).standard_normal(16)
+        expected = [m["url"] for _, m in exact.search(query, top_k=10)]
+        assert [m["url"] for _, m in sharded.search(query, top_k=10)] == expected
+        assert sorted(sharded.last_latencies) == [0, 1, 2]
+
+    def test_coordinator_releases_matrix(self, sharded):
+        """Only the shards hold embedding rows after a build."""
+        matrix, ids, metadata = make_corpus()
+        sharded.build_from_matrix(matrix, ids, metadata)
+        assert sharded.matrix.shape[0] == 0
+        assert len(sharded.ids) == 200
+
+    def test_grows_and_rebalances(self):
+        """A corpus larger than the shard cap starts more shards; new shards get rows."""
+        index = ShardedIndex(dim=16, num_shards=1, max_shard_rows=50)
+        try:
+            matrix, ids, metadata = make_corpus()
+            index.build_from_matrix(matrix, ids, metadata)
+            assert index.num_shards == 4
+
+            index.add_shard()
+            assert index.num_shards == 5
+            query = matrix[123]
+            assert index.search(query, top_k=1)[0][1]["url"] == ids[123]
+        finally:
+            index.close()
+
+
+class TestShardLink:
+    """Test cases for matching shard replies to requests."""
+
+    def test_late_reply_is_not_read_by_the_next_request(self):
+        """A reply to a timed-out request is dropped; the next request gets its own."""
+        coordinator, shard = multiprocessing.Pipe()
+
+        def slow_first_reply():
+            for delay in (0.3, 0.0):
+                command, seq = shard.recv()
+                time.sleep(delay)
+                shard.send(("ok", seq, command))
+
+        thread = threading.Thread(target=slow_first_reply)
+        thread.start()
+        link = ShardLink(coordinator)
+        with pytest.raises(TimeoutError):
+            link.request("first", timeout=0.05)
+        time.sleep(0.4)
+        assert link.request("second", timeout=2)[2] == "second"
+        thread.join()
+        link.close()
+
+    def test_server_shares_rows_between_coordinators(self):
+        """Two coordinators (API workers) at one version share the shard's rows."""
+        port = start_server()
+        matrix, ids, metadata = make_corpus()
+        first = ShardedIndex(dim=16, addresses=[("127.0.0.1", port)], authkey=AUTHKEY)
+        second = ShardedIndex(dim=16, addresses=[("127.0.0.1", port)], authkey=AUTHKEY)
+        try:
+            first.build_from_matrix(matrix, ids, metadata, version="7")
+            # The second coordinator attaches to the loaded slice instead of sending rows.
+            second.build_from_matrix(np.zeros_like(matrix), ids, metadata, version="7")
+            assert second.token == first.token
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                hits = list(pool.map(lambda i: second.search(matrix[i], top_k=1), range(20)))
+            assert [hit[0][1]["url"] for hit in hits] == ids[:20]
+        finally:
+            first.close()
+            second.close()
+
+    def test_server_keeps_coordinators_at_different_versions_apart(self):
+        """A worker at another version loads its own slice and does not clobber the other's."""
+        port = start_server()
+        old_matrix, old_ids, old_metadata = make_corpus(n=200, seed=0)
+        new_matrix, new_ids, new_metadata = make_corpus(n=150, seed=1)
+        new_ids = [f"{url}/new" for url in new_ids]
+        new_metadata = [{"url": url} for url in new_ids]
+        old = ShardedIndex(dim=16, addresses=[("127.0.0.1", port)], authkey=AUTHKEY)
+        new = ShardedIndex(dim=16, addresses=[("127.0.0.1", port)], authkey=AUTHKEY)
+        try:
+            old.build_from_matrix(old_matrix, old_ids, old_metadata, version="1")
+            new.build_from_matrix(new_matrix, new_ids, new_metadata, version="2")
+            for i in (0, 120, 199):
+                assert old.search(old_matrix[i], top_k=1)[0][1]["url"] == old_ids[i]
+            for i in (0, 75, 149):
+                assert new.search(new_matrix[i], top_k=1)[0][1]["url"] == new_ids[i]
+            assert not old.lost and not new.lost
+
+            # Rebalancing gathers only this coordinator's rows.
+            old.rebalance()
+            assert old.search(old_matrix[150], top_k=1)[0][1]["url"] == old_ids[150]
+        finally:
+            old.close()
+            new.close()
+
+    def test_replies_for_another_version_are_dropped(self):
+        """A shard that no longer holds the coordinator's rows yields no rows, and marks it lost."""
+        port = start_server()
+        matrix, ids, metadata = make_corpus()
+        index = ShardedIndex(dim=16, addresses=[("127.0.0.1", port)], authkey=AUTHKEY)
+        try:
+            index.build_from_matrix(matrix, ids, metadata, version="1")
+            index.token = "1:gone"
+            assert index.search(matrix[0], top_k=1) == []
+            assert index.lost
+        finally:
+            index.close()
@@ -0,0 +1,104 @@
+"""
+Unit tests for versioned embedding snapshots.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from engine import snapshot
+from engine.atomic_file import atomic_write
+from engine.compressed_index import CompressedIndex
+from engine.snapshot import (
+    SnapshotError,
+    SnapshotWatcher,
+    _paths,
+    current_version,
+    load_snapshot,
+    write_snapshot,
+)
+
+
+def publish(directory, n: int = 20, seed: int = 0) -> int:
+    matrix = np.random.default_rng(seed).standard_normal((n, 8)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    ids = [f"https://example.com/{seed}/{i}" for i in range(n)]
+    return write_snapshot(str(directory), matrix, ids, [{"url": i} for i in ids], model_id="test")
+
+
+class TestSnapshot:
+    """Test cases for publishing, loading and swapping snapshots."""
+
+    def test_publish_and_load_is_memory_mapped(self, tmp_path):
+        """A published snapshot loads as a read-only memory map."""
+        assert publish(tmp_path) == 1
+        assert current_version(str(tmp_path)) == 1
+
+        index = load_snapshot(str(tmp_path))
+        assert len(index) == 20
+        assert index.snapshot_version == 1
+        assert not index.matrix.flags.owndata
+        assert not index.matrix.flags.writeable
+
+    def test_checksum_mismatch_is_rejected(self, tmp_path):
+        """A corrupted matrix file fails verification."""
+        publish(tmp_path)
+        with open(_paths(str(tmp_path), 1)["matrix"], "r+b") as f:
+            f.seek(-4, 2)
+            f.write(b"\x00\x00\x80\x7f")
+        with pytest.raises(SnapshotError):
+            load_snapshot(str(tmp_path))
+
+    def test_watcher_swaps_to_new_version(self, tmp_path):
+        """The watcher serves the newest published snapshot."""
+        publish(tmp_path, n=10)
+        watcher = SnapshotWatcher(str(tmp_path), check_interval=0)
+        assert len(watcher.get()) == 10
+
+        publish(tmp_path, n=15, seed=1)
+        assert len(watcher.get()) == 15
+        assert watcher.version == 2
+
+    def test_watcher_builds_into_the_given_index(self, tmp_path):
+        """new_index chooses the index type each snapshot is loaded into."""
+        publish(tmp_path)
+        built = []
+
+        def new_index(previous):
+            built.append(previous)
+            return CompressedIndex(dim=8, reduced_dim=4)
+
+        watcher = SnapshotWatcher(str(tmp_path), check_interval=0, new_index=new_index)
+        assert isinstance(watcher.get(), CompressedIndex)
+        assert built == [None]
+
+    def test_concurrent_publishers_get_distinct_versions(self, tmp_path):
+        """Publishers racing on the same directory never share a version number."""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            versions = list(pool.map(lambda seed: publish(tmp_path, seed=seed), range(4)))
+        assert sorted(versions) == [1, 2, 3, 4]
+        assert current_version(str(tmp_path)) == 4
+        assert len(load_snapshot(str(tmp_path))) == 20
+
+    def test_pointer_only_moves_forward(self, tmp_path, monkeypatch):
+        """A publisher that finishes after a newer version leaves CURRENT alone."""
+        claim = snapshot._claim_version
+
+        def overtaken(directory):
+            version, matrix_file = claim(directory)
+            # Someone else publishes a newer version while this one is written.
+            atomic_write(os.path.join(directory, "CURRENT"), str(version + 1).encode())
+            return version, matrix_file
+
+        monkeypatch.setattr(snapshot, "_claim_version", overtaken)
+        assert publish(tmp_path) == 1
+        assert current_version(str(tmp_path)) == 2
+
+    def test_old_versions_are_pruned(self, tmp_path):
+        """Only the most recent snapshots are kept on disk."""
+        for seed in range(5):
+            publish(tmp_path, seed=seed)
+        names = sorted(p.name for p in tmp_path.iterdir() if p.name.endswith(".npy"))
+        assert names == ["articles-00000003.npy", "articles-00000004.npy", "articles-00000005.npy"]
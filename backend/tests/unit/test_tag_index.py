@@ -0,0 +1,86 @@
+"""
+Unit tests for the inverted tag index.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from engine.article_store import ArticleColumns
+from engine.tag_index import TagIndex, normalize_tag
+
+
+def build(*article_tags):
+    """TagIndex over articles whose positions are their order in the arguments."""
+    raw_tags = []
+    codes = {}
+    tag_ids = []
+    for tags in article_tags:
+        ids = []
+        for tag in tags:
+            if tag not in codes:
+                codes[tag] = len(raw_tags)
+                raw_tags.append(tag)
+            ids.append(codes[tag])
+        tag_ids.append(np.asarray(ids, dtype=np.int32))
+    return TagIndex(raw_tags, tag_ids)
+
+
+def brute_force(article_tags, query):
+    return [i for i, tags in enumerate(article_tags) if any(query in t.lower() for t in tags)]
+
+
+class TestTagIndex:
+    """Test cases for normalized posting lists and n-gram substring lookup."""
+
+    def test_normalization_merges_case_and_width_variants(self):
+        """Tags differing only in case, whitespace or width share one entry."""
+        index = build(["Kafka"], [" kafka "], ["ＫＡＦＫＡ"])
+        assert index.tags == ["kafka"]
+        assert index.postings("kafka").tolist() == [0, 1, 2]
+        assert normalize_tag("Machine Learning") == "machine learning"
+
+    def test_substring_lookup_matches_brute_force(self):
+        """Trigram and short-query paths agree with the old substring scan."""
+        article_tags = [
+            ["Kafka", "streaming"],
+            ["machine-learning", "python"],
+            ["Deep Learning"],
+            ["go", "golang"],
+            [],
+            ["data streaming", "kafka-connect"],
+        ]
+        index = build(*article_tags)
+        for query in ["kaf", "learn", "stream", "go", "a", "python", "rust", "ka", "kafka-c"]:
+            assert index.postings(query).tolist() == brute_force(article_tags, query), query
+
+    def test_any_and_all(self):
+        """Multiple tags combine as a union or an intersection of posting lists."""
+        index = build(["kafka", "java"], ["kafka"], ["java"], ["rust"])
+        assert index.lookup(["kafka", "java"]).tolist() == [0, 1, 2]
+        assert index.lookup(["kafka", "java"], match="all").tolist() == [0]
+        assert index.lookup(["kafka", "missing"], match="all").tolist() == []
+
+    def test_counts_are_articles_per_tag(self):
+        """A tag repeated on one article counts that article once."""
+        index = build(["Kafka", "kafka"], ["kafka", "go"], ["go"], ["rust"])
+        assert index.sorted_counts() == [("go", 2), ("kafka", 2), ("rust", 1)]
+
+    def test_counts_carried_forward_incrementally(self):
+        """A merged snapshot's counts match recounting from scratch."""
+        rows = [
+            {"id": "a", "title": "A", "url": "u/a", "tags": ["Kafka", "go"]},
+            {"id": "b", "title": "B", "url": "u/b", "tags": ["go"]},
+        ]
+        columns = ArticleColumns(rows, dim=4)
+        columns.tag_counts()
+        merged = columns.merged(
+            [
+                {"id": "b", "title": "B", "url": "u/b", "tags": ["rust"]},
+                {"id": "c", "title": "C", "url": "u/c", "tags": ["kafka"]},
+            ],
+            version=2,
+        )
+        fresh = ArticleColumns([merged.record(i) for i in range(len(merged))], dim=4)
+        assert Counter(dict(merged.tag_counts())) == Counter(dict(fresh.tag_counts()))
+        assert merged.tag_counts() == [("kafka", 2), ("go", 1), ("rust", 1)]
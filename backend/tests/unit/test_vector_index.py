@@ -0,0 +1,65 @@
+"""
+Unit tests for the in-memory VectorIndex.
+"""
+
+import numpy as np
+import pytest
+
+from engine.vector_index import VectorIndex, top_k_indices
+
+
+def make_rows(n: int, dim: int = 8, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "url": f"https://example.com/{i}",
+            "title": f"Article {i}",
+            "embedding": rng.standard_normal(dim).tolist(),
+        }
+        for i in range(n)
+    ]
+
+
+class TestVectorIndex:
+    """Test cases for building and querying the index."""
+
+    def test_build_skips_invalid_embeddings(self):
+        """Rows with missing or wrong-sized embeddings are not indexed."""
+        rows = make_rows(3)
+        rows.append({"url": "https://example.com/bad", "embedding": [1.0, 2.0]})
+        rows.append({"url": "https://example.com/none", "embedding": None})
+        index = VectorIndex(dim=8)
+        assert index.build(rows) == 3
+        assert len(index) == 3
+        assert "embedding" not in index.metadata[0]
+
+    def test_search_matches_brute_force(self):
+        """Top-k results match a full cosine-similarity sort."""
+        rows = make_rows(200)
+        index = VectorIndex(dim=8)
+        index.build(rows)
+        query = np.random.default_rng(1).standard_normal(8)
+
+        matrix = np.array([r["embedding"] for r in rows])
+        expected = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+        expected_urls = [rows[i]["url"] for i in np.argsort(-expected)[:5]]
+
+        results = index.search(query, top_k=5)
+        assert [meta["url"] for _, meta in results] == expected_urls
+        assert results[0][0] == pytest.approx(expected.max(), abs=1e-5)
+
+    def test_search_empty_index(self):
+        """An empty index returns no results."""
+        assert VectorIndex(dim=8).search(np.ones(8), top_k=3) == []
+
+    def test_query_dimension_mismatch(self):
+        """Queries with the wrong dimension are rejected."""
+        index = VectorIndex(dim=8)
+        index.build(make_rows(3))
+        with pytest.raises(ValueError):
+            index.search(np.ones(4))
+
+    def test_top_k_larger_than_corpus(self):
+        """Requesting more results than indexed returns everything, sorted."""
+        order = top_k_indices(np.array([0.1, 0.9, 0.5]), 10)
+        assert order.tolist() == [1, 2, 0]
@@ -0,0 +1,133 @@
+"""
+Unit tests for the explicit page waits that replace fixed sleeps.
+"""
+
+import time
+from typing import List
+
+from scraper.base.base_scraper import BaseBlogScraper
+from scraper.utils.waits import PageWaits
+
+
+class FakePage:
+    """A page whose content grows ``delay`` seconds after each scroll or click."""
+
+    def __init__(
+        self,
+        delay: float = 0.05,
+        batches: int = 3,
+        loading: bool = False,
+        tracks_requests: bool = True,
+    ) -> None:
+        self.delay = delay
+        self.batches = batches
+        # Keeps finishing requests forever, so the network never goes idle.
+        self.loading = loading
+        # False: the request started before the fetch/XHR hooks were installed.
+        self.tracks_requests = tracks_requests
+        self.grow_at: List[float] = []
+        self.scrolls = 0
+
+    def _loaded(self) -> int:
+        now = time.monotonic()
+        return min(self.batches, sum(at <= now for at in self.grow_at))
+
+    def trigger(self) -> None:
+        if len(self.grow_at) < self.batches:
+            self.grow_at.append(time.monotonic() + self.delay)
+
+    def execute_script(self, script: str, *args):
+        if "scrollTo" in script:
+            self.scrolls += 1
+            self.trigger()
+            return None
+        if "scrollHeight" in script:
+            return 1000 * (1 + self._loaded())
+        if "querySelectorAll" in script:
+            return 10 * (1 + self._loaded())
+        if "getEntriesByType" in script:
+            resources = int(time.monotonic() * 100) if self.loading else 5 + self._loaded()
+            pending = sum(at > time.monotonic() for at in self.grow_at)
+            return ["complete", resources, pending if self.tracks_requests else 0]
+        if "readyState" in script:
+            return "complete"
+        raise AssertionError(script)
+
+
+def fast_waits(**kwargs) -> PageWaits:
+    return PageWaits(poll_interval=0.01, idle_seconds=0.1, **kwargs)
+
+
+class ScrollingScraper(BaseBlogScraper):
+    def __init__(self, page: FakePage) -> None:
+        super().__init__("Test Blog", "https://blog.test/", scroll_limit=10)
+        self._driver = page
+        self.waits = fast_waits(timeout=2)
+
+
+class TestPageWaits:
+    """Test cases for PageWaits."""
+
+    def test_count_increase_returns_as_soon_as_posts_appear(self):
+        """The wait ends when the post count grows, well before the sleep it replaces."""
+        page, waits = FakePage(delay=0.05), fast_waits(timeout=2)
+        page.trigger()
+        assert waits.count_increase(page, "article", 10, replaces=2.0) == 20
+        report = waits.report()
+        assert report["waits"] == 1 and report["timeouts"] == 0
+        assert report["waited_seconds"] < 0.5 and report["saved_seconds"] > 1.5
+
+    def test_no_change_ends_at_network_idle(self):
+        """With nothing loading, the wait gives up after the idle window, not the timeout."""
+        page, waits = FakePage(), fast_waits(timeout=5)
+        started = time.monotonic()
+        assert waits.height_change(page, 1000) == 1000
+        assert time.monotonic() - started < 1
+        assert waits.timeouts == 0
+
+    def test_in_flight_response_slower_than_the_idle_window(self):
+        """A pending "Load More" request keeps the wait open past the idle window."""
+        page, waits = FakePage(delay=0.8), PageWaits(poll_interval=0.01, idle_seconds=0.5)
+        waits.watch_network(page)
+        page.trigger()
+        assert waits.count_increase(page, "article", 10) == 20
+
+    def test_untracked_response_gets_at_least_the_old_sleep(self):
+        """Without in-flight information, idle can't end the wait before the sleep it replaces."""
+        page = FakePage(delay=0.8, tracks_requests=False)
+        waits = PageWaits(poll_interval=0.01, idle_seconds=0.5)
+        page.trigger()
+        assert waits.count_increase(page, "article", 10, replaces=2.0) == 20
+        assert waits.timeouts == 0 and waits.report()["saved_seconds"] > 1
+
+    def test_busy_network_times_out(self):
+        """A page that keeps loading without changing hits the timeout."""
+        page, waits = FakePage(loading=True), fast_waits(timeout=0.3)
+        assert waits.height_change(page, 1000) == 1000
+        assert waits.timeouts == 1 and waits.waited_seconds >= 0.3
+
+    def test_condition_errors_count_as_not_ready(self):
+        """A condition that raises is retried until the timeout."""
+        waits = fast_waits(timeout=0.1)
+
+        def broken():
+            raise RuntimeError("stale element")
+
+        assert waits.until(broken) is False
+        assert waits.timeouts == 1
+
+
+class TestScrollPage:
+    """Test cases for BaseBlogScraper.scroll_page with explicit waits."""
+
+    def test_scrolls_until_the_page_stops_growing(self):
+        """Each scroll advances on new content; the report shows the time saved."""
+        page = FakePage(delay=0.02, batches=3)
+        scraper = ScrollingScraper(page)
+        scraper.scroll_page()
+        # Three scrolls that grow the page, and one that finds the end.
+        assert page.scrolls == 4
+        report = scraper.waits.report()
+        assert report["fixed_sleep_seconds"] == 8.0
+        # The growing scrolls are near-instant; finding the end costs the old 2s.
+        assert report["saved_seconds"] > 5
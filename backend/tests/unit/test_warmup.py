@@ -0,0 +1,61 @@
+"""
+Unit tests for background warmup.
+"""
+
+import pytest
+
+import engine.article_index as article_index
+from engine import warmup
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(
+        warmup,
+        "_state",
+        {"status": "pending", "seconds": None, "error": None, "attempts": 0,
+         "next_retry_seconds": None},
+    )
+    monkeypatch.setattr(warmup.time, "sleep", lambda seconds: None)
+    return warmup._state
+
+
+class TestWarmup:
+    """Test cases for warmup retries."""
+
+    def test_failed_attempt_is_retried(self, fresh_state, monkeypatch):
+        """A warmup whose first attempt raises becomes ready on the next one."""
+        calls = []
+
+        def flaky_index():
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("database unavailable")
+
+        monkeypatch.setattr(article_index, "load_persisted_index", lambda: None)
+        monkeypatch.setattr(article_index, "get_article_index", flaky_index)
+
+        warmup.warmup_until_ready(models=False, retry_seconds=0.01)
+
+        assert len(calls) == 2
+        assert fresh_state["status"] == "ready"
+        assert fresh_state["attempts"] == 2
+        assert fresh_state["error"] is None
+
+    def test_retry_delay_backs_off_to_the_cap(self, fresh_state, monkeypatch):
+        """Delays between attempts double until they reach the maximum."""
+        delays = []
+        failures = iter([True, True, True, True, False])
+
+        def failing_index():
+            if next(failures):
+                raise ConnectionError("database unavailable")
+
+        monkeypatch.setattr(article_index, "load_persisted_index", lambda: None)
+        monkeypatch.setattr(article_index, "get_article_index", failing_index)
+        monkeypatch.setattr(warmup.time, "sleep", delays.append)
+
+        warmup.warmup_until_ready(models=False, retry_seconds=1, max_retry_seconds=5)
+
+        assert delays == [1, 2, 4, 5]
+        assert fresh_state["status"] == "ready"